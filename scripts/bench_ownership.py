@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Ownership matrix benchmark
+League-wide ownership counts and all-pairs squad overlap on synthetic leagues, two ways:
+- loops:  per-manager pick loops into a dict / Python set intersections per pair
+- matrix: OwnershipMatrix - one bincount over the CSR picks / popcount of packed bitsets
+
+Every matrix answer is checked against the loops (overlap on the first --pairs-managers
+managers - the Python all-pairs loop is quadratic).
+
+Usage:
+    python scripts/bench_ownership.py
+    python scripts/bench_ownership.py --leagues 100 1000 5000 --pairs-managers 1000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fpl_replay import SyntheticLeague
+from ownership import OwnershipMatrix
+
+
+def managers_data(league: SyntheticLeague):
+    """{entry: {'current_picks': picks}} as the collector stores it"""
+    return {
+        str(league.entry_id(i)): {'current_picks': league.picks(league.entry_id(i), league.current_gw)}
+        for i in range(league.managers)
+    }
+
+
+def bench(managers: int, pairs_managers: int, seed: int):
+    data = managers_data(SyntheticLeague(managers=managers, seed=seed))
+
+    started = time.perf_counter()
+    counts = {}
+    for manager in data.values():
+        for pick in manager['current_picks']['picks']:
+            counts[pick['element']] = counts.get(pick['element'], 0) + 1
+    loop_counts = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ownership = OwnershipMatrix.from_managers(data)
+    build = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matrix_counts = ownership.counts()
+    counts_time = time.perf_counter() - started
+    assert {i: c for i, c in enumerate(matrix_counts.tolist()) if c} == counts, "counts differ"
+
+    n = min(pairs_managers, managers)
+    squads = [{p['element'] for p in m['current_picks']['picks']} for m in list(data.values())[:n]]
+    started = time.perf_counter()
+    expected = [[len(a & b) for b in squads] for a in squads]
+    loop_overlap = time.perf_counter() - started
+
+    started = time.perf_counter()
+    overlap = ownership.overlap_matrix(np.arange(n))
+    overlap_time = time.perf_counter() - started
+    assert overlap.tolist() == expected, "overlap differs"
+    return loop_counts, build, counts_time, n, loop_overlap, overlap_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ownership matrix")
+    parser.add_argument("--leagues", type=int, nargs="+", default=[100, 1000, 5000],
+                        metavar="MANAGERS", help="League sizes to benchmark")
+    parser.add_argument("--pairs-managers", type=int, default=1000,
+                        help="Managers in the all-pairs overlap comparison")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bench(10, 10, args.seed)  # warm-up: numpy's lazy imports on first use
+    print(f"{'managers':>9} {'count loop':>11} {'build':>9} {'bincount':>9} "
+          f"{'pairs of':>9} {'set loop':>10} {'bitset':>9} {'vs loop':>8}")
+    print("-" * 82)
+    for managers in args.leagues:
+        loop_counts, build, counts_time, n, loop_overlap, overlap_time = bench(
+            managers, args.pairs_managers, args.seed)
+        print(f"{managers:>9} {loop_counts * 1000:>9.1f}ms {build * 1000:>7.1f}ms {counts_time * 1000:>7.2f}ms "
+              f"{n:>9} {loop_overlap * 1000:>8.0f}ms {overlap_time * 1000:>7.0f}ms "
+              f"{loop_overlap / overlap_time:>7.1f}x")
+    print("\n✅ matrix counts and overlaps identical to the loops")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Replacement search benchmark
+"Best K affordable players at position P not in squad S" for the 3 weakest players
+of every manager in a synthetic league, three ways:
+- scan:  the original per-element Python loop + sort
+- mask:  numpy mask over the player table + top-K
+- index: ReplacementIndex - bisect the budget, partial partition of the score ranks
+
+Every answer of mask / index is checked against the scan.
+
+Usage:
+    python scripts/bench_replacements.py
+    python scripts/bench_replacements.py --leagues 10 100 1000 10000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fpl_replay import SyntheticLeague
+from player_table import PlayerTable, ScoreWeights, player_score
+
+
+def scan(elements, scores_by_id, position, budget, exclude_ids, k=10):
+    """find_best_replacements before the player table"""
+    candidates = []
+    for player in elements:
+        if player['element_type'] != position:
+            continue
+        if player['id'] in exclude_ids:
+            continue
+        if player['now_cost'] / 10 > budget:
+            continue
+        candidates.append((player['id'], scores_by_id[player['id']]))
+    candidates.sort(key=lambda x: x[1], reverse=True)
+    return [player_id for player_id, _ in candidates[:k]]
+
+
+def queries(league: SyntheticLeague, scores_by_id):
+    """(position, budget, squad ids) for the 3 weakest players of every manager"""
+    players = {e['id']: e for e in league.elements}
+    for i in range(league.managers):
+        entry = league.entry_id(i)
+        picks = league.picks(entry, league.current_gw)
+        squad = [pick['element'] for pick in picks['picks']]
+        bank = picks['entry_history']['bank'] / 10
+        for player_id in sorted(squad, key=lambda p: scores_by_id[p])[:3]:
+            player = players[player_id]
+            yield player['element_type'], bank + player['now_cost'] / 10, squad
+
+
+def bench(managers: int, seed: int):
+    league = SyntheticLeague(managers=managers, seed=seed)
+    elements = league.elements
+    weights = ScoreWeights()
+    table = PlayerTable.from_elements(elements)
+    scores_by_id = {e['id']: player_score(e, weights) for e in elements}
+    work = list(queries(league, scores_by_id))
+
+    started = time.perf_counter()
+    expected = [scan(elements, scores_by_id, *query) for query in work]
+    scan_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = table.scores(weights)
+    by_mask = [
+        table.ids(table.top_k(scores, 10, where=table.mask(position=position, max_price=budget,
+                                                          exclude_ids=squad)))
+        for position, budget, squad in work
+    ]
+    mask_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = table.replacement_index(weights, table.scores(weights))
+    by_index = [table.ids(index.best(position, budget, squad, k=10)) for position, budget, squad in work]
+    index_time = time.perf_counter() - started
+
+    assert by_mask == expected, "mask results differ from the scan"
+    assert by_index == expected, "index results differ from the scan"
+    return len(work), scan_time, mask_time, index_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark replacement search")
+    parser.add_argument("--leagues", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        metavar="MANAGERS", help="League sizes to benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bench(10, args.seed)  # warm-up: numpy's lazy imports on first use
+    print(f"{'managers':>9} {'queries':>8} {'scan':>10} {'mask':>10} {'index':>10} {'vs scan':>8}")
+    print("-" * 60)
+    for managers in args.leagues:
+        count, scan_time, mask_time, index_time = bench(managers, args.seed)
+        print(f"{managers:>9} {count:>8} {scan_time * 1000:>8.1f}ms {mask_time * 1000:>8.1f}ms "
+              f"{index_time * 1000:>8.1f}ms {scan_time / index_time:>7.1f}x")
+    print("\n✅ mask and index results identical to the scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for the analysis scripts
+Time from interpreter start to a loaded analysis object, per entry point, in a fresh
+process each time:
+- no cache: every process decodes the snapshots itself (the old behaviour)
+- cold:     warm cache just cleared - decode + write the cache
+- warm:     later processes load the pickled, pre-indexed snapshots
+
+Usage:
+    python scripts/bench_startup.py [--data-dir fpl_data]
+    python scripts/bench_startup.py --synthetic 2000
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+# entry point -> statement that loads everything the script needs on start-up
+ENTRY_POINTS = {
+    'analyze_data': "from analyze_data import FPLAnalyzer\n"
+                    "a = FPLAnalyzer(DATA_DIR); a.load_latest_managers_data(); a.load_latest_bootstrap_data()",
+    'weekly_report': "from weekly_report import WeeklyLeagueReport\nWeeklyLeagueReport(DATA_DIR)",
+    'whatsapp_summary': "from whatsapp_summary import WhatsAppSummary\nWhatsAppSummary(DATA_DIR)",
+    'gold_mine_analysis': "from gold_mine_analysis import FPLAdvancedAnalytics\nFPLAdvancedAnalytics(DATA_DIR)",
+    'captain_selector': "from captain_selector import CaptainSelector\nCaptainSelector(DATA_DIR)",
+    'transfer_recommendations': "from transfer_recommendations import TransferRecommendationEngine\n"
+                                "TransferRecommendationEngine(DATA_DIR)",
+    'fpl_weekly_summary': "from fpl_weekly_summary import FPLWeeklySummary\n"
+                          "FPLWeeklySummary(DATA_DIR, config_file='/nonexistent/config.json')",
+}
+
+TEMPLATE = """
+import time
+started = time.perf_counter()
+import contextlib, io, sys
+sys.path.insert(0, {src!r})
+DATA_DIR = {data_dir!r}
+if {disable_cache}:
+    import fpl_store
+    fpl_store.WarmCache = lambda data_dir: None
+with contextlib.redirect_stdout(io.StringIO()):
+{body}
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def run_once(data_dir: str, body: str, disable_cache: bool = False) -> float:
+    code = TEMPLATE.format(src=str(SRC_DIR), data_dir=data_dir, disable_cache=disable_cache,
+                           body="\n".join("    " + line for line in body.splitlines()))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def bench(data_dir: str, repeat: int):
+    from warm_cache import WarmCache
+
+    cache = WarmCache(data_dir)
+    print(f"{'script':<26} {'no cache':>10} {'cold':>10} {'warm':>10} {'speed-up':>9}")
+    print("-" * 70)
+    totals = [0.0, 0.0, 0.0]
+    for name, body in ENTRY_POINTS.items():
+        no_cache = statistics.median(run_once(data_dir, body, disable_cache=True) for _ in range(repeat))
+        cold = []
+        for _ in range(repeat):
+            cache.clear()
+            cold.append(run_once(data_dir, body))
+        warm = statistics.median(run_once(data_dir, body) for _ in range(repeat))
+        cold = statistics.median(cold)
+        for i, value in enumerate((no_cache, cold, warm)):
+            totals[i] += value
+        print(f"{name:<26} {no_cache:>8.0f}ms {cold:>8.0f}ms {warm:>8.0f}ms {no_cache / warm:>8.1f}x")
+    print("-" * 70)
+    print(f"{'all 7 (run_all)':<26} {totals[0]:>8.0f}ms {totals[1]:>8.0f}ms {totals[2]:>8.0f}ms "
+          f"{totals[0] / totals[2]:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analysis script start-up")
+    parser.add_argument("--data-dir", default="fpl_data")
+    parser.add_argument("--synthetic", type=int, metavar="MANAGERS",
+                        help="Benchmark on a freshly collected synthetic league instead")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from fpl_replay import collect_synthetic
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            print(f"Collecting a synthetic league of {args.synthetic} managers...\n")
+            collect_synthetic(args.synthetic, data_dir)
+            bench(data_dir, args.repeat)
+    else:
+        bench(args.data_dir, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,40 +4,65 @@ FPL Data Analysis Examples
 דוגמאות לניתוח הדאטה שנאסף
 """
 
-import json
+import functools
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+from fpl_store import FPLDataStore
+
+
+def memoized(*kinds: str):
+    """שמירת תוצאת שאילתה עד שאחד מקבצי ה-snapshot שהיא קוראת (kinds) משתנה"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            signatures = tuple(self.store.signature(kind) for kind in kinds)
+            cached = self._query_cache.get(key)
+            if cached and cached[0] == signatures:
+                self.cache_hits += 1
+                result = cached[1]
+            else:
+                self.cache_misses += 1
+                result = method(self, *args, **kwargs)
+                self._query_cache[key] = (signatures, result)
+            # שורות התוצאה מועתקות - קורא שמשנה אותן לא פוגע במטמון
+            if isinstance(result, list):
+                return [dict(row) if isinstance(row, dict) else row for row in result]
+            return result
+        return wrapper
+    return decorator
+
 
 class FPLAnalyzer:
     def __init__(self, data_dir: str = "fpl_data"):
         self.data_dir = Path(data_dir)
-        
+        self.store = FPLDataStore(data_dir)
+        self._query_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def cache_info(self) -> Dict:
+        """מוני פגיעות/החטאות של המטמון"""
+        return {'hits': self.cache_hits, 'misses': self.cache_misses,
+                'entries': len(self._query_cache)}
+    
+    @memoized('managers')
     def load_latest_managers_data(self) -> Dict:
         """טען את הדאטה האחרון של המנהלים"""
-        manager_files = list(self.data_dir.glob("managers_detailed_*.json"))
-        if not manager_files:
-            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
-        
-        latest_file = max(manager_files, key=lambda p: p.stat().st_mtime)
-        print(f"טוען קובץ: {latest_file}")
-        
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        managers_data = self.store.managers()
+        print(f"טוען קובץ: {self.store.path('managers')}")
+        return managers_data
     
+    @memoized('bootstrap')
     def load_latest_bootstrap_data(self) -> Dict:
         """טען את הדאטה הגלובלי האחרון"""
-        bootstrap_files = list(self.data_dir.glob("bootstrap_data_*.json"))
-        if not bootstrap_files:
-            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
-        
-        latest_file = max(bootstrap_files, key=lambda p: p.stat().st_mtime)
-        print(f"טוען קובץ: {latest_file}")
-        
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        bootstrap_data = self.store.bootstrap()
+        print(f"טוען קובץ: {self.store.path('bootstrap')}")
+        return bootstrap_data
     
+    @memoized('managers')
     def get_league_standings(self) -> List[Dict]:
         """קבל את הדירוג של הליגה ממוין"""
         managers_data = self.load_latest_managers_data()
@@ -60,6 +85,7 @@ class FPLAnalyzer:
         
         return standings
     
+    @memoized('managers')
     def get_top_performers_this_week(self, top_n: int = 5) -> List[Dict]:
         """מצא את המנהלים עם הכי הרבה נקודות במחזור הנוכחי"""
         managers_data = self.load_latest_managers_data()
@@ -79,64 +105,49 @@ class FPLAnalyzer:
         weekly_scores.sort(key=lambda x: x['points'], reverse=True)
         return weekly_scores[:top_n]
     
+    @memoized('managers', 'bootstrap')
     def get_most_captained_players(self) -> List[Dict]:
         """מצא את השחקנים הכי פופולריים לקפטן בליגה"""
-        managers_data = self.load_latest_managers_data()
-        bootstrap_data = self.load_latest_bootstrap_data()
+        ownership = self.store.ownership()
+        players_map = self.store.players_by_id()
         
-        # מפה של ID שחקן לשם
-        players_map = {p['id']: p['web_name'] for p in bootstrap_data['elements']}
+        # ספירה לפי ID - שני שחקנים עם אותו web_name נשארים נפרדים
+        captain_counts = ownership.captain_counts()
         
-        captain_counts = {}
-        for manager_id, data in managers_data.items():
-            picks = data['current_picks']['picks']
-            for pick in picks:
-                if pick['is_captain']:
-                    player_id = pick['element']
-                    player_name = players_map.get(player_id, f"Unknown ({player_id})")
-                    captain_counts[player_name] = captain_counts.get(player_name, 0) + 1
-        
-        result = [
-            {'player': player, 'count': count}
-            for player, count in captain_counts.items()
+        return [
+            {'player': self._player_name(players_map, player_id), 'count': captain_counts[player_id].item()}
+            for player_id in ownership.by_ownership(captain_counts, picks=ownership.is_captain).tolist()
         ]
-        result.sort(key=lambda x: x['count'], reverse=True)
-        
-        return result
     
+    @staticmethod
+    def _player_name(players_map: Dict, player_id: int) -> str:
+        player = players_map.get(player_id)
+        return player['web_name'] if player else f"Unknown ({player_id})"
+    
+    @memoized('managers', 'bootstrap')
     def get_most_owned_players(self) -> List[Dict]:
         """מצא את השחקנים הכי פופולריים בליגה"""
-        managers_data = self.load_latest_managers_data()
-        bootstrap_data = self.load_latest_bootstrap_data()
+        ownership = self.store.ownership()
+        players_map = self.store.players_by_id()
         
-        players_map = {p['id']: p['web_name'] for p in bootstrap_data['elements']}
-        
-        ownership_counts = {}
-        for manager_id, data in managers_data.items():
-            picks = data['current_picks']['picks']
-            for pick in picks:
-                player_id = pick['element']
-                player_name = players_map.get(player_id, f"Unknown ({player_id})")
-                ownership_counts[player_name] = ownership_counts.get(player_name, 0) + 1
-        
-        result = [
-            {'player': player, 'owned_by': count}
-            for player, count in ownership_counts.items()
+        owned_by = ownership.counts()
+        return [
+            {'player': self._player_name(players_map, player_id), 'owned_by': owned_by[player_id].item()}
+            for player_id in ownership.by_ownership(owned_by, 20).tolist()  # Top 20
         ]
-        result.sort(key=lambda x: x['owned_by'], reverse=True)
-        
-        return result[:20]  # Top 20
     
+    @memoized('managers')
     def get_transfer_activity(self) -> List[Dict]:
         """נתח את פעילות ההעברות"""
-        managers_data = self.load_latest_managers_data()
+        # רק השם והמחזור האחרון נדרשים - קריאה זורמת, מנהל אחד בכל פעם
+        fields = ['manager_info.player_name', 'history.current.-1']
         
         transfer_data = []
-        for manager_id, data in managers_data.items():
-            if data['history']['current']:
-                latest_gw = data['history']['current'][-1]
+        for manager_id, data in self.store.iter_managers(fields):
+            latest_gw = data['history.current.-1']
+            if latest_gw:
                 transfer_data.append({
-                    'player_name': data['manager_info']['player_name'],
+                    'player_name': data['manager_info.player_name'],
                     'transfers': latest_gw.get('event_transfers', 0),
                     'cost': latest_gw.get('event_transfers_cost', 0),
                     'bank': latest_gw.get('bank', 0) / 10  # מחולק ב-10 כי זה מיוצג בעשיריות
@@ -214,6 +225,8 @@ def main():
     try:
         analyzer = FPLAnalyzer()
         analyzer.print_league_report()
+        cache = analyzer.cache_info()
+        print(f"🗃️  Query cache: {cache['hits']} hits, {cache['misses']} misses")
         
         print("\n💡 Tip: You can extend this script with more analyses!")
         print("טיפ: אפשר להרחיב את הסקריפט עם עוד ניתוחים!")
@@ -4,49 +4,54 @@ FPL Captain Selection Helper
 עוזר לבחירת קפטן - הבחירה החשובה ביותר כל שבוע!
 """
 
-import json
 from pathlib import Path
 from typing import Dict, List
 from collections import Counter
 
+from fpl_store import FPLDataStore
+from projections import next_gameweek, upcoming_fixtures
+
 
 class CaptainSelector:
-    def __init__(self, data_dir: str = "fpl_data"):
+    def __init__(self, data_dir: str = "fpl_data", use_projections: bool = False):
+        """use_projections=True מדרג את האופציות לפי xP למחזור הבא (יריבה, בית/חוץ, DGW/BGW)"""
         self.data_dir = Path(data_dir)
-        self.bootstrap_data = self.load_latest_bootstrap_data()
-        self.managers_data = self.load_latest_managers_data()
-        
-        self.players_map = {p['id']: p for p in self.bootstrap_data['elements']}
-        self.teams_map = {t['id']: t for t in self.bootstrap_data['teams']}
-    
-    def load_latest_bootstrap_data(self) -> Dict:
-        bootstrap_files = list(self.data_dir.glob("bootstrap_data_*.json"))
-        if not bootstrap_files:
-            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
-        latest_file = max(bootstrap_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def load_latest_managers_data(self) -> Dict:
-        manager_files = list(self.data_dir.glob("managers_detailed_*.json"))
-        if not manager_files:
-            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
-        latest_file = max(manager_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.store = FPLDataStore(data_dir)
+        self.bootstrap_data = self.store.bootstrap()
+        self.managers_data = self.store.managers()
+        
+        self.players_map = self.store.players_by_id()
+        self.teams_map = self.store.teams_by_id()
+        self.players = self.store.player_table()
+        self.fixtures = self.store.fixtures()
+        self.next_gw = next_gameweek(self.bootstrap_data)
+        self.projections = self.store.projections(horizon=3) if use_projections else None
     
     def get_next_fixtures(self, team_id: int, num_games: int = 3) -> List[Dict]:
         """קבל את המשחקים הבאים של קבוצה"""
-        fixtures = []
-        
-        for event in self.bootstrap_data['events']:
-            if event['is_next'] or event['is_current']:
-                current_gw = event['id']
-                break
-        
-        # זה יותר מורכב - צריך API נפרד לfixtures
-        # לעת עתה נחזיר placeholder
-        return [{'opponent': 'TBD', 'difficulty': 3}] * num_games
+        if not self.fixtures:
+            # אין snapshot של fixtures (נאסף לפני שהאוסף הוריד אותם)
+            return [{'opponent': 'TBD', 'difficulty': 3}] * num_games
+        
+        next_fixtures = []
+        for fixture in upcoming_fixtures(self.fixtures, team_id, self.next_gw, num_games):
+            opponent = self.teams_map.get(fixture['opponent_id'], {})
+            next_fixtures.append({
+                'gameweek': fixture['gameweek'],
+                'opponent': opponent.get('short_name', opponent.get('name', 'TBD')),
+                'is_home': fixture['is_home'],
+                'difficulty': fixture['difficulty'],
+            })
+        return next_fixtures
+    
+    def format_next_gameweek(self, fixtures: List[Dict]) -> str:
+        """המשחקים של המחזור הבא: 'ARS(H) 4', DGW כ-'ARS(H) 4 + CHE(A) 3', '-' ל-BGW"""
+        if fixtures and 'gameweek' not in fixtures[0]:
+            return 'TBD'
+        return ' + '.join(
+            f"{f['opponent']}({'H' if f['is_home'] else 'A'}) {f['difficulty']}"
+            for f in fixtures if f['gameweek'] == self.next_gw
+        ) or '-'
     
     def analyze_captain_options(self, manager_name: str = None) -> List[Dict]:
         """נתח אופציות לקפטן מהקבוצה שלך"""
@@ -62,41 +67,27 @@ class CaptainSelector:
         if not my_team:
             my_team = list(self.managers_data.values())[0]
         
-        my_picks = my_team['current_picks']['picks']
+        # רק שחקנים בהרכב הפותח
+        starting = [pick for pick in my_team['current_picks']['picks'] if pick['position'] <= 11]
+        
+        # ציון קפטן לכל השחקנים מחושב פעם אחת (form*5 + ppg*3 + bonus/2 + (G+A)/3 + ICT/20)
+        scores = self.players.captain_scores()
+        table = self.players.data
         
         captain_candidates = []
-        for pick in my_picks:
-            if pick['position'] > 11:  # רק שחקנים בהרכב הפותח
-                continue
-            
+        for pick, row in zip(starting, self.players.rows_of(p['element'] for p in starting)):
             player = self.players_map.get(pick['element'])
-            if not player:
+            if not player or row < 0:
                 continue
             
-            # חשב ציון קפטן
-            captain_score = 0.0
-            
-            # Form (משקל הכי גבוה)
-            form = float(player.get('form', 0))
-            captain_score += form * 5
-            
-            # Points per game
-            ppg = float(player.get('points_per_game', 0))
-            captain_score += ppg * 3
-            
-            # Bonus points (שחקנים שמקבלים הרבה בונוסים)
-            bonus = player.get('bonus', 0)
-            captain_score += bonus / 2
-            
-            # Goals + Assists potential
-            goals = player.get('goals_scored', 0)
-            assists = player.get('assists', 0)
-            captain_score += (goals + assists) / 3
-            
-            # ICT Index
-            ict = float(player.get('ict_index', 0))
-            captain_score += ict / 20
+            form = table['form'][row].item()
+            ppg = table['points_per_game'][row].item()
+            bonus = table['bonus'][row].item()
+            goals = table['goals_scored'][row].item()
+            assists = table['assists'][row].item()
+            captain_score = scores[row].item()
             
+            fixtures = self.get_next_fixtures(player['team'], 2)
             captain_candidates.append({
                 'id': player['id'],
                 'name': player['web_name'],
@@ -110,11 +101,16 @@ class CaptainSelector:
                 'assists': assists,
                 'bonus': bonus,
                 'captain_score': captain_score,
+                'xp': self.projections.xp[row, 0].item() if self.projections else None,
+                'next_fixtures': fixtures,
                 'is_captain': pick['is_captain']
             })
         
-        # מיין לפי ציון קפטן
-        captain_candidates.sort(key=lambda x: x['captain_score'], reverse=True)
+        # מיין לפי xP למחזור הבא אם יש תחזיות, אחרת לפי ציון קפטן
+        if self.projections:
+            captain_candidates.sort(key=lambda x: x['xp'], reverse=True)
+        else:
+            captain_candidates.sort(key=lambda x: x['captain_score'], reverse=True)
         return captain_candidates
     
     def get_league_captain_choices(self) -> List[Dict]:
@@ -126,6 +122,9 @@ class CaptainSelector:
                 if pick['is_captain']:
                     captain_counter[pick['element']] += 1
         
+        # EO - כל המכפילים (קפטן x2, TC x3, Bench Boost), לא רק הקפטנים
+        effective_ownership = self.store.ownership().effective_ownership()
+        
         captain_stats = []
         for player_id, count in captain_counter.most_common():
             player = self.players_map.get(player_id)
@@ -134,7 +133,8 @@ class CaptainSelector:
                     'name': player['web_name'],
                     'team': self.teams_map.get(player['team'], {}).get('name', 'Unknown'),
                     'captained_by': count,
-                    'captaincy_pct': (count / len(self.managers_data)) * 100
+                    'captaincy_pct': (count / len(self.managers_data)) * 100,
+                    'eo_pct': effective_ownership[player_id].item() * 100
                 })
         
         return captain_stats
@@ -152,14 +152,18 @@ class CaptainSelector:
         
         my_options = self.analyze_captain_options(manager_name)
         
-        print(f"{'Player':<25} {'Pos':<5} {'Form':<8} {'PPG':<8} {'G+A':<8} {'Score':<10} {'Current':<10}")
+        score_label = 'xP' if self.projections else 'Score'
+        print(f"{'Player':<20} {'Pos':<5} {'Form':<6} {'PPG':<6} {'G+A':<5} {'Next':<16} "
+              f"{score_label:<8} {'Current':<10}")
         print("-" * 80)
         
         for option in my_options[:10]:
             is_current = "👑 YES" if option['is_captain'] else ""
-            print(f"{option['name']:<25} {option['position']:<5} {option['form']:<8.1f} "
-                  f"{option['ppg']:<8.1f} {option['goals'] + option['assists']:<8} "
-                  f"{option['captain_score']:<10.1f} {is_current:<10}")
+            score = option['xp'] if self.projections else option['captain_score']
+            print(f"{option['name']:<20} {option['position']:<5} {option['form']:<6.1f} "
+                  f"{option['ppg']:<6.1f} {option['goals'] + option['assists']:<5} "
+                  f"{self.format_next_gameweek(option['next_fixtures']):<16} "
+                  f"{score:<8.1f} {is_current:<10}")
         
         # 2. League captain choices
         print("\n\n📊 LEAGUE CAPTAIN CHOICES - מה הליגה בוחרת")
@@ -167,12 +171,12 @@ class CaptainSelector:
         
         league_choices = self.get_league_captain_choices()
         
-        print(f"{'Player':<30} {'Team':<20} {'Captained By':<15} {'%':<10}")
+        print(f"{'Player':<25} {'Team':<18} {'Captained By':<14} {'%':<10} {'EO':<10}")
         print("-" * 80)
         
         for choice in league_choices[:10]:
-            print(f"{choice['name']:<30} {choice['team']:<20} "
-                  f"{choice['captained_by']:<15} {choice['captaincy_pct']:<10.1f}%")
+            print(f"{choice['name']:<25} {choice['team']:<18} "
+                  f"{choice['captained_by']:<14} {choice['captaincy_pct']:<9.1f}% {choice['eo_pct']:<9.1f}%")
         
         # 3. Recommendations
         print("\n\n💡 RECOMMENDATIONS - המלצות")
@@ -218,11 +222,14 @@ def main():
     import sys
     
     try:
-        selector = CaptainSelector()
+        args = sys.argv[1:]
+        use_projections = '--xp' in args
+        args = [arg for arg in args if arg != '--xp']
+        selector = CaptainSelector(use_projections=use_projections)
         
         manager_name = None
-        if len(sys.argv) > 1:
-            manager_name = " ".join(sys.argv[1:])
+        if args:
+            manager_name = " ".join(args)
             print(f"\n🔍 Analyzing captain options for: {manager_name}")
         
         selector.print_captain_report(manager_name)
@@ -230,6 +237,7 @@ def main():
         print("\n📝 Usage:")
         print("   python captain_selector.py \"Your Name\"")
         print("   python captain_selector.py")
+        print("   python captain_selector.py --xp \"Your Name\"   # rank by next-GW expected points")
         
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+FPL Effective Ownership
+כמה ההולך של שחקן באמת מזיז את הטבלה?
+
+From the ownership matrix (current_picks multipliers - captain x2, triple captain x3,
+bench players x1 under bench boost):
+- EO of a player: Σ multipliers / managers - the points the average league manager
+  gets per point the player scores (EO 1.3 = 130%)
+- exposure of a manager to a player: the manager's multiplier - EO; positive gains
+  ground on the league when the player scores, negative loses it
+- rank swing: "if player X scores k more points, how does the table change" - every
+  manager's rank change, for all players at once. Per player only the managers playing
+  that player move, so ranks come from counting (searchsorted over the sorted totals
+  and the owners') rather than re-sorting the table
+
+Live totals are updated incrementally: apply_deltas() (or on_live_event() registered
+with FPLDataCollector.subscribe_live) adds Δpoints × multiplier for the owners of the
+changed players only; rank swings are recomputed lazily on the next query. The poll's
+seq 0 baseline is synced first (sync_points), so points scored between the stored
+snapshot and the first poll are not lost.
+"""
+
+import argparse
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from fpl_store import FPLDataStore
+from live_index import LiveIndex
+from ownership import OwnershipMatrix
+
+
+class EffectiveOwnership:
+    def __init__(self, ownership: OwnershipMatrix, points_by_id: np.ndarray, prior_totals: np.ndarray):
+        """points_by_id: live GW points indexed by element id;
+        prior_totals: each manager's total before this gameweek (after hits)"""
+        self.ownership = ownership
+        self.managers = len(ownership)
+        self.size = ownership.size
+        self.prior_totals = np.asarray(prior_totals, dtype=np.int64)
+
+        # Playing picks only - a benched player (multiplier 0) moves nothing
+        playing = np.flatnonzero(ownership.multiplier > 0)
+        element = ownership.element[playing]
+        multiplier = ownership.multiplier[playing].astype(np.int64)
+        rows = ownership.pick_rows[playing]
+        self.eo = ownership.effective_ownership()
+
+        # Column-major copy of the playing picks: owners of player p are the slice
+        # column_ptr[p]:column_ptr[p + 1]
+        order = np.argsort(element, kind='stable')
+        self.column_rows = rows[order]
+        self.column_multiplier = multiplier[order]
+        self.column_ptr = np.searchsorted(element[order], np.arange(self.size + 1))
+
+        self.points_by_id = np.zeros(self.size, dtype=np.int64)
+        known = min(self.size, len(points_by_id))
+        self.points_by_id[:known] = points_by_id[:known]
+        self.live_points = np.bincount(rows, weights=multiplier * self.points_by_id[element],
+                                       minlength=self.managers).astype(np.int64)
+        self.version = 0
+        self._swings: Dict[Any, Any] = {}
+
+    @classmethod
+    def from_store(cls, store: FPLDataStore) -> "EffectiveOwnership":
+        ownership = store.ownership()
+        managers_data = store.managers()
+        current_gw = next((e['id'] for e in store.bootstrap().get('events', []) if e.get('is_current')), None)
+
+        prior = np.zeros(len(ownership), dtype=np.int64)
+        for row, manager_id in enumerate(ownership.manager_ids):
+            history = managers_data[manager_id].get('history', {}).get('current', [])
+            entry = next((gw for gw in history if gw['event'] == current_gw), None)
+            if entry:
+                # total_points = previous total + points - hits
+                prior[row] = entry['total_points'] - entry['points']
+            elif history:
+                prior[row] = history[-1]['total_points']
+        points = store.live_index().by_id('total_points', ownership.size)
+        return cls(ownership, points, prior)
+
+    @property
+    def totals(self) -> np.ndarray:
+        return self.prior_totals + self.live_points
+
+    def ranks(self, totals: Optional[np.ndarray] = None) -> np.ndarray:
+        """1 + managers strictly ahead (shared ranks on equal totals)"""
+        totals = self.totals if totals is None else totals
+        ordered = np.sort(totals)
+        return 1 + len(totals) - np.searchsorted(ordered, totals, side='right')
+
+    def owners(self, player_id: int):
+        """(manager rows, multipliers) of the managers playing a player"""
+        if not 0 <= player_id < self.size:
+            return self.column_rows[:0], self.column_multiplier[:0]
+        start, end = self.column_ptr[player_id], self.column_ptr[player_id + 1]
+        return self.column_rows[start:end], self.column_multiplier[start:end]
+
+    def apply_deltas(self, deltas: Dict[int, Dict]):
+        """Live poll deltas ({element id: {'total_points': Δ, ...}}) - only the owners of
+        the changed players are touched"""
+        changed = False
+        for player_id, stats in deltas.items():
+            delta = stats.get('total_points', 0)
+            player_id = int(player_id)
+            if not delta or not 0 <= player_id < self.size:
+                continue
+            self.points_by_id[player_id] += delta
+            rows, multiplier = self.owners(player_id)
+            np.add.at(self.live_points, rows, multiplier * delta)
+            changed = True
+        if changed:
+            self.version += 1
+            self._swings.clear()
+
+    def sync_points(self, points_by_id: np.ndarray):
+        """Bring the live points to a full set of player points (indexed by element id) -
+        only the players whose points differ are applied"""
+        points = np.zeros(self.size, dtype=np.int64)
+        known = min(self.size, len(points_by_id))
+        points[:known] = points_by_id[:known]
+        changed = np.flatnonzero(points != self.points_by_id)
+        self.apply_deltas({player_id: {'total_points': int(points[player_id] - self.points_by_id[player_id])}
+                           for player_id in changed.tolist()})
+
+    def on_live_event(self, event: Dict):
+        """Callback for FPLDataCollector.subscribe_live"""
+        if 'live_data' in event:
+            # seq 0: the poll's own baseline - later deltas are relative to it
+            self.sync_points(LiveIndex.from_live(event['live_data']).by_id('total_points', self.size))
+        self.apply_deltas(event.get('deltas', {}))
+
+    def exposure(self, manager_row: int) -> np.ndarray:
+        """Multiplier - EO of a manager for every element id (index = element id)"""
+        mine = np.zeros(self.size)
+        picks = slice(self.ownership.indptr[manager_row], self.ownership.indptr[manager_row + 1])
+        mine[self.ownership.element[picks]] = self.ownership.multiplier[picks]
+        return mine - self.eo
+
+    def player_exposure(self, player_id: int) -> np.ndarray:
+        """Multiplier - EO of every manager for one player"""
+        exposure = np.full(self.managers, -self.eo[player_id] if 0 <= player_id < self.size else 0.0)
+        rows, multiplier = self.owners(player_id)
+        exposure[rows] += multiplier
+        return exposure
+
+    def table_after(self, player_id: int, points: int) -> np.ndarray:
+        """Every manager's rank if a player scores `points` more"""
+        return self.ranks() - self._rank_gain(player_id, points, self.totals, np.sort(self.totals))
+
+    def _rank_gain(self, player_id: int, points: int, totals: np.ndarray, ordered: np.ndarray) -> np.ndarray:
+        """Places each manager climbs (negative: drops) if a player scores `points` more"""
+        rows, multiplier = self.owners(player_id)
+        gain = np.zeros(self.managers, dtype=np.int64)
+        if len(rows) == 0 or points == 0:
+            return gain
+        before = totals[rows]
+        after = before + points * multiplier
+        before_sorted, after_sorted = np.sort(before), np.sort(after)
+        owners = len(rows)
+
+        # Everyone else stays put; the owners who pass them (or fall behind) change their rank
+        gain -= np.searchsorted(before_sorted, totals, side='right')
+        gain += np.searchsorted(after_sorted, totals, side='right')
+
+        # Owners: ahead of them afterwards = non-owners above `after` + owners above `after`
+        ahead_before = len(totals) - np.searchsorted(ordered, before, side='right')
+        non_owners_ahead = (len(totals) - np.searchsorted(ordered, after, side='right')
+                            - (owners - np.searchsorted(before_sorted, after, side='right')))
+        owners_ahead = owners - np.searchsorted(after_sorted, after, side='right')
+        gain[rows] = ahead_before - (non_owners_ahead + owners_ahead)
+        return gain
+
+    def rank_swing(self, points: int = 1):
+        """(player ids, gains): gains[i, m] = places manager m climbs if player_ids[i]
+        scores `points` more - for every player someone is playing"""
+        cached = self._swings.get(points)
+        if cached is None:
+            player_ids = np.flatnonzero(np.diff(self.column_ptr) > 0)
+            totals = self.totals
+            ordered = np.sort(totals)
+            gains = np.empty((len(player_ids), self.managers), dtype=np.int32)
+            for i, player_id in enumerate(player_ids.tolist()):
+                gains[i] = self._rank_gain(player_id, points, totals, ordered)
+            cached = self._swings[points] = (player_ids, gains)
+        return cached
+
+    def chip_breakdown(self) -> Dict[str, np.ndarray]:
+        """Per element id: managers owning, starting, captaining (x2), triple captaining,
+        and playing him from the bench under bench boost"""
+        o = self.ownership
+        starting = o.position <= 11
+
+        def count(mask):
+            return np.bincount(o.element[mask], minlength=self.size)
+
+        return {
+            'owned': count(np.ones(len(o.element), dtype=bool)),
+            'starting': count(starting),
+            'captain': count(o.is_captain & (o.multiplier == 2)),
+            'triple_captain': count(o.is_captain & (o.multiplier == 3)),
+            'bench_boost': count(~starting & (o.multiplier > 0)),
+        }
+
+
+def print_report(eo: EffectiveOwnership, players_map: Dict, names: List[str],
+                 manager_row: int = 0, points: int = 6, top: int = 15):
+    """הדפס דוח EO, חשיפה ותנודות דירוג"""
+    managers = eo.managers
+    breakdown = eo.chip_breakdown()
+    ranks = eo.ranks()
+
+    def name_of(player_id: int) -> str:
+        return players_map.get(player_id, {}).get('web_name', f"Unknown ({player_id})")
+
+    print("\n" + "=" * 80)
+    print("📊 EFFECTIVE OWNERSHIP - בעלות אפקטיבית בליגה")
+    print("=" * 80)
+    print(f"{'Player':<20} {'Owned':>7} {'XI':>7} {'C':>6} {'TC':>4} {'BB':>4} {'EO':>8} {'GW pts':>7}")
+    print("-" * 80)
+    for player_id in np.argsort(-eo.eo, kind='stable')[:top].tolist():
+        print(f"{name_of(player_id):<20} {breakdown['owned'][player_id] / managers:>7.0%} "
+              f"{breakdown['starting'][player_id] / managers:>7.0%} "
+              f"{breakdown['captain'][player_id] / managers:>6.0%} "
+              f"{breakdown['triple_captain'][player_id]:>4} {breakdown['bench_boost'][player_id]:>4} "
+              f"{eo.eo[player_id]:>8.0%} {eo.points_by_id[player_id]:>7}")
+
+    exposure = eo.exposure(manager_row)
+    order = np.argsort(exposure, kind='stable')
+    print(f"\n🎯 EXPOSURE - {names[manager_row]} (rank {ranks[manager_row]}, {eo.totals[manager_row]} pts)")
+    print("-" * 80)
+    print("   Gains ground when they score:   " + (", ".join(
+        f"{name_of(p)} {exposure[p]:+.2f}" for p in order[::-1][:5].tolist() if exposure[p] > 0) or "-"))
+    print("   Loses ground when they score:   " + (", ".join(
+        f"{name_of(p)} {exposure[p]:+.2f}" for p in order[:5].tolist() if exposure[p] < 0) or "-"))
+
+    player_ids, gains = eo.rank_swing(points)
+    if len(player_ids):
+        mine = gains[:, manager_row]
+        print(f"\n📈 RANK SWING - if a player scores {points} more points")
+        print("-" * 80)
+        for label, picks in (("Best for you", np.argsort(-mine, kind='stable')[:5]),
+                             ("Worst for you", np.argsort(mine, kind='stable')[:5])):
+            print(f"   {label + ':':<18}" + (", ".join(
+                f"{name_of(player_ids[i])} {mine[i]:+d}" for i in picks.tolist() if mine[i]) or "no rank change"))
+        moved = (gains != 0).sum(axis=1)
+        print("   Moves the most managers: " + ", ".join(
+            f"{name_of(player_ids[i])} ({moved[i]})" for i in np.argsort(-moved, kind='stable')[:5].tolist()))
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="League effective ownership and rank swings")
+    parser.add_argument("--data-dir", default="fpl_data")
+    parser.add_argument("--manager", help="Manager name (default: the league leader)")
+    parser.add_argument("--points", type=int, default=6, help="Extra points for the rank-swing question")
+    parser.add_argument("--top", type=int, default=15, help="Players to list")
+    parser.add_argument("--live", type=int, metavar="LEAGUE_ID",
+                        help="Poll live points and update after every poll")
+    parser.add_argument("--interval", type=float, default=60, help="Seconds between live polls")
+    args = parser.parse_args()
+
+    try:
+        store = FPLDataStore(args.data_dir)
+        eo = EffectiveOwnership.from_store(store)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        print("\nPlease run fpl_data_collector.py first!")
+        return
+
+    managers_data = store.managers()
+    names = [managers_data[m]['manager_info']['player_name'] for m in eo.ownership.manager_ids]
+    manager_row = int(np.argmax(eo.totals))
+    if args.manager:
+        manager_row = next((i for i, name in enumerate(names) if args.manager.lower() in name.lower()),
+                           manager_row)
+    players_map = store.players_by_id()
+    if not args.live:
+        print_report(eo, players_map, names, manager_row, args.points, args.top)
+    else:
+        from fpl_data_collector import FPLDataCollector
+
+        collector = FPLDataCollector(args.live, output_dir=args.data_dir)
+
+        def on_poll(event: Dict):
+            eo.on_live_event(event)
+            print_report(eo, players_map, names, manager_row, args.points, args.top)
+
+        collector.subscribe_live(on_poll)
+        collector.poll_live(interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,26 +10,117 @@ Collects data from Fantasy Premier League API for:
 import requests
 import json
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+
+from fpl_replay import Recorder
+from http_cache import CachingHTTPAdapter
+from live_poller import LiveDeltaLog, diff_live_elements, index_elements
+from picks_cache import PicksCache
+from rate_limiter import AdaptiveRateLimiter, get_shared_limiter, parse_retry_after
+from snapshot_index import SnapshotIndex
+from snapshot_io import SUFFIX, load_snapshot, resolve_snapshot, save_snapshot
+from snapshot_store import ingest_directory
 
 
 class FPLDataCollector:
     BASE_URL = "https://fantasy.premierleague.com/api"
+    DEFAULT_MAX_WORKERS = 10
+    MAX_RETRIES = 5
+    REQUEST_TIMEOUT = 30
     
-    def __init__(self, league_id: int, output_dir: str = "fpl_data"):
+    def __init__(self, league_id: int, output_dir: str = "fpl_data",
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 http_cache: bool = True, force_refresh: bool = False,
+                 base_url: str = BASE_URL, record_dir: Optional[str] = None,
+                 snapshot_format: str = "fpls"):
         self.league_id = league_id
+        self.snapshot_format = snapshot_format
+        self.base_url = base_url.rstrip('/')
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = rate_limiter or get_shared_limiter()
         self.session = requests.Session()
+        # Connection pool sized for the worker threads sharing this session
+        pool_size = {'pool_connections': self.max_workers, 'pool_maxsize': self.max_workers}
+        if http_cache:
+            self.http_cache = CachingHTTPAdapter(
+                self.output_dir / "http_cache.sqlite", force_refresh=force_refresh, **pool_size
+            )
+            adapter = self.http_cache
+        else:
+            self.http_cache = None
+            adapter = HTTPAdapter(**pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.live_listeners: List[Callable[[Dict], None]] = []
+        if record_dir:
+            Recorder(record_dir).attach(self.session, self.base_url)
+    
+    def _get(self, endpoint: str, path: str, params: Optional[Dict] = None,
+             revalidate: bool = False, cache: bool = True) -> Dict:
+        """GET an API path through the shared rate limiter, retrying 429/5xx and network errors.
+        
+        revalidate=True skips the cache TTL (the cached copy is only used on a 304);
+        cache=False bypasses the HTTP cache entirely.
+        """
+        url = f"{self.base_url}{path}"
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+        headers = {'Cache-Control': 'no-cache'} if revalidate else None
+        if not cache:
+            headers = {'Cache-Control': 'no-store'}
+        for attempt in range(self.MAX_RETRIES + 1):
+            # Fresh cache hits never reach the network, so they don't spend a token
+            if revalidate or not (cache and self.http_cache and self.http_cache.is_fresh(prepared.url)):
+                self.rate_limiter.acquire(endpoint)
+            retry_after = None
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, params=params, headers=headers,
+                                            timeout=self.REQUEST_TIMEOUT)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+                self.rate_limiter.record_failure(endpoint)
+            else:
+                if response.status_code == 429 or response.status_code >= 500:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    self.rate_limiter.record_failure(
+                        endpoint, retry_after, throttled=response.status_code == 429
+                    )
+                    error = requests.exceptions.HTTPError(
+                        f"{response.status_code} for url: {url}", response=response
+                    )
+                else:
+                    # Only a round trip tells the limiter about the server - a fresh cache
+                    # hit does not (a 304 revalidation does)
+                    if not getattr(response, 'from_cache', False) or response.revalidated:
+                        self.rate_limiter.record_success(endpoint, time.monotonic() - started)
+                    response.raise_for_status()
+                    return response.json()
+            
+            if attempt == self.MAX_RETRIES:
+                raise error
+            delay = self.rate_limiter.backoff_delay(attempt, retry_after)
+            print(f"⚠️ {error} - retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{self.MAX_RETRIES})")
+            time.sleep(delay)
         
     def get_bootstrap_data(self) -> Dict:
         """Get global FPL data including all players, teams, and gameweeks"""
         print("Fetching bootstrap-static data...")
-        response = self.session.get(f"{self.BASE_URL}/bootstrap-static/")
-        response.raise_for_status()
-        return response.json()
+        return self._get('bootstrap-static', "/bootstrap-static/")
+    
+    def get_fixtures(self) -> List[Dict]:
+        """Get every fixture of the season (gameweek, teams, difficulty)"""
+        print("Fetching fixtures...")
+        return self._get('fixtures', "/fixtures/")
     
     def get_current_gameweek(self, bootstrap_data: Dict) -> int:
         """Get current gameweek number"""
@@ -42,42 +133,335 @@ class FPLDataCollector:
                 return event['id']
         return 1
     
+    def get_league_standings_page(self, page: int) -> Dict:
+        """Get one page (50 entries) of the league standings"""
+        print(f"Fetching league {self.league_id} standings page {page}...")
+        return self._get('standings', f"/leagues-classic/{self.league_id}/standings/",
+                         params={'page_standings': page})
+    
+    def iter_league_standings_pages(self) -> Iterator[Dict]:
+        """Yield standings pages as they arrive - page 1 first, then the rest concurrently.
+        
+        The API only reports has_next, so pages are requested in a sliding window of
+        max_workers pages until one comes back without a next page.
+        """
+        first_page = self.get_league_standings_page(1)
+        yield first_page
+        if not first_page['standings']['has_next']:
+            return
+        
+        next_page = 2
+        last_page = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            while True:
+                while len(pending) < self.max_workers and (last_page is None or next_page <= last_page):
+                    pending[executor.submit(self.get_league_standings_page, next_page)] = next_page
+                    next_page += 1
+                if not pending:
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page_number = pending.pop(future)
+                    page = future.result()
+                    if not page['standings']['has_next']:
+                        last_page = page_number if last_page is None else min(last_page, page_number)
+                    # Pages requested past the end come back empty
+                    if page['standings']['results'] and (last_page is None or page_number <= last_page):
+                        yield page
+    
+    @staticmethod
+    def merge_standings_pages(pages: Iterable[Dict]) -> Dict:
+        """Combine standings pages into a single page-1 shaped response"""
+        pages = sorted(pages, key=lambda p: p['standings']['page'])
+        league_data = dict(pages[0])
+        league_data['standings'] = {
+            **pages[0]['standings'],
+            'has_next': False,
+            'results': [entry for page in pages for entry in page['standings']['results']]
+        }
+        return league_data
+    
     def get_league_standings(self) -> Dict:
-        """Get private league standings"""
+        """Get private league standings (all pages)"""
         print(f"Fetching league {self.league_id} standings...")
-        response = self.session.get(
-            f"{self.BASE_URL}/leagues-classic/{self.league_id}/standings/"
-        )
-        response.raise_for_status()
-        return response.json()
+        return self.merge_standings_pages(self.iter_league_standings_pages())
     
     def get_manager_history(self, manager_id: int) -> Dict:
         """Get manager's full season history"""
         print(f"Fetching manager {manager_id} history...")
-        response = self.session.get(f"{self.BASE_URL}/entry/{manager_id}/history/")
-        response.raise_for_status()
-        time.sleep(0.5)  # Rate limiting
-        return response.json()
+        return self._get('history', f"/entry/{manager_id}/history/")
     
-    def get_manager_gameweek_picks(self, manager_id: int, gameweek: int) -> Dict:
-        """Get manager's picks for a specific gameweek"""
+    def get_manager_gameweek_picks(self, manager_id: int, gameweek: int, cache: bool = True) -> Dict:
+        """Get manager's picks for a specific gameweek (cache=False: skip the HTTP cache)"""
         print(f"Fetching manager {manager_id} picks for GW{gameweek}...")
-        response = self.session.get(
-            f"{self.BASE_URL}/entry/{manager_id}/event/{gameweek}/picks/"
-        )
-        response.raise_for_status()
-        time.sleep(0.5)  # Rate limiting
-        return response.json()
-    
-    def get_gameweek_live_data(self, gameweek: int) -> Dict:
+        return self._get('picks', f"/entry/{manager_id}/event/{gameweek}/picks/", cache=cache)
+    
+    def get_gameweek_live_data(self, gameweek: int, revalidate: bool = False) -> Dict:
         """Get live data for a specific gameweek"""
         print(f"Fetching live data for GW{gameweek}...")
-        response = self.session.get(f"{self.BASE_URL}/event/{gameweek}/live/")
-        response.raise_for_status()
-        return response.json()
+        return self._get('live', f"/event/{gameweek}/live/", revalidate=revalidate)
+    
+    def subscribe_live(self, callback: Callable[[Dict], None]):
+        """Register a consumer for poll_live's "changed elements" events"""
+        self.live_listeners.append(callback)
+    
+    def _publish_live(self, event: Dict):
+        for callback in self.live_listeners:
+            callback(event)
+    
+    def poll_live(self, gameweek: Optional[int] = None, interval: float = 60,
+                  checkpoint_every: int = 10, max_polls: Optional[int] = None):
+        """Poll /event/{gw}/live/ and persist only what changed.
+        
+        Subscribers first get a seq 0 event carrying the full baseline fetch as
+        'live_data' (no changes) to sync to - later deltas are relative to it. Each poll
+        then appends the changed elements to live_gw<N>_<date>.deltas.jsonl and
+        publishes an event to subscribers; every `checkpoint_every` polls (and on exit)
+        the full live_gw<N>_<date> snapshot is rewritten, in the configured snapshot
+        format, so loaders see fresh points. A poll whose fetch fails (retries
+        exhausted) is logged and skipped without advancing `seq` - polling goes on.
+        """
+        if gameweek is None:
+            gameweek = self.get_current_gameweek(self.get_bootstrap_data())
+        
+        suffix = SUFFIX if self.snapshot_format == "fpls" else ".json"
+        live_file = self.output_dir / f"live_gw{gameweek}_{datetime.now().date().isoformat()}{suffix}"
+        delta_log = LiveDeltaLog(live_file)
+        index = SnapshotIndex(str(self.output_dir))
+        
+        def checkpoint(seq: int, live_data: Dict):
+            delta_log.checkpoint(seq, live_data)
+            index.append(self.league_id, gameweek, {'live': live_file})
+        
+        print(f"\n📡 Polling GW{gameweek} live data every {interval}s "
+              f"(checkpoint every {checkpoint_every} polls) - Ctrl+C to stop")
+        print(f"   Delta log: {delta_log.path}\n")
+        
+        live_data = self.get_gameweek_live_data(gameweek, revalidate=True)
+        elements = index_elements(live_data)
+        checkpoint(0, live_data)
+        self._publish_live({
+            'gameweek': gameweek,
+            'seq': 0,
+            'timestamp': datetime.now().isoformat(),
+            'changed_elements': [],
+            'changes': {},
+            'deltas': {},
+            'live_data': live_data,
+        })
+        
+        seq = 0
+        polls_since_checkpoint = 0
+        try:
+            while max_polls is None or seq < max_polls:
+                time.sleep(interval)
+                try:
+                    live_data = self.get_gameweek_live_data(gameweek, revalidate=True)
+                except requests.exceptions.RequestException as e:
+                    # Retries exhausted - skip this poll and try again next interval
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ poll failed: {e}")
+                    continue
+                seq += 1
+                current = index_elements(live_data)
+                changes, deltas = diff_live_elements(elements, current)
+                elements = current
+                polls_since_checkpoint += 1
+                
+                if changes:
+                    delta_log.append(seq, gameweek, changes)
+                    self._publish_live({
+                        'gameweek': gameweek,
+                        'seq': seq,
+                        'timestamp': datetime.now().isoformat(),
+                        'changed_elements': sorted(changes),
+                        'changes': changes,
+                        'deltas': deltas,
+                    })
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] poll {seq}: "
+                      f"{len(changes)} elements changed")
+                
+                if polls_since_checkpoint >= checkpoint_every:
+                    checkpoint(seq, live_data)
+                    polls_since_checkpoint = 0
+        except KeyboardInterrupt:
+            print("\n⏹️  Polling stopped")
+        finally:
+            if polls_since_checkpoint:
+                checkpoint(seq, live_data)
+            print(f"✓ Live data checkpoint: {live_file}")
+    
+    def collect_manager_data(self, standing: Dict, current_gw: int) -> Tuple[int, Dict]:
+        """Collect history and current picks for a single league entry"""
+        manager_id = standing['entry']
+        manager_name = standing['entry_name']
+        player_name = standing['player_name']
+        
+        print(f"Processing: {player_name} ({manager_name})")
+        
+        # Get manager history
+        history = self.get_manager_history(manager_id)
+        
+        # Get current gameweek picks
+        picks = self.get_manager_gameweek_picks(manager_id, current_gw)
+        
+        print(f"✓ Completed {player_name}\n")
+        
+        return manager_id, {
+            'manager_info': {
+                'id': manager_id,
+                'player_name': player_name,
+                'team_name': manager_name,
+                'total_points': standing['total']
+            },
+            'history': history,
+            'current_picks': picks
+        }
+    
+    def load_previous_managers_data(self, current_gw: int, bootstrap_data: Dict) -> Dict:
+        """Load the last managers snapshot if it can seed an incremental run.
+        
+        Only a snapshot of this league, taken for the same gameweek after its data was
+        checked (final ranks and bonus), is reusable - before that, ranks move even
+        when a manager's points don't.
+        """
+        index = SnapshotIndex(str(self.output_dir))
+        entry = index.latest('summary', self.league_id)
+        if not entry or not index.resolve(entry, 'summary').exists():
+            return {}
+        with open(index.resolve(entry, 'summary'), 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+        
+        event = next((e for e in bootstrap_data['events'] if e['id'] == current_gw), {})
+        if (summary.get('league_id') != self.league_id
+                or summary.get('current_gameweek') != current_gw
+                or not summary.get('gameweek_data_checked')
+                or not event.get('data_checked')):
+            return {}
+        
+        managers_file = resolve_snapshot(index.resolve(entry, 'managers'))
+        if not managers_file:
+            return {}
+        return load_snapshot(managers_file)
+    
+    @staticmethod
+    def is_manager_unchanged(previous: Dict, standing: Dict, current_gw: int) -> bool:
+        """Does the fresh standings row match the manager's previous snapshot?"""
+        history = previous['history']['current']
+        if not history:
+            return False
+        latest = history[-1]
+        picks_event = previous['current_picks'].get('entry_history', {}).get('event', current_gw)
+        return (latest['event'] == current_gw
+                and picks_event == current_gw
+                and latest['points'] == standing['event_total']
+                and latest['total_points'] == standing['total']
+                and previous['manager_info']['total_points'] == standing['total'])
     
-    def collect_all_data(self):
-        """Main function to collect all data"""
+    def collect_managers_data(self, standings: Iterable[Dict], current_gw: int,
+                              previous: Optional[Dict] = None) -> Dict:
+        """Collect managers concurrently, submitting each entry as soon as it is yielded.
+        
+        Managers found unchanged in `previous` are carried forward without any request.
+        """
+        previous = previous or {}
+        # One slot per entry in standings order: the carried-forward data or its future
+        slots = []
+        carried = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for standing in standings:
+                previous_data = previous.get(str(standing['entry']))
+                if previous_data and self.is_manager_unchanged(previous_data, standing, current_gw):
+                    carried += 1
+                    slots.append((standing['entry'], {
+                        **previous_data,
+                        'manager_info': {
+                            'id': standing['entry'],
+                            'player_name': standing['player_name'],
+                            'team_name': standing['entry_name'],
+                            'total_points': standing['total']
+                        }
+                    }))
+                else:
+                    slots.append(executor.submit(self.collect_manager_data, standing, current_gw))
+            
+            if previous:
+                print(f"♻️  {carried} unchanged managers carried forward, "
+                      f"{len(slots) - carried} to fetch\n")
+            managers_data = {}
+            for slot in slots:
+                manager_id, manager_data = slot if isinstance(slot, tuple) else slot.result()
+                managers_data[manager_id] = manager_data
+        return managers_data
+    
+    def _backfill_one(self, cache: PicksCache, entry: int, event: int) -> bool:
+        """Fetch and cache one (entry, event); False if the entry has no picks for it"""
+        try:
+            # Finished gameweeks go to the permanent picks cache only - not the HTTP cache too
+            picks = self.get_manager_gameweek_picks(entry, event, cache=False)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                cache.mark_not_found(entry, event)
+                return False
+            raise
+        cache.put(entry, event, picks)
+        return True
+    
+    def backfill_picks(self) -> Dict:
+        """Cache picks of every league manager for every finished gameweek.
+        
+        Already cached (entry, event) pairs are skipped, so an interrupted backfill
+        resumes where it stopped and reruns cost only the new gameweeks.
+        """
+        print(f"\n{'='*60}")
+        print(f"Picks Backfill Started: {datetime.now().isoformat()}")
+        print(f"{'='*60}\n")
+        
+        cache = PicksCache(str(self.output_dir))
+        bootstrap_data = self.get_bootstrap_data()
+        finished_events = [e['id'] for e in bootstrap_data['events'] if e['finished']]
+        
+        entries = [
+            standing['entry']
+            for page in self.iter_league_standings_pages()
+            for standing in page['standings']['results']
+        ]
+        missing = [
+            (entry, event)
+            for entry in entries
+            for event in finished_events
+            if not cache.has(entry, event)
+        ]
+        total = len(entries) * len(finished_events)
+        print(f"{len(entries)} managers x {len(finished_events)} finished gameweeks: "
+              f"{total - len(missing)} cached, {len(missing)} to fetch\n")
+        
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._backfill_one, cache, entry, event)
+                for entry, event in missing
+            ]
+            for future in futures:
+                if future.result():
+                    fetched += 1
+        
+        print(f"\n✓ Backfill complete: {fetched} picks fetched, "
+              f"{len(missing) - fetched} gameweeks without picks, cache at {cache.root}\n")
+        return {
+            'managers': len(entries),
+            'finished_gameweeks': len(finished_events),
+            'already_cached': total - len(missing),
+            'fetched': fetched,
+        }
+    
+    def collect_all_data(self, incremental: bool = False):
+        """Main function to collect all data
+        
+        incremental=True reuses the previous snapshot for managers whose standings
+        (total, event_total, gameweek) show nothing new since it was taken.
+        """
         timestamp = datetime.now().isoformat()
         print(f"\n{'='*60}")
         print(f"FPL Data Collection Started: {timestamp}")
@@ -90,71 +474,76 @@ class FPLDataCollector:
             print(f"Current Gameweek: {current_gw}\n")
             
             # Save bootstrap data
-            bootstrap_file = self.output_dir / f"bootstrap_data_{timestamp.split('T')[0]}.json"
-            with open(bootstrap_file, 'w', encoding='utf-8') as f:
-                json.dump(bootstrap_data, f, indent=2, ensure_ascii=False)
+            bootstrap_file = save_snapshot(
+                self.output_dir / f"bootstrap_data_{timestamp.split('T')[0]}",
+                bootstrap_data, self.snapshot_format
+            )
             print(f"✓ Saved bootstrap data to {bootstrap_file}\n")
             
-            # 2. Get league standings
-            league_data = self.get_league_standings()
-            league_file = self.output_dir / f"league_{self.league_id}_{timestamp.split('T')[0]}.json"
-            with open(league_file, 'w', encoding='utf-8') as f:
-                json.dump(league_data, f, indent=2, ensure_ascii=False)
-            print(f"✓ Saved league standings to {league_file}\n")
+            # Fixture schedule - snapshots are dicts at the top level, so the list is wrapped
+            fixtures_file = save_snapshot(
+                self.output_dir / f"fixtures_{timestamp.split('T')[0]}",
+                {'fixtures': self.get_fixtures()}, self.snapshot_format
+            )
+            print(f"✓ Saved fixtures to {fixtures_file}\n")
             
-            # 3. Get current gameweek live data
+            # 2. Get current gameweek live data
             live_data = self.get_gameweek_live_data(current_gw)
-            live_file = self.output_dir / f"live_gw{current_gw}_{timestamp.split('T')[0]}.json"
-            with open(live_file, 'w', encoding='utf-8') as f:
-                json.dump(live_data, f, indent=2, ensure_ascii=False)
+            live_file = save_snapshot(
+                self.output_dir / f"live_gw{current_gw}_{timestamp.split('T')[0]}",
+                live_data, self.snapshot_format
+            )
             print(f"✓ Saved live GW{current_gw} data to {live_file}\n")
             
-            # 4. Get detailed data for each manager in the league
-            managers_data = {}
+            # 3. Stream league standings pages straight into the manager work queue
+            standings_pages = []
+            
+            def stream_standings():
+                for page in self.iter_league_standings_pages():
+                    standings_pages.append(page)
+                    yield from page['standings']['results']
+            
+            print(f"Collecting manager data ({self.max_workers} parallel workers)...\n")
+            previous = {}
+            if incremental:
+                previous = self.load_previous_managers_data(current_gw, bootstrap_data)
+                if not previous:
+                    print("No reusable snapshot for this gameweek - running a full collection\n")
+            collected = self.collect_managers_data(stream_standings(), current_gw, previous)
+            
+            league_data = self.merge_standings_pages(standings_pages)
             standings = league_data['standings']['results']
+            league_file = save_snapshot(
+                self.output_dir / f"league_{self.league_id}_{timestamp.split('T')[0]}",
+                league_data, self.snapshot_format
+            )
+            print(f"✓ Saved league standings ({len(standings)} managers) to {league_file}\n")
             
-            print(f"Collecting data for {len(standings)} managers...\n")
-            for standing in standings:
-                manager_id = standing['entry']
-                manager_name = standing['entry_name']
-                player_name = standing['player_name']
-                
-                print(f"Processing: {player_name} ({manager_name})")
-                
-                # Get manager history
-                history = self.get_manager_history(manager_id)
-                
-                # Get current gameweek picks
-                picks = self.get_manager_gameweek_picks(manager_id, current_gw)
-                
-                managers_data[manager_id] = {
-                    'manager_info': {
-                        'id': manager_id,
-                        'player_name': player_name,
-                        'team_name': manager_name,
-                        'total_points': standing['total']
-                    },
-                    'history': history,
-                    'current_picks': picks
-                }
-                
-                print(f"✓ Completed {player_name}\n")
+            # 4. Order the detailed manager data by league standings
+            managers_data = {
+                standing['entry']: collected[standing['entry']] for standing in standings
+            }
             
             # Save all managers data
-            managers_file = self.output_dir / f"managers_detailed_{timestamp.split('T')[0]}.json"
-            with open(managers_file, 'w', encoding='utf-8') as f:
-                json.dump(managers_data, f, indent=2, ensure_ascii=False)
+            managers_file = save_snapshot(
+                self.output_dir / f"managers_detailed_{timestamp.split('T')[0]}",
+                managers_data, self.snapshot_format
+            )
             print(f"✓ Saved detailed managers data to {managers_file}\n")
             
             # 5. Create summary
             summary = {
                 'collection_timestamp': timestamp,
                 'current_gameweek': current_gw,
+                'gameweek_data_checked': any(
+                    e['id'] == current_gw and e.get('data_checked') for e in bootstrap_data['events']
+                ),
                 'league_id': self.league_id,
                 'league_name': league_data['league']['name'],
                 'total_managers': len(standings),
                 'files_created': {
                     'bootstrap_data': str(bootstrap_file),
+                    'fixtures': str(fixtures_file),
                     'league_standings': str(league_file),
                     'live_gameweek_data': str(live_file),
                     'managers_detailed': str(managers_file)
@@ -165,11 +554,24 @@ class FPLDataCollector:
             with open(summary_file, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, indent=2, ensure_ascii=False)
             
+            # Readers locate snapshots through the index, without scanning the directory
+            SnapshotIndex(str(self.output_dir)).append(self.league_id, current_gw, {
+                'bootstrap': bootstrap_file,
+                'fixtures': fixtures_file,
+                'league': league_file,
+                'live': live_file,
+                'managers': managers_file,
+                'summary': summary_file
+            }, timestamp=timestamp)
+            
             print(f"{'='*60}")
             print(f"Collection Complete!")
             print(f"{'='*60}")
-            print(f"Total files created: 5")
+            print(f"Total files created: 6")
             print(f"Output directory: {self.output_dir}")
+            if self.http_cache:
+                print(f"HTTP cache: {self.http_cache.hits} hits, "
+                      f"{self.http_cache.revalidated} revalidated, {self.http_cache.misses} downloads")
             print(f"{'='*60}\n")
             
             return summary
@@ -184,10 +586,13 @@ class FPLDataCollector:
 
 def main():
     """Main entry point"""
+    import argparse
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python fpl_data_collector.py <league_id>")
+        print("Usage: python fpl_data_collector.py <league_id> "
+              "[--workers N] [--incremental] [--backfill-picks] [--force-refresh]")
+        print("       python fpl_data_collector.py <league_id> --poll-live [--interval S]")
         print("\nExample: python fpl_data_collector.py 123456")
         print("\nTo find your league ID:")
         print("1. Go to your league page on fantasy.premierleague.com")
@@ -195,10 +600,48 @@ def main():
         print("3. The number (123456) is your league ID")
         sys.exit(1)
     
-    league_id = int(sys.argv[1])
+    parser = argparse.ArgumentParser(description="Collect FPL league data")
+    parser.add_argument("league_id", type=int, help="Classic league ID")
+    parser.add_argument("--workers", type=int, default=FPLDataCollector.DEFAULT_MAX_WORKERS,
+                        help="Managers fetched in parallel (1 = sequential)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only refetch managers whose standings changed since the last run")
+    parser.add_argument("--backfill-picks", action="store_true",
+                        help="Cache every manager's picks for all finished gameweeks and exit")
+    parser.add_argument("--force-refresh", action="store_true",
+                        help="Ignore the HTTP response cache and download everything")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Disable the HTTP response cache")
+    parser.add_argument("--poll-live", action="store_true",
+                        help="Keep polling the current gameweek's live data (diff-only snapshots)")
+    parser.add_argument("--interval", type=float, default=60,
+                        help="Seconds between live polls (default 60)")
+    parser.add_argument("--checkpoint-every", type=int, default=10,
+                        help="Polls between full live data checkpoints (default 10)")
+    parser.add_argument("--base-url", default=FPLDataCollector.BASE_URL,
+                        help="API root, e.g. a local fpl_replay.py server")
+    parser.add_argument("--record", metavar="DIR",
+                        help="Record every API response into DIR for offline replay")
+    parser.add_argument("--format", choices=["fpls", "json"], default="fpls",
+                        help="Snapshot format: compact .fpls (default) or indented .json")
+    parser.add_argument("--store", action="store_true",
+                        help="Add the snapshots to the deduplicated store and delete older flat files")
+    args = parser.parse_args()
     
-    collector = FPLDataCollector(league_id=league_id)
-    collector.collect_all_data()
+    collector = FPLDataCollector(league_id=args.league_id, max_workers=args.workers,
+                                 http_cache=not args.no_cache, force_refresh=args.force_refresh,
+                                 base_url=args.base_url, record_dir=args.record,
+                                 snapshot_format=args.format)
+    if args.poll_live:
+        collector.poll_live(interval=args.interval, checkpoint_every=args.checkpoint_every)
+    elif args.backfill_picks:
+        collector.backfill_picks()
+    else:
+        collector.collect_all_data(incremental=args.incremental)
+        if args.store:
+            totals = ingest_directory(str(collector.output_dir), remove_old=True)
+            print(f"🗄️  Snapshot store: {totals['new_chunks']} new of {totals['chunks']} chunks, "
+                  f"{totals['removed']} older flat files removed")
 
 
 if __name__ == "__main__":
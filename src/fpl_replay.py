@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+FPL API Record / Replay
+Offline stand-in for fantasy.premierleague.com, for benchmarking and regression-testing
+FPLDataCollector without touching the real API:
+
+- Recorder: captures every request/response a collector makes (--record DIR)
+- RecordingSource: serves a recorded directory back
+- SyntheticLeague: generates a deterministic league of any size on the fly
+- ReplayServer: local HTTP server with configurable latency, error rate and 429 injection
+
+Usage:
+    python src/fpl_replay.py serve --recording recordings/922765 --port 8000
+    python src/fpl_replay.py serve --synthetic 5000 --latency 0.05 --throttle-rate 0.01
+    python src/fpl_replay.py bench --synthetic 2000 --workers 10 --error-rate 0.02
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+def _request_key(url: str, base_url: str) -> str:
+    """Path + query relative to the API root, e.g. /entry/1/history/"""
+    if url.startswith(base_url):
+        url = url[len(base_url):]
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class Recorder:
+    """Session response hook that stores every API response under a directory"""
+
+    def __init__(self, record_dir: str):
+        self.root = Path(record_dir)
+        (self.root / "responses").mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.jsonl"
+        self._lock = threading.Lock()
+
+    def attach(self, session, base_url: str):
+        def hook(response, *args, **kwargs):
+            self.record(_request_key(response.url, base_url), response)
+        session.hooks['response'].append(hook)
+
+    def record(self, key: str, response):
+        body_name = hashlib.sha1(key.encode()).hexdigest() + ".json"
+        record = {
+            'key': key,
+            'status': response.status_code,
+            'content_type': response.headers.get('Content-Type', 'application/json'),
+            'body': body_name,
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            with open(self.root / "responses" / body_name, 'wb') as f:
+                f.write(response.content)
+            with open(self.index_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+
+
+class RecordingSource:
+    """Serves responses captured by Recorder (last recording of a key wins)"""
+
+    def __init__(self, record_dir: str):
+        self.root = Path(record_dir)
+        self.index = {}
+        with open(self.root / "index.jsonl", 'r', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                self.index[record['key']] = record
+
+    def lookup(self, key: str) -> Optional[bytes]:
+        record = self.index.get(key)
+        if not record or record['status'] != 200:
+            return None
+        return (self.root / "responses" / record['body']).read_bytes()
+
+
+class SyntheticLeague:
+    """Deterministic FPL-shaped API for a classic league of any size"""
+
+    PAGE_SIZE = 50
+    SQUAD_SHAPE = {1: 2, 2: 5, 3: 5, 4: 3}
+
+    def __init__(self, managers: int = 50, league_id: int = 1, current_gw: int = 20,
+                 players: int = 700, seed: int = 0):
+        self.managers = managers
+        self.league_id = league_id
+        self.current_gw = current_gw
+        self.seed = seed
+        rnd = random.Random(seed)
+
+        self.teams = [
+            {'id': t, 'name': f"Team {t}", 'short_name': f"T{t:02d}", 'strength': rnd.randint(2, 5)}
+            for t in range(1, 21)
+        ]
+        self.elements = []
+        for element_id in range(1, players + 1):
+            element_type = rnd.choices([1, 2, 3, 4], weights=[1, 3, 4, 2])[0]
+            ppg = rnd.uniform(0, 7) if rnd.random() > 0.2 else 0.0
+            self.elements.append({
+                'id': element_id,
+                'web_name': f"Player{element_id}",
+                'first_name': "Synthetic",
+                'second_name': f"Player{element_id}",
+                'team': rnd.randint(1, 20),
+                'element_type': element_type,
+                'now_cost': rnd.randint(40, 150) if element_type != 1 else rnd.randint(40, 60),
+                'form': f"{max(0.0, ppg + rnd.uniform(-2, 2)):.1f}",
+                'points_per_game': f"{ppg:.1f}",
+                'ict_index': f"{ppg * 20 + rnd.uniform(0, 30):.1f}",
+                'selected_by_percent': f"{rnd.uniform(0, 50):.1f}",
+                'minutes': int(ppg / 7 * 90 * (current_gw - 1)),
+                'total_points': int(ppg * (current_gw - 1)),
+                'event_points': 0,
+                'bonus': rnd.randint(0, 20),
+                'goals_scored': rnd.randint(0, 15) if element_type > 2 else rnd.randint(0, 2),
+                'assists': rnd.randint(0, 10),
+                'clean_sheets': rnd.randint(0, 10),
+                'status': rnd.choices(['a', 'd', 'i', 's'], weights=[90, 4, 4, 2])[0],
+                'news': '',
+                'chance_of_playing_next_round': None,
+            })
+        self.by_type = {
+            element_type: [e['id'] for e in self.elements if e['element_type'] == element_type]
+            for element_type in self.SQUAD_SHAPE
+        }
+        self.events = [
+            {
+                'id': gw, 'name': f"Gameweek {gw}",
+                'finished': gw < current_gw, 'data_checked': gw < current_gw,
+                'is_previous': gw == current_gw - 1, 'is_current': gw == current_gw,
+                'is_next': gw == current_gw + 1,
+                'average_entry_score': rnd.randint(40, 65) if gw <= current_gw else 0,
+                'highest_score': rnd.randint(100, 150) if gw <= current_gw else None,
+            }
+            for gw in range(1, 39)
+        ]
+
+        entries = [self.entry_id(i) for i in range(managers)]
+        self.ranked_entries = sorted(
+            entries, key=lambda e: (-self.history(e)['current'][-1]['total_points'], e)
+        )
+
+    def entry_id(self, index: int) -> int:
+        return 100000 + index
+
+    def _rnd(self, *key) -> random.Random:
+        # str seeds are hashed deterministically (unlike hash(), which is salted per process)
+        return random.Random(repr((self.seed,) + key))
+
+    @lru_cache(maxsize=None)
+    def history(self, entry: int) -> Dict:
+        rnd = self._rnd('history', entry)
+        total = 0
+        overall_rank = rnd.randint(100000, 8000000)
+        current = []
+        for gw in range(1, self.current_gw + 1):
+            points = max(10, int(rnd.gauss(52, 14)))
+            cost = rnd.choice([0, 0, 0, 0, 4])
+            total += points - cost
+            overall_rank = max(1, int(overall_rank * rnd.uniform(0.8, 1.2)))
+            current.append({
+                'event': gw, 'points': points, 'total_points': total,
+                'rank': rnd.randint(1, 9000000), 'overall_rank': overall_rank,
+                'bank': rnd.randint(0, 30), 'value': rnd.randint(990, 1050),
+                'event_transfers': rnd.randint(0, 2), 'event_transfers_cost': cost,
+                'points_on_bench': rnd.randint(0, 15),
+            })
+        return {'current': current, 'past': [], 'chips': []}
+
+    def picks(self, entry: int, gameweek: int) -> Dict:
+        rnd = self._rnd('picks', entry, gameweek)
+        squad = []
+        for element_type, count in self.SQUAD_SHAPE.items():
+            squad.extend(rnd.sample(self.by_type[element_type], count))
+        # XI: 1 GK, 4 DEF, 4 MID, 2 FWD; bench: GK + 1 DEF + 1 MID + 1 FWD
+        starting = [squad[0]] + squad[2:6] + squad[7:11] + squad[12:14]
+        bench = [squad[1], squad[6], squad[11], squad[14]]
+        picks = []
+        for position, element_id in enumerate(starting + bench, 1):
+            picks.append({
+                'element': element_id, 'position': position,
+                'multiplier': 2 if position == 10 else (1 if position <= 11 else 0),
+                'is_captain': position == 10, 'is_vice_captain': position == 9,
+            })
+        history_row = self.history(entry)['current'][min(gameweek, self.current_gw) - 1]
+        return {'active_chip': None, 'automatic_subs': [], 'entry_history': history_row, 'picks': picks}
+
+    def standings_page(self, page: int) -> Dict:
+        start = (page - 1) * self.PAGE_SIZE
+        results = []
+        for rank, entry in enumerate(self.ranked_entries[start:start + self.PAGE_SIZE], start + 1):
+            latest = self.history(entry)['current'][-1]
+            results.append({
+                'id': entry, 'entry': entry, 'rank': rank, 'last_rank': rank,
+                'entry_name': f"Synthetic FC {entry}", 'player_name': f"Manager {entry}",
+                'total': latest['total_points'], 'event_total': latest['points'],
+            })
+        return {
+            'league': {'id': self.league_id, 'name': f"Synthetic League ({self.managers})"},
+            'standings': {
+                'has_next': start + self.PAGE_SIZE < self.managers, 'page': page, 'results': results
+            },
+        }
+
+    def live(self, gameweek: int) -> Dict:
+        elements = []
+        for element in self.elements:
+            rnd = self._rnd('live', gameweek, element['id'])
+            minutes = rnd.choice([0, 0, 90, 90, 90, 60, 25])
+            points = 0 if not minutes else max(-1, int(rnd.gauss(3, 3)))
+            elements.append({
+                'id': element['id'],
+                'stats': {
+                    'minutes': minutes, 'goals_scored': int(points >= 8), 'assists': int(points >= 6),
+                    'clean_sheets': int(minutes >= 60 and rnd.random() < 0.3),
+                    'bonus': rnd.choice([0, 0, 0, 1, 2, 3]) if points >= 6 else 0,
+                    'bps': max(0, points * 4), 'total_points': points,
+                },
+                'explain': [],
+            })
+        return {'elements': elements}
+
+    def fixtures(self) -> List[Dict]:
+        fixtures = []
+        fixture_id = 1
+        for gw in range(1, 39):
+            rnd = self._rnd('fixtures', gw)
+            teams = [t['id'] for t in self.teams]
+            rnd.shuffle(teams)
+            for home, away in zip(teams[0::2], teams[1::2]):
+                fixtures.append({
+                    'id': fixture_id, 'event': gw, 'team_h': home, 'team_a': away,
+                    'team_h_difficulty': self.teams[away - 1]['strength'],
+                    'team_a_difficulty': self.teams[home - 1]['strength'],
+                    'finished': gw < self.current_gw,
+                    'kickoff_time': None,
+                })
+                fixture_id += 1
+        return fixtures
+
+    def lookup(self, key: str) -> Optional[bytes]:
+        parts = urlsplit(key)
+        segments = [s for s in parts.path.split('/') if s]
+        query = parse_qs(parts.query)
+        body = None
+
+        if segments == ['bootstrap-static']:
+            body = {'events': self.events, 'teams': self.teams, 'elements': self.elements,
+                    'element_types': [{'id': t} for t in self.SQUAD_SHAPE]}
+        elif segments == ['fixtures']:
+            body = self.fixtures()
+        elif segments[:1] == ['leagues-classic'] and segments[2:] == ['standings']:
+            if int(segments[1]) == self.league_id:
+                body = self.standings_page(int(query.get('page_standings', ['1'])[0]))
+        elif segments[:1] == ['event'] and segments[2:] == ['live']:
+            body = self.live(int(segments[1]))
+        elif segments[:1] == ['entry'] and len(segments) >= 3:
+            entry = int(segments[1])
+            if 100000 <= entry < 100000 + self.managers:
+                if segments[2:] == ['history']:
+                    body = self.history(entry)
+                elif segments[2] == 'event' and segments[4:] == ['picks']:
+                    gameweek = int(segments[3])
+                    if gameweek <= self.current_gw:
+                        body = self.picks(entry, gameweek)
+
+        return None if body is None else json.dumps(body).encode('utf-8')
+
+
+class ReplayServer:
+    """Threaded local HTTP server answering /api/... from a source, with fault injection"""
+
+    def __init__(self, source, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: int = 1,
+                 seed: int = 0):
+        self.source = source
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.stats = {'requests': 0, 'ok': 0, 'not_modified': 0, 'not_found': 0,
+                      'injected_errors': 0, 'injected_429': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"", headers: Optional[Dict] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                server._count('requests')
+                if server.latency:
+                    time.sleep(server.latency * server._random.uniform(0.5, 1.5))
+
+                with server._lock:
+                    roll = server._random.random()
+                if roll < server.throttle_rate:
+                    server._count('injected_429')
+                    return self._send(429, headers={'Retry-After': str(server.retry_after)})
+                if roll < server.throttle_rate + server.error_rate:
+                    server._count('injected_errors')
+                    return self._send(503)
+
+                key = self.path[len("/api"):] if self.path.startswith("/api") else self.path
+                body = server.source.lookup(key)
+                if body is None:
+                    server._count('not_found')
+                    return self._send(404)
+
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    server._count('not_modified')
+                    return self._send(304, headers={'ETag': etag})
+                server._count('ok')
+                self._send(200, body, {'Content-Type': 'application/json', 'ETag': etag})
+
+        return Handler
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def run_benchmark(source, league_id: int, workers: int, **server_options) -> Dict:
+    """Run a full collection against a local ReplayServer and report throughput"""
+    import contextlib
+    import io
+    import tempfile
+
+    from fpl_data_collector import FPLDataCollector
+    from rate_limiter import AdaptiveRateLimiter
+
+    server = ReplayServer(source, **server_options)
+    base_url = server.start()
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            collector = FPLDataCollector(league_id, output_dir=output_dir, max_workers=workers,
+                                         rate_limiter=AdaptiveRateLimiter(max_rate=1000),
+                                         http_cache=False, base_url=base_url)
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                summary = collector.collect_all_data()
+            elapsed = time.perf_counter() - started
+    finally:
+        server.stop()
+
+    stats = dict(server.stats)
+    return {
+        'managers': summary['total_managers'],
+        'workers': workers,
+        'elapsed_s': round(elapsed, 2),
+        'requests': stats['requests'],
+        'requests_per_s': round(stats['requests'] / elapsed, 1),
+        'retries': stats['injected_errors'] + stats['injected_429'],
+        **stats,
+    }
+
+
+def collect_synthetic(managers: int, output_dir: str, league_id: int = 1, seed: int = 0,
+                      workers: int = 16) -> Dict:
+    """Fill output_dir with a full collection of a synthetic league (for benchmarks)"""
+    import contextlib
+    import io
+
+    from fpl_data_collector import FPLDataCollector
+    from rate_limiter import AdaptiveRateLimiter
+
+    server = ReplayServer(SyntheticLeague(managers=managers, league_id=league_id, seed=seed))
+    base_url = server.start()
+    try:
+        collector = FPLDataCollector(league_id, output_dir=output_dir, max_workers=workers,
+                                     rate_limiter=AdaptiveRateLimiter(rate=1000, burst=1000, max_rate=1000,
+                                                                  endpoint_budgets={}),
+                                     http_cache=False, base_url=base_url)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return collector.collect_all_data()
+    finally:
+        server.stop()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Offline FPL API stand-in")
+    parser.add_argument("command", choices=["serve", "bench"])
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument("--recording", help="Directory written by the collector's --record")
+    source_group.add_argument("--synthetic", type=int, metavar="MANAGERS",
+                              help="Generate a synthetic league with this many managers")
+    parser.add_argument("--league-id", type=int, default=1,
+                        help="League ID (synthetic leagues answer only this ID)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean seconds added per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--workers", type=int, default=10, help="Collector workers (bench)")
+    args = parser.parse_args()
+
+    if args.recording:
+        source = RecordingSource(args.recording)
+    else:
+        print(f"Generating synthetic league of {args.synthetic} managers...")
+        source = SyntheticLeague(args.synthetic, league_id=args.league_id, seed=args.seed)
+
+    server_options = {
+        'latency': args.latency, 'error_rate': args.error_rate,
+        'throttle_rate': args.throttle_rate, 'retry_after': args.retry_after, 'seed': args.seed,
+    }
+
+    if args.command == "bench":
+        result = run_benchmark(source, args.league_id, args.workers, **server_options)
+        print(json.dumps(result, indent=2))
+        return
+
+    server = ReplayServer(source, port=args.port, **server_options)
+    print(f"📡 Serving FPL API stand-in at {server.base_url} - Ctrl+C to stop")
+    print(f"   python src/fpl_data_collector.py {args.league_id} --base-url {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{json.dumps(server.stats, indent=2)}")
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
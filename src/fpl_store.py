@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+FPL Data Store
+The one data-access layer behind every analysis module:
+- snapshots are located through the collector's fpl_data/index.jsonl: the latest one by
+  reading the index from its end, or pinned to a gameweek / point in time
+  (a directory scan is only the fallback for data collected before the index existed)
+- an indexed file that --store / ingest --remove-old has since deleted is restored from
+  fpl_data/store.sqlite (once, into fpl_data/.cache/restored/), so gameweek / time
+  pinning keeps working on a deduplicated history
+- each snapshot file is parsed at most once per process (keyed by path + mtime + size)
+- pre-indexed views: players by id, teams by id, the columnar player table
+  (player_table.PlayerTable), the live index (live_index.LiveIndex) and the league's
+  ownership matrix (ownership.OwnershipMatrix)
+- expected-points projections (projections.Projections), built once per bootstrap +
+  fixtures snapshot, horizon and model
+- what a parse built is pickled to the warm cache (fpl_data/.cache/), so the next
+  script/process starts without decoding the snapshot at all - keyed by the sha256
+  index.jsonl recorded for the file plus its mtime/size, so an indexed snapshot is
+  never re-hashed (only unindexed files are)
+- iter_managers() / iter_live_elements() stream one record at a time, projected to the
+  fields a caller needs, without materializing the whole snapshot
+
+Loaded data and views are shared between modules - treat them as read-only.
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from live_index import LiveIndex
+from ownership import OwnershipMatrix
+from player_table import PlayerTable
+from projections import ProjectionModel, Projections, next_gameweek
+from snapshot_index import SnapshotIndex
+from snapshot_io import (SUFFIX, iter_list, iter_top_level, latest_snapshot, load_snapshot, project,
+                         resolve_snapshot, write_snapshot)
+from snapshot_store import STORE_FILE, SnapshotStore, split_snapshot_name
+from warm_cache import CACHE_DIR, WarmCache, file_sha256
+
+# kind -> file pattern (without extension) the collector writes it under
+KINDS = {
+    'bootstrap': 'bootstrap_data_*',
+    'fixtures': 'fixtures_*',
+    'managers': 'managers_detailed_*',
+    'live': 'live_gw*',
+    'league': 'league_*',
+}
+
+Signature = Tuple[str, int, int]
+
+# Pre-indexed views built alongside each parse: kind -> {view name: builder}
+VIEWS: Dict[str, Dict[str, Callable[[Dict], Dict]]] = {
+    'bootstrap': {
+        'players_by_id': lambda data: {p['id']: p for p in data['elements']},
+        'teams_by_id': lambda data: {t['id']: t for t in data['teams']},
+        'player_table': PlayerTable.from_bootstrap,
+    },
+    'live': {
+        'live_index': LiveIndex.from_live,
+    },
+    'managers': {
+        'ownership': OwnershipMatrix.from_managers,
+    },
+}
+
+_lock = threading.Lock()
+_parsed: Dict[str, Tuple[Signature, Dict]] = {}
+_projections: Dict[Tuple, Projections] = {}
+
+
+class FPLDataStore:
+    """Snapshots of a data directory - the latest ones, or as of a gameweek / time"""
+
+    def __init__(self, data_dir: str = "fpl_data", as_of_gw: Optional[int] = None,
+                 as_of_time: Optional[Union[str, datetime]] = None, warm_cache: bool = True):
+        self.data_dir = Path(data_dir)
+        self.index = SnapshotIndex(data_dir)
+        self.warm_cache = WarmCache(data_dir) if warm_cache else None
+        self.as_of_gw = as_of_gw
+        self.as_of_time = as_of_time
+        # path -> sha256 the index recorded for it (files resolved through the index)
+        self._indexed_digests: Dict[str, str] = {}
+
+    def path(self, kind: str) -> Optional[Path]:
+        """Snapshot file of a kind ('bootstrap', 'fixtures', 'managers', 'live', 'league')"""
+        if self.as_of_gw is not None:
+            entry = self.index.as_of_gw(kind, self.as_of_gw)
+        elif self.as_of_time is not None:
+            entry = self.index.as_of_time(kind, self.as_of_time)
+        else:
+            entry = self.index.latest(kind)
+        if entry:
+            # The indexed file may since have been converted to the other format
+            indexed = self.index.resolve(entry, kind)
+            path = resolve_snapshot(indexed) or self._restore(indexed)
+            if path:
+                recorded = entry['files'][kind]
+                if path == indexed and 'sha256' in recorded and path.stat().st_size == recorded.get('size'):
+                    self._indexed_digests[str(path.resolve())] = recorded['sha256']
+                return path
+        if self.as_of_gw is not None or self.as_of_time is not None:
+            return None
+        return latest_snapshot(self.data_dir, KINDS[kind])
+
+    def _restore(self, indexed: Path) -> Optional[Path]:
+        """An indexed snapshot whose flat file was deleted after going into the
+        deduplicated store, written back out of store.sqlite (None if it is not there)"""
+        parts = split_snapshot_name(indexed)
+        store_file = self.data_dir / STORE_FILE
+        if not parts or not store_file.exists():
+            return None
+        path = self.data_dir / CACHE_DIR / "restored" / f"{indexed.stem}{SUFFIX}"
+        # Restored again only if the store changed since (a same-day run replaces its manifest)
+        if path.exists() and path.stat().st_mtime_ns >= store_file.stat().st_mtime_ns:
+            return path
+        name, date = parts
+        try:
+            data = SnapshotStore(str(self.data_dir)).get(date, name)
+        except FileNotFoundError:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_snapshot(path, data)
+        return path
+
+    def signature(self, kind: str) -> Optional[Signature]:
+        """Identifies the current content of a kind - changes whenever its file does"""
+        path = self.path(kind)
+        if path is None:
+            return None
+        stat = path.stat()
+        return str(path.resolve()), stat.st_mtime_ns, stat.st_size
+
+    def _entry(self, kind: str, signature: Signature) -> Dict:
+        """{'data': parsed snapshot, 'views': {name: view}} - from memory, the warm cache or a parse"""
+        path = signature[0]
+        with _lock:
+            cached = _parsed.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        entry = None
+        if self.warm_cache:
+            digest = self._cache_digest(signature)
+            entry = self.warm_cache.get(Path(path), digest)
+            # A cache written before a view was added is rebuilt
+            if entry is not None and set(entry['views']) != set(VIEWS.get(kind, {})):
+                entry = None
+        if entry is None:
+            data = load_snapshot(Path(path))
+            entry = {
+                'data': data,
+                'views': {name: build(data) for name, build in VIEWS.get(kind, {}).items()},
+            }
+            if self.warm_cache:
+                self.warm_cache.put(Path(path), digest, entry)
+        with _lock:
+            _parsed[path] = (signature, entry)
+        return entry
+
+    def _cache_digest(self, signature: Signature) -> str:
+        """Warm cache key of a snapshot: the indexed sha256 + mtime/size (a file rewritten
+        since indexing gets a new key), or the file's own sha256 when it is not indexed"""
+        path, mtime_ns, size = signature
+        indexed = self._indexed_digests.get(path)
+        if indexed:
+            return f"{indexed}.{mtime_ns}.{size}"
+        return file_sha256(Path(path))
+
+    def load(self, kind: str) -> Optional[Dict]:
+        """Parsed latest snapshot of a kind, or None if there is none"""
+        signature = self.signature(kind)
+        if signature is None:
+            return None
+        return self._entry(kind, signature)['data']
+
+    def bootstrap(self) -> Dict:
+        data = self.load('bootstrap')
+        if data is None:
+            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
+        return data
+
+    def managers(self) -> Dict:
+        data = self.load('managers')
+        if data is None:
+            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
+        return data
+
+    def live(self) -> Dict:
+        return self.load('live') or {}
+
+    def league(self) -> Dict:
+        return self.load('league') or {}
+
+    def fixtures(self) -> List[Dict]:
+        return (self.load('fixtures') or {}).get('fixtures', [])
+
+    def _view(self, kind: str, name: str, missing: Callable[[], Dict]) -> Dict:
+        """A pre-indexed view of a kind; `missing` handles a kind with no snapshot"""
+        signature = self.signature(kind)
+        if signature is None:
+            return missing()
+        return self._entry(kind, signature)['views'][name]
+
+    def players_by_id(self) -> Dict[int, Dict]:
+        return self._view('bootstrap', 'players_by_id', self.bootstrap)
+
+    def teams_by_id(self) -> Dict[int, Dict]:
+        return self._view('bootstrap', 'teams_by_id', self.bootstrap)
+
+    def player_table(self) -> PlayerTable:
+        return self._view('bootstrap', 'player_table', self.bootstrap)
+
+    def ownership(self) -> OwnershipMatrix:
+        return self._view('managers', 'ownership', self.managers)
+
+    def live_index(self) -> LiveIndex:
+        return self._view('live', 'live_index', lambda: LiveIndex.from_live(None))
+
+    def projections(self, horizon: int = 5, model: Optional[ProjectionModel] = None,
+                    start_gw: Optional[int] = None) -> Projections:
+        """xP of every player for `horizon` gameweeks from start_gw (default: the next one)"""
+        bootstrap_signature = self.signature('bootstrap')
+        if bootstrap_signature is None:
+            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
+        fixtures_signature = self.signature('fixtures')
+        if fixtures_signature is None:
+            raise FileNotFoundError("לא נמצאו קבצי fixtures - הרץ את fpl_data_collector.py")
+        if start_gw is None:
+            start_gw = next_gameweek(self.bootstrap())
+        model = model or ProjectionModel()
+        key = (bootstrap_signature, fixtures_signature, start_gw, horizon, model)
+        with _lock:
+            cached = _projections.get(key)
+        if cached is None:
+            cached = Projections(self.player_table(), self.fixtures(), start_gw, horizon, model)
+            with _lock:
+                _projections[key] = cached
+        return cached
+
+    def _parsed_data(self, signature: Signature) -> Optional[Dict]:
+        """Data already parsed in this process - streaming never triggers a parse"""
+        with _lock:
+            cached = _parsed.get(signature[0])
+        if cached and cached[0] == signature:
+            return cached[1]['data']
+        return None
+
+    def iter_managers(self, fields: Optional[List[str]] = None) -> Iterator[Tuple[str, Any]]:
+        """(manager id, data) one manager at a time; `fields` (dotted paths such as
+        'history.current.-1') projects each manager to {field: value}"""
+        signature = self.signature('managers')
+        if signature is None:
+            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
+        data = self._parsed_data(signature)
+        managers = data.items() if data is not None else iter_top_level(Path(signature[0]))
+        for manager_id, manager in managers:
+            yield manager_id, project(manager, fields) if fields else manager
+
+    def iter_live_elements(self, fields: Optional[List[str]] = None) -> Iterator[Any]:
+        """Live elements one at a time (nothing without a live snapshot); `fields` projects them"""
+        signature = self.signature('live')
+        if signature is None:
+            return
+        data = self._parsed_data(signature)
+        elements = data.get('elements', []) if data is not None else iter_list(Path(signature[0]), 'elements')
+        for element in elements:
+            yield project(element, fields) if fields else element
@@ -19,6 +19,8 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from collections import defaultdict
 
+from fpl_store import FPLDataStore
+
 # אופציונלי - ייובאו רק אם קיימים
 try:
     from anthropic import Anthropic
@@ -59,6 +61,7 @@ class ManagerAnalysis:
     form_trend: str  # "עולה", "יורד", "יציב"
     weakest_players: List[Dict]
     transfer_suggestions: List[Dict]
+    manager_id: str = ""
 
 
 class FPLWeeklySummary:
@@ -74,24 +77,21 @@ class FPLWeeklySummary:
         
         # טעינת נתונים
         print("📥 טוען נתונים...")
-        self.managers_data = self._load_latest_file("managers_detailed_*.json")
-        self.bootstrap_data = self._load_latest_file("bootstrap_data_*.json")
-        self.live_data = self._load_latest_file("live_gw*.json")
-        self.league_data = self._load_latest_file("league_*.json")
+        self.store = FPLDataStore(data_dir)
+        self.managers_data = self.store.load('managers') or {}
+        self.bootstrap_data = self.store.load('bootstrap') or {}
+        self.live = self.store.live_index()
+        self.league_data = self.store.league()
         
         if not self.managers_data or not self.bootstrap_data:
             raise FileNotFoundError("❌ לא נמצאו קבצי נתונים. הרץ קודם: python src/fpl_data_collector.py <LEAGUE_ID>")
         
         # מפות עזר
-        self.players_map = {p['id']: p for p in self.bootstrap_data.get('elements', [])}
-        self.teams_map = {t['id']: t for t in self.bootstrap_data.get('teams', [])}
+        self.players_map = self.store.players_by_id()
+        self.teams_map = self.store.teams_by_id()
+        self.players = self.store.player_table()
         self.positions_map = {1: 'שוער', 2: 'מגן', 3: 'קשר', 4: 'חלוץ'}
         
-        # נקודות במחזור הנוכחי
-        self.gw_points_map = {}
-        if self.live_data and 'elements' in self.live_data:
-            for elem in self.live_data['elements']:
-                self.gw_points_map[elem['id']] = elem.get('stats', {}).get('total_points', 0)
         
         # ממוצעים עולמיים
         self.gw_averages = {}
@@ -141,15 +141,6 @@ class FPLWeeklySummary:
         
         return config
     
-    def _load_latest_file(self, pattern: str) -> dict:
-        """טעינת הקובץ האחרון שתואם לתבנית"""
-        files = list(self.data_dir.glob(pattern))
-        if not files:
-            return {}
-        latest = max(files, key=lambda p: p.stat().st_mtime)
-        with open(latest, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
     def _get_current_gw(self) -> int:
         """מציאת המחזור הנוכחי"""
         for event in self.bootstrap_data.get('events', []):
@@ -173,14 +164,14 @@ class FPLWeeklySummary:
             'team_full': team.get('name', 'לא ידוע'),
             'position': self.positions_map.get(player.get('element_type', 0), 'לא ידוע'),
             'price': player.get('now_cost', 0) / 10,
-            'form': float(player.get('form', 0)),
-            'points_per_game': float(player.get('points_per_game', 0)),
+            'form': self.players.get(player_id, 'form', 0.0),
+            'points_per_game': self.players.get(player_id, 'points_per_game', 0.0),
             'total_points': player.get('total_points', 0),
             'goals': player.get('goals_scored', 0),
             'assists': player.get('assists', 0),
             'clean_sheets': player.get('clean_sheets', 0),
-            'selected_by_percent': float(player.get('selected_by_percent', 0)),
-            'gw_points': self.gw_points_map.get(player_id, 0),
+            'selected_by_percent': self.players.get(player_id, 'selected_by_percent', 0.0),
+            'gw_points': self.live.points(player_id),
             'status': player.get('status', 'a'),
             'news': player.get('news', ''),
         }
@@ -305,6 +296,7 @@ class FPLWeeklySummary:
             form_trend=form_trend,
             weakest_players=weakest_players,
             transfer_suggestions=transfer_suggestions,
+            manager_id=manager_id,
         )
     
     def _generate_transfer_suggestions(self, current_team: List[Dict], bank: float) -> List[Dict]:
@@ -321,32 +313,20 @@ class FPLWeeklySummary:
             budget = bank + weak['price']
             position_type = {'שוער': 1, 'מגן': 2, 'קשר': 3, 'חלוץ': 4}.get(weak['position'], 0)
             
-            # מצא תחליפים טובים
-            candidates = []
-            for player in self.bootstrap_data.get('elements', []):
-                if player['element_type'] != position_type:
-                    continue
-                if player['id'] in current_ids:
-                    continue
-                if player['now_cost'] / 10 > budget:
-                    continue
-                if player.get('status', 'a') != 'a':
-                    continue
-                
-                form = float(player.get('form', 0))
-                if form < 5:
-                    continue
-                
-                candidates.append({
+            # מצא תחליפים טובים - זמינים, בתקציב, בפורמה 5+; הטוב ביותר בפורמה
+            form = self.players['form']
+            index = self.players.replacement_index(
+                'available_form', form, eligible=(self.players['status'] == 'a') & (form >= 5))
+            top = index.best(position_type, budget, current_ids, k=1)
+            
+            if len(top):
+                player = self.players_map[self.players.ids(top)[0]]
+                best = {
                     'name': player['web_name'],
                     'team': self.teams_map.get(player['team'], {}).get('short_name', '???'),
                     'price': player['now_cost'] / 10,
-                    'form': form,
-                    'selected_by': float(player.get('selected_by_percent', 0)),
-                })
-            
-            if candidates:
-                best = sorted(candidates, key=lambda x: x['form'], reverse=True)[0]
+                    'form': form[top[0]].item(),
+                }
                 suggestions.append({
                     'out': weak['name'],
                     'out_form': weak['form'],
@@ -360,22 +340,20 @@ class FPLWeeklySummary:
     
     def _find_differentials(self, all_managers: List[ManagerAnalysis]) -> List[Dict]:
         """מציאת דיפרנשיאלים שהצליחו"""
-        player_owners = defaultdict(list)
-        
-        for m in all_managers:
-            for p in m.starting_xi:
-                player_owners[p['name']].append({
-                    'owner': m.name,
-                    'points': p['gw_points']
-                })
+        # שחקנים שרק מאמן אחד מחזיק בהרכב - לפי ID, ממטריצת הבעלות
+        ownership = self.store.ownership()
+        rows = ownership.rows_of(m.manager_id for m in all_managers)
+        player_ids, owner_rows = ownership.sole_owners(rows)
+        points = self.live.by_id('total_points', ownership.size)[player_ids]
+        owner_of_row = {row: m for row, m in zip(rows.tolist(), all_managers)}
         
         differentials = []
-        for player, owners in player_owners.items():
-            if len(owners) == 1 and owners[0]['points'] >= 6:
+        for player_id, owner_row, pts in zip(player_ids.tolist(), owner_rows.tolist(), points.tolist()):
+            if pts >= 6:
                 differentials.append({
-                    'player': player,
-                    'points': owners[0]['points'],
-                    'owner': owners[0]['owner']
+                    'player': self.players_map.get(player_id, {}).get('web_name', 'לא ידוע'),
+                    'points': pts,
+                    'owner': owner_of_row[owner_row].name
                 })
         
         return sorted(differentials, key=lambda x: x['points'], reverse=True)
@@ -404,15 +382,15 @@ class FPLWeeklySummary:
     
     def _get_top_gw_players(self, limit: int = 10) -> List[Dict]:
         """השחקנים הטובים ביותר במחזור"""
+        points = self.live.column('total_points')
         players_with_points = []
         
-        for player_id, points in self.gw_points_map.items():
-            if points >= 5:
-                player = self._get_player_info(player_id)
-                player['gw_points'] = points
-                players_with_points.append(player)
+        for player_id, gw_points in self.live.top_n('total_points', limit, where=points >= 5):
+            player = self._get_player_info(player_id)
+            player['gw_points'] = gw_points
+            players_with_points.append(player)
         
-        return sorted(players_with_points, key=lambda x: x['gw_points'], reverse=True)[:limit]
+        return players_with_points
     
     def _generate_ai_predictions(self, all_managers: List[ManagerAnalysis]) -> str:
         """יצירת תחזיות עם Claude AI"""
@@ -487,11 +465,10 @@ class FPLWeeklySummary:
             lines.append(dgw_hint)
         
         # שחקן לשים עליו עין
-        top_form_players = sorted(
-            self.bootstrap_data.get('elements', []),
-            key=lambda x: float(x.get('form', 0)),
-            reverse=True
-        )[:5]
+        top_form_players = [
+            self.players_map[player_id]
+            for player_id in self.players.ids(self.players.top_k(self.players['form'], 5))
+        ]
         
         if top_form_players:
             hot_player = top_form_players[0]
@@ -7,9 +7,12 @@ FPL Advanced Analytics - ENHANCED VERSION
 import json
 from pathlib import Path
 from typing import Dict, List
-from collections import defaultdict, Counter
 from datetime import datetime
 
+import numpy as np
+
+from fpl_store import FPLDataStore
+
 
 class FPLAdvancedAnalytics:
     def __init__(self, data_dir: str = "fpl_data"):
@@ -17,37 +20,15 @@ class FPLAdvancedAnalytics:
         self.output_dir = self.data_dir / "reports"
         self.output_dir.mkdir(exist_ok=True)
         
-        self.managers_data = self.load_latest_managers_data()
-        self.bootstrap_data = self.load_latest_bootstrap_data()
-        self.live_data = self.load_latest_live_data()
+        self.store = FPLDataStore(data_dir)
+        self.managers_data = self.store.managers()
+        self.bootstrap_data = self.store.bootstrap()
+        self.live = self.store.live_index()
+        self.ownership = self.store.ownership()
         
         # מפות עזר
-        self.players_map = {p['id']: p for p in self.bootstrap_data['elements']}
-        self.teams_map = {t['id']: t for t in self.bootstrap_data['teams']}
-    
-    def load_latest_managers_data(self) -> Dict:
-        manager_files = list(self.data_dir.glob("managers_detailed_*.json"))
-        if not manager_files:
-            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
-        latest_file = max(manager_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def load_latest_bootstrap_data(self) -> Dict:
-        bootstrap_files = list(self.data_dir.glob("bootstrap_data_*.json"))
-        if not bootstrap_files:
-            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
-        latest_file = max(bootstrap_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def load_latest_live_data(self) -> Dict:
-        live_files = list(self.data_dir.glob("live_gw*.json"))
-        if not live_files:
-            return {}
-        latest_file = max(live_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        self.players_map = self.store.players_by_id()
+        self.teams_map = self.store.teams_by_id()
     
     def get_current_gameweek(self) -> int:
         for event in self.bootstrap_data['events']:
@@ -57,28 +38,26 @@ class FPLAdvancedAnalytics:
     
     def find_differentials(self, max_ownership: int = 2) -> List[Dict]:
         """מצא שחקנים שמעט מאוד אנשים מחזיקים"""
-        ownership = defaultdict(int)
-        
-        for manager_id, data in self.managers_data.items():
-            for pick in data['current_picks']['picks']:
-                ownership[pick['element']] += 1
+        # ספירת בעלות לכל השחקנים במכה אחת, לפי ID
+        counts = self.ownership.counts()
+        differential_ids = np.flatnonzero((counts > 0) & (counts <= max_ownership))
+        differential_ids = differential_ids[np.argsort(self.ownership.first_pick()[differential_ids], kind='stable')]
         
         differentials = []
-        for player_id, count in ownership.items():
-            if count <= max_ownership:
-                player = self.players_map.get(player_id)
-                if player:
-                    differentials.append({
-                        'name': player['web_name'],
-                        'full_name': f"{player['first_name']} {player['second_name']}",
-                        'team': self.teams_map[player['team']]['name'],
-                        'position': ['GKP', 'DEF', 'MID', 'FWD'][player['element_type'] - 1],
-                        'owned_by': count,
-                        'total_points': player['total_points'],
-                        'form': float(player['form']),
-                        'price': player['now_cost'] / 10,
-                        'points_per_game': float(player['points_per_game']) if player['points_per_game'] else 0
-                    })
+        for player_id, count in zip(differential_ids.tolist(), counts[differential_ids].tolist()):
+            player = self.players_map.get(player_id)
+            if player:
+                differentials.append({
+                    'name': player['web_name'],
+                    'full_name': f"{player['first_name']} {player['second_name']}",
+                    'team': self.teams_map[player['team']]['name'],
+                    'position': ['GKP', 'DEF', 'MID', 'FWD'][player['element_type'] - 1],
+                    'owned_by': count,
+                    'total_points': player['total_points'],
+                    'form': float(player['form']),
+                    'price': player['now_cost'] / 10,
+                    'points_per_game': float(player['points_per_game']) if player['points_per_game'] else 0
+                })
         
         differentials.sort(key=lambda x: (x['total_points'], x['form']), reverse=True)
         return differentials
@@ -115,19 +94,14 @@ class FPLAdvancedAnalytics:
     
     def find_template_team(self) -> Dict:
         """מצא את ה-template"""
-        ownership = Counter()
-        captain_count = Counter()
-        
-        for manager_id, data in self.managers_data.items():
-            for pick in data['current_picks']['picks']:
-                ownership[pick['element']] += 1
-                if pick['is_captain']:
-                    captain_count[pick['element']] += 1
+        ownership = self.ownership.counts()
+        captain_count = self.ownership.captain_counts()
         
         total_managers = len(self.managers_data)
         
         template_players = []
-        for player_id, count in ownership.most_common(20):
+        for player_id in self.ownership.by_ownership(ownership, 20).tolist():
+            count = ownership[player_id].item()
             ownership_pct = (count / total_managers) * 100
             player = self.players_map.get(player_id)
             if player and ownership_pct >= 30:
@@ -136,7 +110,7 @@ class FPLAdvancedAnalytics:
                     'position': ['GKP', 'DEF', 'MID', 'FWD'][player['element_type'] - 1],
                     'owned_by': count,
                     'ownership_pct': round(ownership_pct, 1),
-                    'captained_by': captain_count.get(player_id, 0),
+                    'captained_by': captain_count[player_id].item(),
                     'price': player['now_cost'] / 10
                 })
         
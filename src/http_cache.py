@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+FPL HTTP Response Cache
+Transport adapter for requests.Session that keeps GET responses in SQLite:
+- per-endpoint TTL policies (fresh entries are served without touching the network)
+- stale entries are revalidated with If-None-Match / If-Modified-Since (304 = a few bytes)
+- force_refresh ignores the cache and always downloads
+- a request sent with "Cache-Control: no-cache" skips the TTL and is always revalidated
+- a request sent with "Cache-Control: no-store" bypasses the cache entirely (the picks
+  backfill keeps its own permanent cache)
+- entries are evicted once RETAIN_STALE past the longest TTL - long enough to revalidate
+  the next run's requests, short enough that per-manager / per-gameweek URLs don't
+  pile up for a whole season
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# (url pattern, seconds an entry is served without revalidation); first match wins.
+# TTL 0 always revalidates, None never caches.
+DEFAULT_TTL_POLICIES: List[Tuple[str, Optional[int]]] = [
+    (r"/bootstrap-static/", 3600),
+    (r"/fixtures/", 3600),
+    (r"/event/\d+/live/", 30),
+    (r"/leagues-classic/\d+/standings/", 300),
+    (r"/entry/\d+/history/", 300),
+    (r"/entry/\d+/event/\d+/picks/", 300),
+    (r".*", 0),
+]
+# How long an expired entry is kept for If-None-Match / If-Modified-Since revalidation
+RETAIN_STALE = 24 * 3600
+
+
+class ResponseStore:
+    """SQLite table of cached responses keyed by full URL"""
+
+    def __init__(self, path: Path):
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " url TEXT PRIMARY KEY, headers TEXT NOT NULL, body BLOB NOT NULL,"
+                " etag TEXT, last_modified TEXT, stored_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+
+    def get(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT headers, body, etag, last_modified, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if not row:
+            return None
+        headers, body, etag, last_modified, stored_at = row
+        return {
+            'headers': json.loads(headers), 'body': body, 'etag': etag,
+            'last_modified': last_modified, 'stored_at': stored_at
+        }
+
+    def put(self, url: str, headers: dict, body: bytes):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(headers), body, headers.get('ETag'),
+                 headers.get('Last-Modified'), time.time())
+            )
+
+    def evict(self, before: float) -> int:
+        """Drop entries stored (or last revalidated) before `before`"""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (before,)).rowcount
+
+    def touch(self, url: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+
+
+class CachingHTTPAdapter(HTTPAdapter):
+    def __init__(self, cache_path: Path, ttl_policies: Optional[List[Tuple[str, Optional[int]]]] = None,
+                 force_refresh: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.store = ResponseStore(cache_path)
+        self.ttl_policies = [
+            (re.compile(pattern), ttl) for pattern, ttl in (ttl_policies or DEFAULT_TTL_POLICIES)
+        ]
+        self.force_refresh = force_refresh
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        # send() runs on the collector's worker threads
+        self._stats_lock = threading.Lock()
+        ttls = [ttl for _, ttl in self.ttl_policies if ttl]
+        self.retention = max(ttls, default=0) + RETAIN_STALE
+        self.store.evict(time.time() - self.retention)
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            setattr(self, stat, getattr(self, stat) + 1)
+
+    def ttl_for(self, url: str) -> Optional[int]:
+        for pattern, ttl in self.ttl_policies:
+            if pattern.search(url):
+                return ttl
+        return None
+
+    def is_fresh(self, url: str) -> bool:
+        """Would a GET for this URL be answered from the cache without a request?"""
+        ttl = self.ttl_for(url)
+        if self.force_refresh or not ttl:
+            return False
+        entry = self.store.get(url)
+        return bool(entry) and time.time() - entry['stored_at'] < ttl
+
+    def _cached_response(self, request, entry: dict, revalidated: bool = False) -> Response:
+        """The cached body as a 200; `revalidated` marks one a 304 from the server confirmed"""
+        response = Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = entry['body']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        response.revalidated = revalidated
+        return response
+
+    def send(self, request, **kwargs):
+        ttl = self.ttl_for(request.url)
+        if (request.method != 'GET' or ttl is None
+                or 'no-store' in request.headers.get('Cache-Control', '')):
+            return super().send(request, **kwargs)
+
+        entry = None if self.force_refresh else self.store.get(request.url)
+        no_cache = 'no-cache' in request.headers.get('Cache-Control', '')
+        if entry and not no_cache and time.time() - entry['stored_at'] < ttl:
+            self._count('hits')
+            return self._cached_response(request, entry)
+
+        if entry:
+            if entry['etag']:
+                request.headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                request.headers['If-Modified-Since'] = entry['last_modified']
+
+        response = super().send(request, **kwargs)
+        if response.status_code == 304 and entry:
+            response.close()
+            self._count('revalidated')
+            self.store.touch(request.url)
+            return self._cached_response(request, entry, revalidated=True)
+
+        self._count('misses')
+        if response.status_code == 200:
+            self.store.put(request.url, dict(response.headers), response.content)
+            self.store.evict(time.time() - self.retention)
+        return response
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+FPL Live Index
+A gameweek's live data (event/{gw}/live/) as column arrays: one numpy array per live
+stat, in element order, plus a dense player id -> offset table. Built once per live
+snapshot by FPLDataStore and shared by every report:
+- points / stat of a player: O(1) instead of scanning ~700 elements
+- top N by any stat: a partial partition of the column, not a full sort
+
+Ties keep the live file's element order, like sorted(..., reverse=True) over the
+elements does.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def top_indices(values: np.ndarray, n: int, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+    """Positions of the N highest values (among `candidates`), highest first, ties in
+    position order - the same rows sorted(..., reverse=True)[:n] would return"""
+    if candidates is None:
+        candidates = np.arange(len(values))
+    if n <= 0 or len(candidates) == 0:
+        return candidates[:0]
+    if n < len(candidates):
+        subset = values[candidates]
+        threshold = np.partition(subset, len(subset) - n)[len(subset) - n]
+        above = candidates[subset > threshold]
+        # Ties at the threshold are taken in position order
+        tied = candidates[subset == threshold][:n - len(above)]
+        candidates = np.concatenate([above, tied])
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+class LiveIndex:
+    def __init__(self, ids: np.ndarray, stats: Dict[str, np.ndarray]):
+        self.ids = ids
+        self.stats = stats
+        size = int(ids.max()) + 1 if len(ids) else 0
+        self.offsets = np.full(size, -1, dtype=np.int32)
+        self.offsets[ids] = np.arange(len(ids), dtype=np.int32)
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[Dict]) -> "LiveIndex":
+        """Index live elements ({'id', 'stats': {...}}); missing stats count as 0"""
+        elements = list(elements)
+        ids = np.fromiter((e['id'] for e in elements), dtype=np.int32, count=len(elements))
+        names = []
+        for element in elements:
+            for name in element.get('stats', {}):
+                if name not in names:
+                    names.append(name)
+
+        stats = {}
+        for name in names:
+            values = [e.get('stats', {}).get(name, 0) for e in elements]
+            if all(isinstance(v, (int, bool)) for v in values):
+                stats[name] = np.array(values, dtype=np.int64)
+            else:
+                # expected_goals & co. come as decimal strings
+                try:
+                    stats[name] = np.array([float(v or 0) for v in values], dtype=np.float64)
+                except (TypeError, ValueError):
+                    continue
+        return cls(ids, stats)
+
+    @classmethod
+    def from_live(cls, live_data: Optional[Dict]) -> "LiveIndex":
+        return cls.from_elements((live_data or {}).get('elements', []))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def offset(self, player_id: int) -> int:
+        """Position of a player in the arrays, -1 if not in the live data"""
+        if 0 <= player_id < len(self.offsets):
+            return int(self.offsets[player_id])
+        return -1
+
+    def __contains__(self, player_id: int) -> bool:
+        return self.offset(player_id) >= 0
+
+    def stat(self, player_id: int, name: str, default=0):
+        offset = self.offset(player_id)
+        column = self.stats.get(name)
+        if offset < 0 or column is None:
+            return default
+        return column[offset].item()
+
+    def points(self, player_id: int) -> int:
+        return self.stat(player_id, 'total_points')
+
+    def column(self, name: str) -> np.ndarray:
+        """All players' values of a stat, in element order (zeros if the stat is unknown)"""
+        column = self.stats.get(name)
+        return column if column is not None else np.zeros(len(self.ids), dtype=np.int64)
+
+    def by_id(self, name: str = 'total_points', size: int = 0) -> np.ndarray:
+        """A stat as a dense array indexed by player id, at least `size` long
+        (0 for players not in the live data)"""
+        column = self.column(name)
+        values = np.zeros(max(size, len(self.offsets)), dtype=column.dtype)
+        values[self.ids] = column
+        return values
+
+    def mask(self, player_ids: Iterable[int]) -> np.ndarray:
+        """Boolean element mask of the given players"""
+        return np.isin(self.ids, np.fromiter(player_ids, dtype=np.int64))
+
+    def top_n(self, name: str, n: int, where: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """[(player id, value)] of the N highest values of a stat, highest first.
+        `where` is an optional boolean mask restricting which elements count"""
+        values = self.column(name)
+        candidates = None if where is None else np.flatnonzero(where)
+        return [(int(self.ids[i]), values[i].item()) for i in top_indices(values, n, candidates)]
+
+    def items(self, name: str = 'total_points'):
+        """(player id, value) pairs of a stat, in element order"""
+        return zip(self.ids.tolist(), self.column(name).tolist())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+FPL Live Gameweek Deltas
+Diffing of /event/{gw}/live/ polls and the append-only delta log behind
+FPLDataCollector.poll_live:
+
+- live_gw<N>_<date>.fpls|.json   full checkpoint, in the collector's snapshot format
+- live_gw<N>_<date>.deltas.jsonl  one line per poll with only the changed elements,
+                                  plus a marker line every time a checkpoint is written
+
+replay_live() rebuilds the latest live data from the last checkpoint + later deltas.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Tuple
+
+from snapshot_io import SUFFIX, load_snapshot, resolve_snapshot, write_snapshot
+
+
+def index_elements(live_data: Dict) -> Dict[int, Dict]:
+    return {element['id']: element for element in live_data.get('elements', [])}
+
+
+def diff_live_elements(previous: Dict[int, Dict], current: Dict[int, Dict]) -> Tuple[Dict, Dict]:
+    """Changed stats per element.
+
+    Returns (changes, deltas): changes holds the new value of every changed stat (and the
+    new `explain` breakdown when it changed); deltas holds new - old for numeric stats.
+    """
+    changes = {}
+    deltas = {}
+    for element_id, element in current.items():
+        old_element = previous.get(element_id, {})
+        old_stats = old_element.get('stats', {})
+        new_stats = element.get('stats', {})
+
+        changed_stats = {
+            stat: value for stat, value in new_stats.items() if old_stats.get(stat) != value
+        }
+        change = {}
+        if changed_stats:
+            change['stats'] = changed_stats
+        if element.get('explain') != old_element.get('explain'):
+            change['explain'] = element.get('explain')
+        if not change:
+            continue
+
+        changes[element_id] = change
+        numeric_deltas = {
+            stat: value - old_stats.get(stat, 0)
+            for stat, value in changed_stats.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+            and isinstance(old_stats.get(stat, 0), (int, float))
+        }
+        if numeric_deltas:
+            deltas[element_id] = numeric_deltas
+    return changes, deltas
+
+
+def apply_changes(elements: Dict[int, Dict], changes: Dict):
+    for element_id, change in changes.items():
+        element = elements.setdefault(int(element_id), {'id': int(element_id), 'stats': {}})
+        element.setdefault('stats', {}).update(change.get('stats', {}))
+        if 'explain' in change:
+            element['explain'] = change['explain']
+
+
+class LiveDeltaLog:
+    def __init__(self, checkpoint_file: Path):
+        self.checkpoint_file = checkpoint_file
+        self.path = checkpoint_file.with_suffix('.deltas.jsonl')
+
+    def _append(self, record: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def append(self, seq: int, gameweek: int, changes: Dict):
+        self._append({
+            'seq': seq,
+            'gameweek': gameweek,
+            'timestamp': datetime.now().isoformat(),
+            'changes': changes,
+        })
+
+    def checkpoint(self, seq: int, live_data: Dict):
+        """Write the full live data and mark the log position it covers"""
+        if self.checkpoint_file.suffix == SUFFIX:
+            write_snapshot(self.checkpoint_file, live_data)
+        else:
+            tmp_file = self.checkpoint_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(live_data, f, indent=2, ensure_ascii=False)
+            tmp_file.replace(self.checkpoint_file)
+        self._append({'seq': seq, 'checkpoint': self.checkpoint_file.name,
+                      'timestamp': datetime.now().isoformat()})
+
+
+def replay_live(delta_log: Path) -> Dict:
+    """Latest live data: the last checkpoint with every later delta applied"""
+    with open(delta_log, 'r', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    last_checkpoint = max(
+        (i for i, record in enumerate(records) if 'checkpoint' in record), default=None
+    )
+    if last_checkpoint is None:
+        raise FileNotFoundError(f"No checkpoint recorded in {delta_log}")
+
+    # The checkpoint may since have been converted to the other format
+    checkpoint_file = resolve_snapshot(delta_log.parent / records[last_checkpoint]['checkpoint'])
+    if checkpoint_file is None:
+        raise FileNotFoundError(f"Checkpoint {records[last_checkpoint]['checkpoint']} is missing")
+    live_data = load_snapshot(checkpoint_file)
+
+    elements = index_elements(live_data)
+    for record in records[last_checkpoint + 1:]:
+        apply_changes(elements, record.get('changes', {}))
+    live_data['elements'] = list(elements.values())
+    return live_data
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+FPL Ownership Matrix
+Every manager's current picks as one sparse managers × element-id matrix in CSR form:
+row pointers per manager, then per pick the element id, multiplier (0 bench - 1 with
+bench boost, 1, 2 captain, 3 triple captain), squad position and captain flag, plus
+each manager's active chip. Built once per managers
+snapshot by FPLDataStore; ownership counts, captaincy, template and differentials are
+bincounts / masks over the pick arrays, keyed by element id - two players sharing a
+web_name stay apart.
+
+Squads are also packed as bitsets - a row of 64-bit words per manager, bit p set when
+element p is in the squad - so the overlap of two squads is a popcount of their AND,
+and all pairs take O(managers² × elements / 64) word operations.
+
+Picks keep the snapshot's manager and pick order, so ties resolve the way the
+per-manager loops they replace did.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+STARTING_XI = 11
+
+
+def pick_multiplier(pick: Dict, active_chip: Optional[str] = None) -> int:
+    """The API's multiplier, or - when a pick has none - the one its position, the
+    armband and the active chip give"""
+    if 'multiplier' in pick:
+        return pick['multiplier']
+    if pick.get('is_captain'):
+        return 3 if active_chip == '3xc' else 2
+    return 1 if pick.get('position', 0) <= STARTING_XI or active_chip == 'bboost' else 0
+
+
+if hasattr(np, 'bitwise_count'):
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per uint64 word"""
+        return np.bitwise_count(words)
+else:
+    # numpy < 2.0: a byte lookup table over the words' bytes
+    _BYTE_BITS = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def popcount(words: np.ndarray) -> np.ndarray:
+        """Set bits per uint64 word"""
+        as_bytes = words.view(np.uint8).reshape(words.shape + (8,))
+        return _BYTE_BITS[as_bytes].sum(axis=-1, dtype=np.uint8)
+
+
+class OwnershipMatrix:
+    def __init__(self, manager_ids: List[Any], indptr: np.ndarray, element: np.ndarray,
+                 multiplier: np.ndarray, position: np.ndarray, is_captain: np.ndarray,
+                 chips: Optional[List[Optional[str]]] = None):
+        self.manager_ids = manager_ids
+        self.chips = chips if chips is not None else [None] * len(manager_ids)
+        self.indptr = indptr
+        self.element = element
+        self.multiplier = multiplier
+        self.position = position
+        self.is_captain = is_captain
+        self.size = int(element.max()) + 1 if len(element) else 0
+        self._reset()
+
+    def _reset(self):
+        self.rows = {manager_id: row for row, manager_id in enumerate(self.manager_ids)}
+        # manager row of every pick
+        self.pick_rows = np.repeat(np.arange(len(self.manager_ids)), np.diff(self.indptr))
+        self._bits = None
+
+    def __getstate__(self) -> Dict:
+        # The warm cache keeps the CSR arrays only - lookups and bitsets are rebuilt on demand
+        return {name: getattr(self, name) for name in
+                ('manager_ids', 'chips', 'indptr', 'element', 'multiplier', 'position', 'is_captain',
+                 'size')}
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        if 'chips' not in state:
+            # pickled before chips were kept
+            self.chips = [None] * len(self.manager_ids)
+        self._reset()
+
+    @classmethod
+    def from_managers(cls, managers_data: Dict) -> "OwnershipMatrix":
+        manager_ids = list(managers_data)
+        current_picks = [data.get('current_picks', {}) for data in managers_data.values()]
+        chips = [picks.get('active_chip') for picks in current_picks]
+        picks = [picks.get('picks', []) for picks in current_picks]
+        indptr = np.zeros(len(picks) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in picks], out=indptr[1:])
+        flat = [(pick, chip) for squad, chip in zip(picks, chips) for pick in squad]
+        return cls(
+            manager_ids,
+            indptr,
+            np.array([p['element'] for p, _ in flat], dtype=np.int32),
+            np.array([pick_multiplier(p, chip) for p, chip in flat], dtype=np.int8),
+            np.array([p.get('position', 0) for p, _ in flat], dtype=np.int8),
+            np.array([bool(p.get('is_captain')) for p, _ in flat], dtype=bool),
+            chips,
+        )
+
+    def __len__(self) -> int:
+        return len(self.manager_ids)
+
+    def row(self, manager_id: Any) -> int:
+        """Row of a manager, -1 if not in the snapshot"""
+        return self.rows.get(manager_id, -1)
+
+    def rows_of(self, manager_ids: Iterable[Any]) -> np.ndarray:
+        """Rows of the given managers; KeyError for a manager not in the snapshot (a -1
+        would silently index the last manager's row)"""
+        rows = []
+        for manager_id in manager_ids:
+            if manager_id not in self.rows:
+                raise KeyError(f"Manager {manager_id!r} is not in the managers snapshot")
+            rows.append(self.rows[manager_id])
+        return np.array(rows, dtype=np.int64)
+
+    def picks(self, starting_only: bool = False, managers: Optional[np.ndarray] = None) -> np.ndarray:
+        """Boolean pick mask: starting XI only, of the given manager rows only"""
+        mask = np.ones(len(self.element), dtype=bool)
+        if starting_only:
+            mask &= self.position <= STARTING_XI
+        if managers is not None:
+            selected = np.zeros(len(self), dtype=bool)
+            selected[managers] = True
+            mask &= selected[self.pick_rows]
+        return mask
+
+    def counts(self, starting_only: bool = False, managers: Optional[np.ndarray] = None) -> np.ndarray:
+        """Owners of every element id (index = element id)"""
+        picks = self.picks(starting_only, managers)
+        return np.bincount(self.element[picks], minlength=self.size)
+
+    def captain_counts(self, managers: Optional[np.ndarray] = None) -> np.ndarray:
+        """Managers captaining every element id"""
+        picks = self.picks(managers=managers) & self.is_captain
+        return np.bincount(self.element[picks], minlength=self.size)
+
+    def effective_ownership(self) -> np.ndarray:
+        """EO of every element id: Σ multipliers / managers (1.0 = 100%)"""
+        return np.bincount(self.element, weights=self.multiplier, minlength=self.size) / max(len(self), 1)
+
+    def first_pick(self, picks: Optional[np.ndarray] = None) -> np.ndarray:
+        """Index of the first pick (of the `picks` mask) of every element id, picks in
+        snapshot order (the number of picks for ids never picked) - the order a dict
+        filled by looping over the managers' picks would list them in"""
+        first = np.full(self.size, len(self.element), dtype=np.int64)
+        index = np.arange(len(self.element)) if picks is None else np.flatnonzero(picks)
+        ids, at = np.unique(self.element[index], return_index=True)
+        first[ids] = index[at]
+        return first
+
+    def by_ownership(self, counts: np.ndarray, n: Optional[int] = None,
+                     picks: Optional[np.ndarray] = None) -> np.ndarray:
+        """Element ids with a non-zero count, highest first, ties in first-pick order
+        (Counter.most_common over the same loop); `picks` is the mask the counts came from"""
+        ids = np.flatnonzero(counts)
+        ids = ids[np.lexsort((self.first_pick(picks)[ids], -counts[ids]))]
+        return ids[:n]
+
+    def sole_owners(self, managers: np.ndarray, starting_only: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(element ids, owner rows) of the players exactly one of the given managers
+        holds - ordered by the owner's place in `managers`, then by pick order"""
+        picks = self.picks(starting_only, managers)
+        counts = np.bincount(self.element[picks], minlength=self.size)
+        index = np.flatnonzero(picks & (counts[self.element] == 1))
+        place = np.zeros(len(self), dtype=np.int64)
+        place[managers] = np.arange(len(managers))
+        index = index[np.lexsort((index, place[self.pick_rows[index]]))]
+        return self.element[index], self.pick_rows[index]
+
+    def owners(self, player_id: int, starting_only: bool = False) -> np.ndarray:
+        """Rows of the managers holding a player"""
+        picks = self.picks(starting_only) & (self.element == player_id)
+        return self.pick_rows[picks]
+
+    def manager_points(self, points_by_id: np.ndarray) -> np.ndarray:
+        """Σ multiplier × points per manager (points indexed by element id)"""
+        values = np.zeros(self.size)
+        known = min(self.size, len(points_by_id))
+        values[:known] = points_by_id[:known]
+        return np.bincount(self.pick_rows, weights=self.multiplier * values[self.element],
+                           minlength=len(self))
+
+    @property
+    def bits(self) -> np.ndarray:
+        """Squads as packed bitsets: (managers, words) uint64, bit p of a row = element p owned"""
+        if self._bits is None:
+            words = (self.size + 63) // 64
+            dense = np.zeros((len(self), words * 64), dtype=bool)
+            dense[self.pick_rows, self.element] = True
+            packed = np.packbits(dense, axis=1, bitorder='little')
+            self._bits = np.ascontiguousarray(packed).view('<u8')
+        return self._bits
+
+    def overlap(self, a: int, b: int) -> int:
+        """Players the squads of manager rows a and b share"""
+        return int(popcount(self.bits[a] & self.bits[b]).sum())
+
+    def overlap_matrix(self, managers: Optional[np.ndarray] = None, block: int = 64) -> np.ndarray:
+        """Shared players of every pair of the given manager rows (all by default)"""
+        bits = self.bits if managers is None else self.bits[managers]
+        overlap = np.empty((len(bits), len(bits)), dtype=np.int16)
+        for start in range(0, len(bits), block):
+            pairs = bits[start:start + block, None, :] & bits[None, :, :]
+            overlap[start:start + block] = popcount(pairs).sum(axis=2, dtype=np.int16)
+        return overlap
+
+    def most_similar(self, manager_row: int, n: int = 5) -> List[Tuple[int, int]]:
+        """[(manager row, shared players)] of the N squads closest to a manager's"""
+        shared = popcount(self.bits & self.bits[manager_row]).sum(axis=1, dtype=np.int64)
+        shared[manager_row] = -1
+        top = np.lexsort((np.arange(len(shared)), -shared))[:n]
+        return [(row, shared[row].item()) for row in top.tolist()]
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+FPL Picks Cache
+Permanent on-disk cache of /entry/{id}/event/{gw}/picks/ for finished gameweeks.
+Picks of a finished event never change, so every (entry, event) is fetched once.
+
+fpl_data/picks_cache/<entry>/<event>.json
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Written for events the entry didn't play (joined later) so they aren't retried
+NOT_FOUND = {'not_found': True}
+
+
+class PicksCache:
+    def __init__(self, data_dir: str = "fpl_data"):
+        self.root = Path(data_dir) / "picks_cache"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, entry: int, event: int) -> Path:
+        return self.root / str(entry) / f"{event}.json"
+
+    def has(self, entry: int, event: int) -> bool:
+        return self.path(entry, event).exists()
+
+    def get(self, entry: int, event: int) -> Optional[Dict]:
+        """Picks for (entry, event), or None if not cached / the entry has no picks"""
+        path = self.path(entry, event)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            picks = json.load(f)
+        return None if picks == NOT_FOUND else picks
+
+    def put(self, entry: int, event: int, picks: Dict):
+        """Atomic write - a crash never leaves a half-written entry behind"""
+        path = self.path(entry, event)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(picks, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def mark_not_found(self, entry: int, event: int):
+        self.put(entry, event, NOT_FOUND)
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+FPL Player Table
+bootstrap-static 'elements' as one numpy structured array: a row per player, parsed
+once at load (form / points_per_game / ict_index / selected_by_percent arrive as
+strings) plus a dense player id -> row table. Built once per bootstrap snapshot by
+FPLDataStore; scoring, filtering by position / price / status and top-K selection
+run over all ~700 players at once. Transfer scores (ScoreWeights) are computed for
+every player in one pass and cached per snapshot and weights, and a ReplacementIndex
+answers "best K affordable players at position P not in squad S" with a bisect.
+
+Rows keep the bootstrap element order, so ties resolve the way the per-player loops
+they replace did.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from live_index import top_indices
+
+POSITIONS = ['GKP', 'DEF', 'MID', 'FWD']
+
+# column -> (dtype, parser of the raw bootstrap value)
+COLUMNS = {
+    'id': ('i4', int),
+    'element_type': ('i1', int),
+    'team': ('i2', int),
+    'now_cost': ('i4', int),
+    'status': ('U1', str),
+    'total_points': ('i4', int),
+    'minutes': ('i4', int),
+    'goals_scored': ('i4', int),
+    'assists': ('i4', int),
+    'clean_sheets': ('i4', int),
+    'bonus': ('i4', int),
+    'form': ('f8', float),
+    'points_per_game': ('f8', float),
+    'ict_index': ('f8', float),
+    'selected_by_percent': ('f8', float),
+}
+
+DTYPE = np.dtype([(name, dtype) for name, (dtype, _) in COLUMNS.items()])
+
+# Value of a missing / empty field, as the modules' player.get(field, 0) treated it
+_DEFAULTS = {'status': 'a'}
+
+
+@dataclass(frozen=True)
+class ScoreWeights:
+    """Transfer quality score:
+    form * form + PPG * points_per_game + ICT / ict_per + selected% / selected_per
+    + (minutes / 90) / minutes_per"""
+    form: float = 3.0
+    points_per_game: float = 2.0
+    ict_per: float = 10.0
+    selected_per: float = 5.0
+    minutes_per: float = 10.0
+
+
+def player_score(player: Dict, weights: ScoreWeights = ScoreWeights()) -> float:
+    """Transfer score of a single bootstrap element dict"""
+    score = 0.0
+    score += float(player.get('form', 0)) * weights.form
+    score += float(player.get('points_per_game', 0)) * weights.points_per_game
+    score += float(player.get('ict_index', 0)) / weights.ict_per
+    score += float(player.get('selected_by_percent', 0)) / weights.selected_per
+    score += (player.get('minutes', 0) / 90) / weights.minutes_per
+    return score
+
+
+def _parse(player: Dict, name: str):
+    value = player.get(name)
+    if value is None or value == '':
+        return _DEFAULTS.get(name, 0)
+    return COLUMNS[name][1](value)
+
+
+class ReplacementIndex:
+    """Per position: eligible rows sorted by price, each holding its rank in the value
+    order (highest first, ties by row). A query bisects the budget to the affordable
+    prefix and takes the K + |S| best ranks of it with a partial partition - exactly
+    the rows a full scan + stable sort would return"""
+
+    def __init__(self, table: "PlayerTable", values: np.ndarray, eligible: Optional[np.ndarray] = None):
+        self.ranked_rows = top_indices(values, len(values))
+        self.rank = np.empty(len(values), dtype=np.int64)
+        self.rank[self.ranked_rows] = np.arange(len(values))
+        self.rank_by_id = dict(zip(table['id'].tolist(), self.rank.tolist()))
+        if eligible is None:
+            eligible = np.ones(len(values), dtype=bool)
+
+        prices = table.price()
+        self.positions = {}
+        for position in np.unique(table['element_type']).tolist():
+            rows = np.flatnonzero((table['element_type'] == position) & eligible)
+            rows = rows[np.argsort(prices[rows], kind='stable')]
+            self.positions[position] = (prices[rows].tolist(), self.rank[rows])
+
+    def best(self, position: int, budget: float, exclude_ids: Iterable[int] = (), k: int = 10) -> np.ndarray:
+        """Rows of the K best players of a position priced <= budget (£m), not excluded"""
+        if position not in self.positions:
+            return self.ranked_rows[:0]
+        prices, ranks = self.positions[position]
+        affordable = ranks[:bisect_right(prices, budget)]
+
+        excluded = {self.rank_by_id[i] for i in exclude_ids if i in self.rank_by_id}
+        wanted = k + len(excluded)
+        if wanted < len(affordable):
+            affordable = np.partition(affordable, wanted - 1)[:wanted]
+        best = [rank for rank in np.sort(affordable).tolist() if rank not in excluded][:k]
+        return self.ranked_rows[best]
+
+
+class PlayerTable:
+    def __init__(self, data: np.ndarray):
+        self.data = data
+        size = int(data['id'].max()) + 1 if len(data) else 0
+        self.rows = np.full(size, -1, dtype=np.int32)
+        self.rows[data['id']] = np.arange(len(data), dtype=np.int32)
+        self._reset()
+
+    def _reset(self):
+        self._captain_scores = None
+        self._scores: Dict[ScoreWeights, np.ndarray] = {}
+        self._replacement_indexes: Dict[Any, ReplacementIndex] = {}
+
+    def __getstate__(self) -> Dict:
+        # The warm cache keeps the table only - derived scores are recomputed on demand
+        return {'data': self.data, 'rows': self.rows}
+
+    def __setstate__(self, state: Dict):
+        self.data = state['data']
+        self.rows = state['rows']
+        self._reset()
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[Dict]) -> "PlayerTable":
+        records = [tuple(_parse(player, name) for name in COLUMNS) for player in elements]
+        return cls(np.array(records, dtype=DTYPE))
+
+    @classmethod
+    def from_bootstrap(cls, bootstrap_data: Dict) -> "PlayerTable":
+        return cls.from_elements(bootstrap_data.get('elements', []))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.data[column]
+
+    def row(self, player_id: int) -> int:
+        """Row of a player, -1 if not in the table"""
+        if 0 <= player_id < len(self.rows):
+            return int(self.rows[player_id])
+        return -1
+
+    def rows_of(self, player_ids: Iterable[int]) -> np.ndarray:
+        """Rows of the given players (-1 for unknown ids), in the given order"""
+        ids = np.fromiter(player_ids, dtype=np.int64)
+        found = (ids >= 0) & (ids < len(self.rows))
+        rows = np.full(len(ids), -1, dtype=np.int32)
+        rows[found] = self.rows[ids[found]]
+        return rows
+
+    def get(self, player_id: int, column: str, default=0):
+        row = self.row(player_id)
+        if row < 0:
+            return default
+        return self.data[column][row].item()
+
+    def record(self, player_id: int) -> Optional[Dict]:
+        """{column: Python value} of a player"""
+        row = self.row(player_id)
+        if row < 0:
+            return None
+        return dict(zip(DTYPE.names, self.data[row].item()))
+
+    def price(self) -> np.ndarray:
+        """now_cost in £m, as now_cost / 10"""
+        return self.data['now_cost'] / 10
+
+    def mask(self, position: Optional[int] = None, max_price: Optional[float] = None,
+             status: Optional[str] = None, exclude_ids: Iterable[int] = ()) -> np.ndarray:
+        """Boolean row mask: element_type, price (£m) ceiling, status, ids to leave out"""
+        mask = np.ones(len(self.data), dtype=bool)
+        if position is not None:
+            mask &= self.data['element_type'] == position
+        if max_price is not None:
+            mask &= self.price() <= max_price
+        if status is not None:
+            mask &= self.data['status'] == status
+        exclude = np.fromiter(exclude_ids, dtype=np.int64)
+        if len(exclude):
+            mask &= ~np.isin(self.data['id'], exclude)
+        return mask
+
+    def top_k(self, values: np.ndarray, k: int, where: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rows of the K highest `values` (one per row), highest first, ties in row order"""
+        candidates = None if where is None else np.flatnonzero(where)
+        return top_indices(values, k, candidates)
+
+    def captain_scores(self) -> np.ndarray:
+        """Captaincy score of every player - form, PPG, bonus, goal involvements, ICT"""
+        if self._captain_scores is None:
+            d = self.data
+            score = np.zeros(len(d))
+            score += d['form'] * 5
+            score += d['points_per_game'] * 3
+            score += d['bonus'] / 2
+            score += (d['goals_scored'] + d['assists']) / 3
+            score += d['ict_index'] / 20
+            self._captain_scores = score
+        return self._captain_scores
+
+    def scores(self, weights: ScoreWeights = ScoreWeights()) -> np.ndarray:
+        """Transfer score of every player (see player_score), same operation order per row"""
+        cached = self._scores.get(weights)
+        if cached is None:
+            d = self.data
+            cached = np.zeros(len(d))
+            cached += d['form'] * weights.form
+            cached += d['points_per_game'] * weights.points_per_game
+            cached += d['ict_index'] / weights.ict_per
+            cached += d['selected_by_percent'] / weights.selected_per
+            cached += (d['minutes'] / 90) / weights.minutes_per
+            self._scores[weights] = cached
+        return cached
+
+    def replacement_index(self, key: Any, values: np.ndarray,
+                          eligible: Optional[np.ndarray] = None) -> ReplacementIndex:
+        """ReplacementIndex ranking players by `values`, built once per snapshot and `key`"""
+        index = self._replacement_indexes.get(key)
+        if index is None:
+            index = self._replacement_indexes[key] = ReplacementIndex(self, values, eligible)
+        return index
+
+    def ids(self, rows: np.ndarray) -> List[int]:
+        return self.data['id'][rows].tolist()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+FPL Projections
+Expected points (xP) of every player over the next H gameweeks, as one players × GWs
+matrix built from the bootstrap and fixtures snapshots:
+- a per-match base rate blending form and points per game
+- every fixture scaled by its difficulty (FDR 1-5) and home / away
+- a blank gameweek (no fixture, e.g. a postponed match with event = null) projects 0,
+  a double gameweek sums both fixtures
+- the next gameweek is scaled by availability (status); players who left the club or
+  are ineligible stay at 0 for the whole horizon
+
+Built by FPLDataStore.projections() once per bootstrap + fixtures snapshot and model.
+"""
+
+import argparse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from player_table import POSITIONS, PlayerTable
+
+# Expected share of the next gameweek a player with this status plays
+STATUS_AVAILABILITY = {'a': 1.0, 'd': 0.5, 'i': 0.0, 's': 0.0, 'n': 0.0, 'u': 0.0}
+# Statuses that rule a player out beyond the next gameweek too (left the club / ineligible)
+OUT_FOR_HORIZON = ['u', 'n']
+
+
+@dataclass(frozen=True)
+class ProjectionModel:
+    """xP of a fixture = (form_weight * form + (1 - form_weight) * PPG)
+    * difficulty[FDR - 1] * (home or away)"""
+    form_weight: float = 0.5
+    difficulty: Tuple[float, ...] = (1.3, 1.15, 1.0, 0.85, 0.7)
+    home: float = 1.05
+    away: float = 0.95
+
+
+def next_gameweek(bootstrap_data: Dict) -> int:
+    """The gameweek of the next deadline"""
+    events = bootstrap_data.get('events', [])
+    for event in events:
+        if event.get('is_next'):
+            return event['id']
+    for event in events:
+        if event.get('is_current'):
+            return event['id'] + 1
+    return 1
+
+
+def upcoming_fixtures(fixtures: List[Dict], team_id: int, start_gw: int, count: int) -> List[Dict]:
+    """The next `count` scheduled fixtures of a team from start_gw on, in gameweek order"""
+    upcoming = []
+    for fixture in fixtures:
+        gameweek = fixture.get('event')
+        if gameweek is None or gameweek < start_gw:
+            continue
+        if fixture['team_h'] == team_id:
+            upcoming.append({'gameweek': gameweek, 'opponent_id': fixture['team_a'], 'is_home': True,
+                             'difficulty': fixture.get('team_h_difficulty', 3)})
+        elif fixture['team_a'] == team_id:
+            upcoming.append({'gameweek': gameweek, 'opponent_id': fixture['team_h'], 'is_home': False,
+                             'difficulty': fixture.get('team_a_difficulty', 3)})
+    upcoming.sort(key=lambda f: f['gameweek'])
+    return upcoming[:count]
+
+
+class Projections:
+    def __init__(self, table: PlayerTable, fixtures: List[Dict], start_gw: int, horizon: int = 5,
+                 model: Optional[ProjectionModel] = None):
+        self.table = table
+        self.model = model = model or ProjectionModel()
+        self.start_gw = start_gw
+        self.gameweeks = list(range(start_gw, start_gw + horizon))
+
+        # Teams × GWs: number of fixtures and the sum of their multipliers
+        scheduled = [f for f in fixtures
+                     if f.get('event') is not None and start_gw <= f['event'] < start_gw + horizon]
+        teams = max([int(table['team'].max()) if len(table) else 0]
+                    + [max(f['team_h'], f['team_a']) for f in scheduled]) + 1
+        self.fixture_counts = np.zeros((teams, horizon), dtype=np.int8)
+        self.multipliers = np.zeros((teams, horizon))
+        if scheduled:
+            column = np.array([f['event'] - start_gw for f in scheduled])
+            difficulty = np.array(model.difficulty)
+            for side, venue in (('h', model.home), ('a', model.away)):
+                team = np.array([f[f'team_{side}'] for f in scheduled])
+                fdr = np.clip([f.get(f'team_{side}_difficulty') or 3 for f in scheduled], 1, 5)
+                np.add.at(self.fixture_counts, (team, column), 1)
+                np.add.at(self.multipliers, (team, column), difficulty[fdr - 1] * venue)
+
+        base = model.form_weight * table['form'] + (1 - model.form_weight) * table['points_per_game']
+        status = table['status']
+        availability = np.ones((len(table), horizon))
+        availability[np.isin(status, OUT_FOR_HORIZON)] = 0.0
+        if horizon:
+            availability[:, 0] = [STATUS_AVAILABILITY.get(s, 1.0) for s in status.tolist()]
+        self.xp = base[:, None] * self.multipliers[table['team']] * availability
+
+    @property
+    def horizon(self) -> int:
+        return len(self.gameweeks)
+
+    def total(self, horizon: Optional[int] = None) -> np.ndarray:
+        """xP of every player summed over the first `horizon` gameweeks (all by default)"""
+        return self.xp[:, :horizon].sum(axis=1)
+
+    def next_gw(self) -> np.ndarray:
+        """xP of every player in the next gameweek"""
+        return self.xp[:, 0] if self.horizon else np.zeros(len(self.table))
+
+    def player(self, player_id: int) -> np.ndarray:
+        """xP of a player per gameweek (zeros for an unknown id)"""
+        row = self.table.row(player_id)
+        return self.xp[row] if row >= 0 else np.zeros(self.horizon)
+
+    def blanks(self, team_id: int) -> List[int]:
+        return [gw for gw, n in zip(self.gameweeks, self.fixture_counts[team_id].tolist()) if n == 0]
+
+    def doubles(self, team_id: int) -> List[int]:
+        return [gw for gw, n in zip(self.gameweeks, self.fixture_counts[team_id].tolist()) if n > 1]
+
+
+def main():
+    from fpl_store import FPLDataStore
+
+    parser = argparse.ArgumentParser(description="Expected points over the next gameweeks")
+    parser.add_argument("--data-dir", default="fpl_data")
+    parser.add_argument("--horizon", type=int, default=5, help="Gameweeks to project")
+    parser.add_argument("--top", type=int, default=15, help="Players to list")
+    args = parser.parse_args()
+
+    try:
+        store = FPLDataStore(args.data_dir)
+        projections = store.projections(args.horizon)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        print("\nPlease run fpl_data_collector.py first!")
+        return
+
+    table = projections.table
+    players = store.players_by_id()
+    teams = store.teams_by_id()
+    total = projections.total()
+    print(f"\n📈 EXPECTED POINTS - GW{projections.gameweeks[0]}-GW{projections.gameweeks[-1]}")
+    print("=" * 80)
+    header = ''.join(f"{'GW' + str(gw):>7}" for gw in projections.gameweeks)
+    print(f"{'Player':<20} {'Pos':<4} {'Team':<12}{header} {'Total':>7}")
+    print("-" * 80)
+    top = table.top_k(total, args.top)
+    for row, player_id in zip(top.tolist(), table.ids(top)):
+        player = players[player_id]
+        team_id = player['team']
+        cells = ''
+        for gw_xp, fixtures in zip(projections.xp[row].tolist(), projections.fixture_counts[team_id].tolist()):
+            cell = '-' if fixtures == 0 else f"{'×2 ' if fixtures > 1 else ''}{gw_xp:.1f}"
+            cells += f"{cell:>7}"
+        print(f"{player['web_name']:<20} {POSITIONS[player['element_type'] - 1]:<4} "
+              f"{teams.get(team_id, {}).get('short_name', '?'):<12}{cells} {total[row]:>7.1f}")
+    print("-" * 80)
+    print("💡 ×2 = double gameweek, - = blank gameweek")
+
+
+if __name__ == "__main__":
+    main()
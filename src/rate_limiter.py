@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+FPL API Rate Limiter
+Adaptive token bucket shared by every FPLDataCollector request:
+- one global bucket whose rate follows observed latency (AIMD)
+- optional per-endpoint budgets (e.g. the heavy bootstrap-static payload)
+- Retry-After aware pausing and jittered exponential backoff for retries
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Tokens may go negative to queue reservations."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# requests/second and burst per endpoint, on top of the global bucket
+DEFAULT_ENDPOINT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    'bootstrap-static': (0.2, 1),
+    'live': (1.0, 2),
+    'standings': (5.0, 5),
+}
+
+
+class AdaptiveRateLimiter:
+    """Global adaptive token bucket plus per-endpoint budgets"""
+
+    def __init__(self, rate: float = 10.0, burst: float = 10, min_rate: float = 1.0,
+                 max_rate: float = 25.0, target_latency: float = 1.0,
+                 endpoint_budgets: Optional[Dict[str, Tuple[float, float]]] = None,
+                 backoff_base: float = 1.0, backoff_cap: float = 60.0):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._bucket = TokenBucket(rate, burst)
+        if endpoint_budgets is None:
+            endpoint_budgets = DEFAULT_ENDPOINT_BUDGETS
+        self._endpoint_buckets = {
+            endpoint: TokenBucket(budget_rate, budget_burst)
+            for endpoint, (budget_rate, budget_burst) in endpoint_budgets.items()
+        }
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._bucket.rate
+
+    def _set_rate(self, rate: float):
+        self._bucket.set_rate(max(self.min_rate, min(self.max_rate, rate)))
+
+    def acquire(self, endpoint: str):
+        """Block until a request to this endpoint is allowed"""
+        while True:
+            with self._lock:
+                wait = self._paused_until - time.monotonic()
+            if wait <= 0:
+                break
+            time.sleep(wait)
+
+        endpoint_bucket = self._endpoint_buckets.get(endpoint)
+        if endpoint_bucket:
+            endpoint_bucket.acquire()
+        self._bucket.acquire()
+
+    def record_success(self, endpoint: str, latency: float):
+        """Additive increase while the server is fast, gentle decrease when it slows down"""
+        with self._lock:
+            if latency > self.target_latency * 2:
+                self._set_rate(self.rate * 0.8)
+            elif latency < self.target_latency:
+                self._set_rate(self.rate + 0.5)
+
+    def record_failure(self, endpoint: str, retry_after: Optional[float] = None,
+                       throttled: bool = False):
+        """Multiplicative decrease; a 429 also pauses every request until Retry-After"""
+        with self._lock:
+            self._set_rate(self.rate * (0.5 if throttled else 0.8))
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After may be delay-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+_shared_limiter: Optional[AdaptiveRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> AdaptiveRateLimiter:
+    """Process-wide limiter, so several collectors never exceed the budget together"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter()
+        return _shared_limiter
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+FPL Snapshot Index
+Append-only manifest of every snapshot the collector writes: fpl_data/index.jsonl,
+one line per collection run (or live checkpoint) -
+
+{"league_id": 922765, "gameweek": 24, "timestamp": "2024-02-02T14:30:15",
+ "files": {"managers": {"path": "managers_detailed_2024-02-02.fpls", "size": 5831224,
+                        "sha256": "..."}, ...}}
+
+Readers resolve "latest", "as of GW N" and "as of time T" from it instead of globbing
+and trusting mtimes. Paths are relative to the data directory, so it can be copied.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+INDEX_FILE = "index.jsonl"
+
+
+def file_entry(path: Path) -> Dict:
+    """Relative name, size and content hash of a snapshot file"""
+    path = Path(path)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {'path': path.name, 'size': path.stat().st_size, 'sha256': digest.hexdigest()}
+
+
+def _reversed_lines(path: Path, block_size: int = 8192) -> Iterator[bytes]:
+    """Lines of a file from the last one back, reading only the blocks needed"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        tail = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + tail).split(b"\n")
+            tail = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if tail.strip():
+            yield tail
+
+
+def _parse(line: bytes) -> Optional[Dict]:
+    try:
+        return json.loads(line)
+    except ValueError:
+        # A run killed mid-append leaves a partial last line behind
+        return None
+
+
+class SnapshotIndex:
+    def __init__(self, data_dir: str = "fpl_data"):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / INDEX_FILE
+
+    def append(self, league_id: Optional[int], gameweek: int, files: Dict[str, Path],
+               timestamp: Optional[str] = None) -> Dict:
+        entry = {
+            'league_id': league_id,
+            'gameweek': gameweek,
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'files': {kind: file_entry(path) for kind, path in files.items()},
+        }
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def entries(self) -> Iterator[Dict]:
+        """All entries, oldest first"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                entry = _parse(line) if line.strip() else None
+                if entry:
+                    yield entry
+
+    def latest(self, kind: str, league_id: Optional[int] = None) -> Optional[Dict]:
+        """Newest entry holding `kind` - reads the index backwards from its end"""
+        if not self.path.exists():
+            return None
+        for line in _reversed_lines(self.path):
+            entry = _parse(line)
+            if entry and kind in entry['files'] and league_id in (None, entry.get('league_id')):
+                return entry
+        return None
+
+    def as_of_gw(self, kind: str, gameweek: int, league_id: Optional[int] = None) -> Optional[Dict]:
+        """Newest entry holding `kind` collected in gameweek N or earlier"""
+        found = None
+        for entry in self.entries():
+            if (kind in entry['files'] and entry['gameweek'] <= gameweek
+                    and league_id in (None, entry.get('league_id'))):
+                found = entry
+        return found
+
+    def as_of_time(self, kind: str, when: Union[str, datetime],
+                   league_id: Optional[int] = None) -> Optional[Dict]:
+        """Newest entry holding `kind` collected at or before `when`"""
+        if isinstance(when, datetime):
+            when = when.isoformat()
+        found = None
+        for entry in self.entries():
+            if (kind in entry['files'] and entry['timestamp'] <= when
+                    and league_id in (None, entry.get('league_id'))):
+                found = entry
+        return found
+
+    def resolve(self, entry: Optional[Dict], kind: str) -> Optional[Path]:
+        """Path of an entry's `kind` file inside the data directory"""
+        if not entry:
+            return None
+        return self.data_dir / entry['files'][kind]['path']
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+FPL Snapshot Files
+Compact on-disk format for the collector's snapshots (bootstrap, live, league, managers)
+and the reader every analysis module loads them with.
+
+.fpls layout:
+    b"FPLS" | version (1 byte) | codec (1 byte: b"m" msgpack, b"j" compact JSON)
+    then records: uint32 little-endian length | encoded [op, key, value]
+
+op SET stores a top-level key; top-level lists are written as SET key [] followed by
+one APPEND per item, so a reader can stream managers / elements one record at a time.
+Indented .json snapshots stay readable - load_snapshot() picks the parser by suffix.
+iter_top_level() / iter_list() stream either format one manager / element at a time.
+
+Usage: python snapshot_io.py convert [fpl_data ...] [--to fpls|json] [--remove]
+       python snapshot_io.py verify [fpl_data ...] [--chunk-size 3]
+"""
+
+import gc
+import json
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+MAGIC = b"FPLS"
+VERSION = 1
+SUFFIX = ".fpls"
+OP_SET = 0
+OP_APPEND = 1
+
+CODEC_MSGPACK = b"m"
+CODEC_JSON = b"j"
+
+_LENGTH = struct.Struct("<I")
+
+# Collector outputs the converter handles (summaries stay human-readable JSON)
+SNAPSHOT_PATTERNS = ["bootstrap_data_*", "fixtures_*", "live_gw*", "league_*", "managers_detailed_*"]
+
+
+def get_encoder(codec: bytes):
+    if codec == CODEC_MSGPACK:
+        return msgpack.Packer(use_bin_type=True).pack
+    return lambda record: json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def get_decoder(codec: bytes):
+    if codec == CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack is required to read this snapshot (pip install msgpack)")
+        return lambda payload: msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if codec == CODEC_JSON:
+        return json.loads
+    raise ValueError(f"Unknown snapshot codec {codec!r}")
+
+
+def default_codec() -> bytes:
+    return CODEC_MSGPACK if MSGPACK_AVAILABLE else CODEC_JSON
+
+
+def write_snapshot(path: Path, data: Dict, codec: Optional[bytes] = None):
+    """Write a dict snapshot atomically (tmp file + rename)"""
+    if not isinstance(data, dict):
+        raise TypeError("Snapshots are dicts at the top level")
+    codec = codec or default_codec()
+    encode = get_encoder(codec)
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + bytes([VERSION]) + codec)
+        for key, value in data.items():
+            # JSON object keys are strings - keep snapshots identical whichever format
+            key = str(key)
+            if isinstance(value, list):
+                records = [[OP_SET, key, []]] + [[OP_APPEND, key, item] for item in value]
+            else:
+                records = [[OP_SET, key, value]]
+            for record in records:
+                payload = encode(record)
+                f.write(_LENGTH.pack(len(payload)))
+                f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def iter_records(path: Path) -> Iterator[Tuple[int, str, Any]]:
+    """(op, key, value) for every record of an .fpls file, in write order"""
+    with open(path, 'rb') as f:
+        header = f.read(len(MAGIC) + 2)
+        if header[:len(MAGIC)] != MAGIC or len(header) < len(MAGIC) + 2:
+            raise ValueError(f"{path} is not an FPL snapshot")
+        if header[len(MAGIC)] != VERSION:
+            raise ValueError(f"{path}: unsupported snapshot version {header[len(MAGIC)]}")
+        decode = get_decoder(header[-1:])
+        while True:
+            prefix = f.read(_LENGTH.size)
+            if not prefix:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = f.read(length)
+            if len(payload) < length:
+                raise ValueError(f"{path}: truncated record")
+            op, key, value = decode(payload)
+            yield op, key, value
+
+
+def read_snapshot(path: Path) -> Dict:
+    # Decoding only allocates (no cycles) - pausing the GC saves its repeated scans
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        data = {}
+        for op, key, value in iter_records(path):
+            if op == OP_APPEND:
+                data[key].append(value)
+            else:
+                data[key] = value
+        return data
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def load_snapshot(path: Path) -> Dict:
+    """Load a snapshot written in either format"""
+    path = Path(path)
+    if path.suffix == SUFFIX:
+        return read_snapshot(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# --- streaming ---
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may follow a complete value - anything else (a '.', 'e', digit) means a number
+# cut at the buffer edge, e.g. "1234." + "5"
+_DELIMITERS = frozenset(" \t\n\r,:]}")
+
+
+class _JSONStream:
+    """Pull JSON values one at a time from a text file with a bounded buffer"""
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int):
+        data = self.f.read(size)
+        if not data:
+            self.eof = True
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if self.eof:
+                raise ValueError("Unexpected end of JSON snapshot")
+            self._fill(self.chunk_size)
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON snapshot, found {self.buffer[self.pos]!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self.buffer, self.pos)
+                # Only complete once a delimiter is buffered after it - a number may continue
+                # in the next chunk
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill(size)
+            size *= 2
+
+    def members(self) -> Iterator[Tuple[str, None]]:
+        """Keys of the object at the cursor; the caller reads (or skips) each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key, None
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect('}')
+            return
+
+    def items(self) -> Iterator[Any]:
+        """Values of the array at the cursor"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+                continue
+            self.expect(']')
+            return
+
+
+def iter_top_level(path: Path, chunk_size: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    """(key, value) of a snapshot's top-level object one at a time (e.g. one manager each)"""
+    path = Path(path)
+    if path.suffix == SUFFIX:
+        for op, key, value in iter_records(path):
+            if op == OP_SET:
+                yield key, value
+            else:
+                raise ValueError(f"{path}: '{key}' is a list - stream it with iter_list()")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        for key, _ in stream.members():
+            yield key, stream.value()
+
+
+def iter_list(path: Path, key: str, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Items of the top-level list `key` one at a time (e.g. live 'elements')"""
+    path = Path(path)
+    if path.suffix == SUFFIX:
+        for op, record_key, value in iter_records(path):
+            if op == OP_APPEND and record_key == key:
+                yield value
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        for member, _ in stream.members():
+            if member == key:
+                yield from stream.items()
+                return
+            stream.value()
+
+
+def get_path(value: Any, field: str, default: Any = None) -> Any:
+    """Dotted-path lookup: 'manager_info.player_name', 'history.current.-1.points'"""
+    for part in field.split('.'):
+        if isinstance(value, dict):
+            if part not in value:
+                return default
+            value = value[part]
+        elif isinstance(value, list):
+            try:
+                value = value[int(part)]
+            except (ValueError, IndexError):
+                return default
+        else:
+            return default
+    return value
+
+
+def project(value: Any, fields: List[str]) -> Dict[str, Any]:
+    """{field: value at that dotted path} for each requested field"""
+    return {field: get_path(value, field) for field in fields}
+
+
+def save_snapshot(base_path: Path, data: Dict, fmt: str = "fpls") -> Path:
+    """Write `data` next to base_path (no extension) as .fpls or indented .json"""
+    if fmt == "json":
+        path = Path(f"{base_path}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    else:
+        path = Path(f"{base_path}{SUFFIX}")
+        write_snapshot(path, data)
+    return path
+
+
+def latest_snapshot(data_dir: Path, pattern: str) -> Optional[Path]:
+    """Newest file matching pattern (without extension) in either format"""
+    data_dir = Path(data_dir)
+    files = list(data_dir.glob(f"{pattern}.json")) + list(data_dir.glob(f"{pattern}{SUFFIX}"))
+    if not files:
+        return None
+    return max(files, key=lambda p: (p.stat().st_mtime, p.suffix == SUFFIX))
+
+
+def resolve_snapshot(path: Path) -> Optional[Path]:
+    """The snapshot at path, or its converted twin in the other format"""
+    path = Path(path)
+    for candidate in (path, path.with_suffix(SUFFIX), path.with_suffix(".json")):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def convert_snapshot(path: Path, fmt: str = "fpls", remove: bool = False) -> Path:
+    """Rewrite one snapshot in the other format, keeping its mtime (latest stays latest)"""
+    path = Path(path)
+    data = load_snapshot(path)
+    target = save_snapshot(path.with_suffix(""), data, fmt)
+    stat = path.stat()
+    os.utime(target, (stat.st_atime, stat.st_mtime))
+    if remove and target != path:
+        path.unlink()
+    return target
+
+
+def _snapshot_files(paths: List[str], source_suffix: str) -> List[Path]:
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in SNAPSHOT_PATTERNS:
+                files.extend(sorted(path.glob(f"{pattern}{source_suffix}")))
+        elif path.suffix == source_suffix:
+            files.append(path)
+    return files
+
+
+def verify_streaming(path: Path, chunk_size: int = 3) -> bool:
+    """Stream a .json snapshot with a tiny buffer (every value straddles a chunk edge)
+    and compare it with json.load"""
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    return dict(iter_top_level(path, chunk_size)) == expected
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert FPL snapshots between JSON and .fpls")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert = subparsers.add_parser("convert", help="Convert snapshot files or directories")
+    convert.add_argument("paths", nargs="*", default=["fpl_data"])
+    convert.add_argument("--to", choices=["fpls", "json"], default="fpls")
+    convert.add_argument("--remove", action="store_true", help="Delete the source files")
+    verify = subparsers.add_parser("verify", help="Check streamed .json snapshots against json.load")
+    verify.add_argument("paths", nargs="*", default=["fpl_data"])
+    verify.add_argument("--chunk-size", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "verify":
+        files = _snapshot_files(args.paths, ".json")
+        failed = [path for path in files if not verify_streaming(path, args.chunk_size)]
+        for path in failed:
+            print(f"❌ {path.name}: streamed snapshot differs from json.load")
+        print(f"{'✅' if not failed else '❌'} {len(files) - len(failed)}/{len(files)} snapshots "
+              f"stream identically (chunk size {args.chunk_size})")
+        return
+
+    if args.to == "fpls" and not MSGPACK_AVAILABLE:
+        print("⚠️  msgpack not installed - writing .fpls with the compact JSON codec")
+    source_suffix = ".json" if args.to == "fpls" else SUFFIX
+    files = _snapshot_files(args.paths, source_suffix)
+    if not files:
+        print("No snapshots to convert")
+        return
+
+    total_before = total_after = 0
+    for path in files:
+        size_before = path.stat().st_size
+        start = time.perf_counter()
+        load_snapshot(path)
+        load_before = time.perf_counter() - start
+
+        target = convert_snapshot(path, args.to, remove=False)
+        start = time.perf_counter()
+        load_snapshot(target)
+        load_after = time.perf_counter() - start
+        size_after = target.stat().st_size
+        if args.remove:
+            path.unlink()
+
+        total_before += size_before
+        total_after += size_after
+        print(f"✓ {path.name} -> {target.name}: {size_before / 1024:.0f}KB -> "
+              f"{size_after / 1024:.0f}KB, load {load_before * 1000:.0f}ms -> {load_after * 1000:.0f}ms")
+
+    print(f"\n{len(files)} snapshots: {total_before / 1024 / 1024:.1f}MB -> "
+          f"{total_after / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
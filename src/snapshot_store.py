@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+FPL Snapshot Store
+Content-addressed, deduplicated history of the collector's daily snapshots.
+
+Every snapshot is split into chunks (one per bootstrap/live element, per manager
+history / picks / info, ...) and each unique chunk is kept once, zlib-compressed and
+keyed by the sha256 of its compact JSON. A day manifest per (date, snapshot name) lists the chunks, so a
+season of daily runs costs roughly one snapshot plus what actually changed.
+
+fpl_data/store.sqlite
+    objects(hash, codec, data)      unique chunks (msgpack when available, else JSON)
+    manifests(date, name, tree)     e.g. ('2024-02-02', 'managers_detailed', ...)
+
+Usage (--data-dir defaults to fpl_data):
+    python snapshot_store.py ingest [--remove-old]
+    python snapshot_store.py list
+    python snapshot_store.py export 2024-02-02 managers_detailed [--format json]
+    python snapshot_store.py prune --before 2023-08-01
+"""
+
+import gc
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from snapshot_io import (SNAPSHOT_PATTERNS, SUFFIX, default_codec, get_decoder, get_encoder,
+                         latest_snapshot, load_snapshot, save_snapshot)
+
+STORE_FILE = "store.sqlite"
+# Containers nested deeper than this are stored as a single chunk
+CHUNK_DEPTH = 2
+# SQLite's default limit on host parameters per statement is 999
+_BATCH = 900
+
+_SNAPSHOT_NAME = re.compile(r"^(?P<name>.+)_(?P<date>\d{4}-\d{2}-\d{2})$")
+
+
+def split_snapshot_name(path: Path) -> Optional[Tuple[str, str]]:
+    """'live_gw20_2024-02-02.fpls' -> ('live_gw20', '2024-02-02')"""
+    match = _SNAPSHOT_NAME.match(Path(path).stem)
+    if not match:
+        return None
+    return match.group('name'), match.group('date')
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class SnapshotStore:
+    def __init__(self, data_dir: str = "fpl_data"):
+        self.path = Path(data_dir) / STORE_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS objects ("
+                " hash TEXT PRIMARY KEY, codec BLOB NOT NULL, data BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS manifests ("
+                " date TEXT NOT NULL, name TEXT NOT NULL, tree TEXT NOT NULL,"
+                " PRIMARY KEY (date, name))"
+            )
+
+    # --- writing ---
+
+    def _split(self, value: Any, depth: int, chunks: Dict[str, Any]) -> Dict:
+        """Manifest node for value: {"d": [[key, node]...]}, {"l": [node...]}, {"c": hash} or {"v": scalar}"""
+        if depth < CHUNK_DEPTH and isinstance(value, dict):
+            return {'d': [[key, self._split(item, depth + 1, chunks)] for key, item in value.items()]}
+        if depth < CHUNK_DEPTH and isinstance(value, list):
+            return {'l': [self._split(item, depth + 1, chunks) for item in value]}
+        if not isinstance(value, (dict, list)):
+            return {'v': value}
+        digest = hashlib.sha256(_encode(value)).hexdigest()
+        chunks[digest] = value
+        return {'c': digest}
+
+    def put(self, date: str, name: str, data: Dict) -> Dict[str, int]:
+        """Store one snapshot; returns how many of its chunks were new"""
+        chunks: Dict[str, Any] = {}
+        # JSON object keys are strings - the stored snapshot matches the flat file
+        tree = self._split({str(key): value for key, value in data.items()}, 0, chunks)
+        codec = default_codec()
+        encode = get_encoder(codec)
+        with self._lock, self._conn:
+            existing = self._existing(list(chunks))
+            new_chunks = [
+                (digest, codec, zlib.compress(encode(value))) for digest, value in chunks.items()
+                if digest not in existing
+            ]
+            self._conn.executemany("INSERT OR IGNORE INTO objects VALUES (?, ?, ?)", new_chunks)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?)", (date, name, json.dumps(tree))
+            )
+        return {'chunks': len(chunks), 'new_chunks': len(new_chunks)}
+
+    def _existing(self, digests: List[str]) -> Set[str]:
+        found = set()
+        for i in range(0, len(digests), _BATCH):
+            batch = digests[i:i + _BATCH]
+            rows = self._conn.execute(
+                f"SELECT hash FROM objects WHERE hash IN ({','.join('?' * len(batch))})", batch
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def ingest_file(self, path: Path) -> Optional[Dict[str, int]]:
+        parts = split_snapshot_name(path)
+        if not parts:
+            return None
+        name, date = parts
+        return self.put(date, name, load_snapshot(path))
+
+    # --- reading ---
+
+    def dates(self, name: Optional[str] = None) -> List[str]:
+        query = "SELECT DISTINCT date FROM manifests"
+        params: Tuple = ()
+        if name:
+            query += " WHERE name GLOB ?"
+            params = (name,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(query + " ORDER BY date", params)]
+
+    def manifests(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._conn.execute("SELECT date, name FROM manifests ORDER BY date, name"))
+
+    def find(self, date: str, name: str) -> Optional[Tuple[str, str]]:
+        """(date, name) of the newest snapshot on or before date; name may be a glob like live_gw*"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT date, name FROM manifests WHERE date <= ? AND name GLOB ?"
+                " ORDER BY date DESC, name DESC LIMIT 1", (date, name)
+            ).fetchone()
+
+    def _objects(self, digests: List[str]) -> Dict[str, Tuple[bytes, bytes]]:
+        objects = {}
+        with self._lock:
+            for i in range(0, len(digests), _BATCH):
+                batch = digests[i:i + _BATCH]
+                rows = self._conn.execute(
+                    f"SELECT hash, codec, data FROM objects WHERE hash IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for digest, codec, data in rows:
+                    objects[digest] = (codec, zlib.decompress(data))
+        return objects
+
+    @staticmethod
+    def _chunk_hashes(node: Dict, found: Set[str]):
+        if 'c' in node:
+            found.add(node['c'])
+        elif 'd' in node:
+            for _, child in node['d']:
+                SnapshotStore._chunk_hashes(child, found)
+        elif 'l' in node:
+            for child in node['l']:
+                SnapshotStore._chunk_hashes(child, found)
+
+    @staticmethod
+    def _build(node: Dict, objects: Dict[str, Tuple[bytes, bytes]], decoders: Dict) -> Any:
+        if 'c' in node:
+            # Decoded per reference: a chunk used twice never becomes one shared object
+            codec, payload = objects[node['c']]
+            if codec not in decoders:
+                decoders[codec] = get_decoder(codec)
+            return decoders[codec](payload)
+        if 'd' in node:
+            return {key: SnapshotStore._build(child, objects, decoders) for key, child in node['d']}
+        if 'l' in node:
+            return [SnapshotStore._build(child, objects, decoders) for child in node['l']]
+        return node['v']
+
+    def get(self, date: str, name: str) -> Dict:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tree FROM manifests WHERE date = ? AND name = ?", (date, name)
+            ).fetchone()
+        if not row:
+            raise FileNotFoundError(f"No {name} snapshot for {date} in {self.path}")
+        # Same allocation-only decoding as snapshot_io.read_snapshot - skip the GC scans
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            tree = json.loads(row[0])
+            digests: Set[str] = set()
+            self._chunk_hashes(tree, digests)
+            return self._build(tree, self._objects(list(digests)), {})
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def as_of(self, date: str, name: str) -> Dict:
+        """The snapshot as it was on `date` (the newest one taken on or before it)"""
+        found = self.find(date, name)
+        if not found:
+            raise FileNotFoundError(f"No {name} snapshot on or before {date} in {self.path}")
+        return self.get(*found)
+
+    # --- maintenance ---
+
+    def prune(self, before: str) -> Dict[str, int]:
+        """Drop manifests older than `before` and every chunk no manifest references anymore"""
+        with self._lock, self._conn:
+            dropped = self._conn.execute("DELETE FROM manifests WHERE date < ?", (before,)).rowcount
+            referenced: Set[str] = set()
+            for (tree,) in self._conn.execute("SELECT tree FROM manifests"):
+                self._chunk_hashes(json.loads(tree), referenced)
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS live_hashes (hash TEXT PRIMARY KEY)")
+            self._conn.execute("DELETE FROM live_hashes")
+            self._conn.executemany("INSERT INTO live_hashes VALUES (?)", ((h,) for h in referenced))
+            removed = self._conn.execute(
+                "DELETE FROM objects WHERE hash NOT IN (SELECT hash FROM live_hashes)"
+            ).rowcount
+        with self._lock:
+            self._conn.execute("VACUUM")
+        return {'manifests': dropped, 'objects': removed}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            objects, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM objects"
+            ).fetchone()
+            manifests = self._conn.execute("SELECT COUNT(*) FROM manifests").fetchone()[0]
+        return {'manifests': manifests, 'objects': objects, 'object_bytes': size,
+                'file_bytes': self.path.stat().st_size}
+
+
+def ingest_directory(data_dir: str = "fpl_data", remove_old: bool = False) -> Dict[str, int]:
+    """Store every flat snapshot in data_dir.
+
+    remove_old deletes the stored flat files except the newest of each kind, which the
+    analysis scripts keep loading directly.
+    """
+    data_dir = Path(data_dir)
+    store = SnapshotStore(str(data_dir))
+    files = sorted(
+        {path for pattern in SNAPSHOT_PATTERNS
+         for suffix in (".json", SUFFIX)
+         for path in data_dir.glob(f"{pattern}{suffix}")},
+        key=lambda p: p.stat().st_mtime
+    )
+    keep = {
+        latest_snapshot(data_dir, f"{name}_*")
+        for name in {parts[0] for parts in map(split_snapshot_name, files) if parts}
+    }
+
+    totals = {'files': 0, 'chunks': 0, 'new_chunks': 0, 'removed': 0}
+    for path in files:
+        result = store.ingest_file(path)
+        if result is None:
+            continue
+        totals['files'] += 1
+        totals['chunks'] += result['chunks']
+        totals['new_chunks'] += result['new_chunks']
+        if remove_old and path not in keep:
+            path.unlink()
+            totals['removed'] += 1
+    return totals
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deduplicated FPL snapshot history")
+    parser.add_argument("--data-dir", default="fpl_data")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ingest = subparsers.add_parser("ingest", help="Store the flat snapshots of a data directory")
+    ingest.add_argument("--remove-old", action="store_true",
+                        help="Delete stored flat files, keeping the newest of each kind")
+    subparsers.add_parser("list", help="List stored snapshots")
+    export = subparsers.add_parser("export", help="Write the snapshot as of a date to a file")
+    export.add_argument("date", help="YYYY-MM-DD")
+    export.add_argument("name", help="Snapshot name or glob, e.g. managers_detailed, live_gw*")
+    export.add_argument("--format", choices=["fpls", "json"], default="fpls")
+    export.add_argument("--out-dir", default=".")
+    prune = subparsers.add_parser("prune", help="Forget snapshots taken before a date")
+    prune.add_argument("--before", required=True, help="YYYY-MM-DD")
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        totals = ingest_directory(args.data_dir, remove_old=args.remove_old)
+        print(f"✓ Stored {totals['files']} snapshots: {totals['new_chunks']} new of "
+              f"{totals['chunks']} chunks, {totals['removed']} flat files removed")
+        args.command = "stats"
+    store = SnapshotStore(args.data_dir)
+
+    if args.command == "list":
+        for date, name in store.manifests():
+            print(f"{date}  {name}")
+    elif args.command == "export":
+        found = store.find(args.date, args.name)
+        if not found:
+            raise SystemExit(f"No {args.name} snapshot on or before {args.date}")
+        date, name = found
+        path = save_snapshot(Path(args.out_dir) / f"{name}_{date}", store.get(date, name), args.format)
+        print(f"✓ Exported {name} as of {args.date} ({date}) to {path}")
+    elif args.command == "prune":
+        result = store.prune(args.before)
+        print(f"✓ Pruned {result['manifests']} manifests and {result['objects']} unreferenced chunks")
+
+    stats = store.stats()
+    print(f"Store: {stats['manifests']} snapshots, {stats['objects']} unique chunks, "
+          f"{stats['file_bytes'] / 1024 / 1024:.1f}MB on disk")
+
+
+if __name__ == "__main__":
+    main()
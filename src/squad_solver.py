@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+FPL Squad Solver
+Wildcard / Free Hit: the best 15-man squad from scratch -
+- budget (default £100.0m), 2/5/5/3 position quotas, at most 3 players per club
+- objective: projected points of the best starting XI (1 GK, 3-5 DEF, 2-5 MID, 1-3 FWD)
+  plus the bench at a discount (BENCH_WEIGHT per bench point)
+
+Two solvers:
+- scipy available: an exact MILP (scipy.optimize.milp / HiGHS)
+- otherwise: the club limits are relaxed with Lagrange multipliers and the rest -
+  budget, quotas and formation - is solved exactly by a knapsack DP per position
+  combined over the budget. Its value is an upper bound on the optimum; subgradient
+  steps tighten it while every DP squad is repaired to a valid one and improved by
+  local search. The result reports the remaining gap to the bound.
+
+Projections default to points_per_game of available players; pass any per-player
+projection (e.g. expected points over the next gameweeks) instead.
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from player_table import PlayerTable
+
+try:
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import lil_matrix
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+BENCH_WEIGHT = 0.1
+MAX_PER_CLUB = 3
+SQUAD_QUOTAS = {1: 2, 2: 5, 3: 5, 4: 3}
+XI_LIMITS = {1: (1, 1), 2: (3, 5), 3: (2, 5), 4: (1, 3)}
+POSITIONS = {1: 'GKP', 2: 'DEF', 3: 'MID', 4: 'FWD'}
+
+
+def formations() -> List[Dict[int, int]]:
+    """Valid starting XI shapes: position -> players starting"""
+    shapes = []
+    for defenders in range(XI_LIMITS[2][0], XI_LIMITS[2][1] + 1):
+        for midfielders in range(XI_LIMITS[3][0], XI_LIMITS[3][1] + 1):
+            forwards = 10 - defenders - midfielders
+            if XI_LIMITS[4][0] <= forwards <= XI_LIMITS[4][1]:
+                shapes.append({1: 1, 2: defenders, 3: midfielders, 4: forwards})
+    return shapes
+
+
+@dataclass
+class SquadSolution:
+    """Player ids of the squad / XI / bench, cost in tenths, objective and its upper bound"""
+    squad: List[int] = field(default_factory=list)
+    starting: List[int] = field(default_factory=list)
+    bench: List[int] = field(default_factory=list)
+    cost: int = 0
+    objective: float = 0.0
+    bound: float = 0.0
+    method: str = ""
+    seconds: float = 0.0
+
+    @property
+    def gap(self) -> float:
+        """Relative distance to the optimum's upper bound (0 = proven optimal)"""
+        if self.bound <= 0:
+            return 0.0
+        return max(0.0, (self.bound - self.objective) / self.bound)
+
+
+def _maxplus(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """out[c] = max over x of a[x] + b[c - x], with the x that achieves it"""
+    out = np.full(len(a), -np.inf)
+    arg = np.full(len(a), -1, dtype=np.int64)
+    for x in np.flatnonzero(np.isfinite(a)).tolist():
+        candidate = a[x] + b[:len(a) - x]
+        segment = out[x:]
+        better = candidate > segment
+        segment[better] = candidate[better]
+        arg[x:][better] = x
+    return out, arg
+
+
+class SquadSolver:
+    def __init__(self, table: PlayerTable, projections: Optional[np.ndarray] = None,
+                 bench_weight: float = BENCH_WEIGHT, available_only: bool = True):
+        self.table = table
+        available = table['status'] == 'a' if available_only else np.ones(len(table), dtype=bool)
+        if projections is None:
+            projections = table['points_per_game']
+        self.points = np.where(available, projections, 0.0).astype(np.float64)
+        self.bench_weight = bench_weight
+        self.eligible = np.flatnonzero(available)
+        self.positions = table['element_type'].astype(np.int64)
+        self.costs = table['now_cost'].astype(np.int64)
+        self.clubs = table['team'].astype(np.int64)
+
+    # --- evaluation ---
+
+    def lineup(self, rows: List[int]) -> Tuple[float, List[int], List[int]]:
+        """Objective of a squad with its best XI: (value, XI rows, bench rows)"""
+        by_position = {position: [] for position in SQUAD_QUOTAS}
+        for row in rows:
+            by_position[int(self.positions[row])].append(row)
+        for position_rows in by_position.values():
+            position_rows.sort(key=lambda row: (-self.points[row], row))
+
+        starting = []
+        rest = []
+        for position, (minimum, maximum) in XI_LIMITS.items():
+            starting += by_position[position][:minimum]
+            rest += [(row, position) for row in by_position[position][minimum:maximum]]
+        rest.sort(key=lambda item: (-self.points[item[0]], item[0]))
+        starting += [row for row, _ in rest[:11 - len(starting)]]
+
+        chosen = set(starting)
+        bench = [row for row in rows if row not in chosen]
+        value = float(self.points[starting].sum() + self.bench_weight * self.points[bench].sum())
+        return value, starting, bench
+
+    def _valid(self, rows: List[int], budget: int) -> bool:
+        clubs = Counter(self.clubs[rows].tolist())
+        return self.costs[rows].sum() <= budget and max(clubs.values()) <= MAX_PER_CLUB
+
+    def _solution(self, rows: List[int], bound: float, method: str, started: float) -> SquadSolution:
+        value, starting, bench = self.lineup(rows)
+        order = lambda group: sorted(group, key=lambda row: (self.positions[row], -self.points[row], row))
+        return SquadSolution(
+            squad=self.table.ids(np.array(order(rows), dtype=np.int64)),
+            starting=self.table.ids(np.array(order(starting), dtype=np.int64)),
+            bench=self.table.ids(np.array(order(bench), dtype=np.int64)),
+            cost=int(self.costs[rows].sum()),
+            objective=value,
+            bound=max(bound, value),
+            method=method,
+            seconds=time.perf_counter() - started,
+        )
+
+    # --- solvers ---
+
+    def solve(self, budget: int = 1000, method: Optional[str] = None, **options) -> SquadSolution:
+        """Best squad for a budget in tenths; method 'milp' or 'lagrangian' (default: milp if scipy)"""
+        method = method or ('milp' if SCIPY_AVAILABLE else 'lagrangian')
+        if method == 'milp':
+            if not SCIPY_AVAILABLE:
+                raise ImportError("scipy is required for the MILP solver: pip install scipy")
+            return self.solve_milp(budget, **options)
+        return self.solve_lagrangian(budget, **options)
+
+    def solve_milp(self, budget: int = 1000, time_limit: float = 30.0) -> SquadSolution:
+        started = time.perf_counter()
+        rows = self.eligible
+        n = len(rows)
+        points = self.points[rows]
+        # x: in the squad, y: in the starting XI
+        objective = -np.concatenate([self.bench_weight * points, (1 - self.bench_weight) * points])
+
+        club_ids = sorted(set(self.clubs[rows].tolist()))
+        constraints = lil_matrix((2 * len(SQUAD_QUOTAS) + 2 + len(club_ids) + n, 2 * n))
+        lower, upper = [], []
+        line = 0
+        for position, quota in SQUAD_QUOTAS.items():
+            members = np.flatnonzero(self.positions[rows] == position)
+            constraints[line, members] = 1
+            lower.append(quota)
+            upper.append(quota)
+            constraints[line + 1, n + members] = 1
+            lower.append(XI_LIMITS[position][0])
+            upper.append(XI_LIMITS[position][1])
+            line += 2
+        constraints[line, n:] = 1
+        lower.append(11)
+        upper.append(11)
+        constraints[line + 1, :n] = self.costs[rows]
+        lower.append(0)
+        upper.append(budget)
+        line += 2
+        for club in club_ids:
+            constraints[line, np.flatnonzero(self.clubs[rows] == club)] = 1
+            lower.append(0)
+            upper.append(MAX_PER_CLUB)
+            line += 1
+        for i in range(n):
+            constraints[line + i, i] = -1
+            constraints[line + i, n + i] = 1
+        lower += [-1] * n
+        upper += [0] * n
+
+        result = milp(
+            objective,
+            constraints=LinearConstraint(constraints.tocsr(), lower, upper),
+            integrality=np.ones(2 * n),
+            bounds=Bounds(0, 1),
+            options={'time_limit': time_limit},
+        )
+        if result.x is None:
+            raise ValueError(f"No valid squad within £{budget / 10:.1f}m: {result.message}")
+        chosen = rows[np.flatnonzero(result.x[:n] > 0.5)].tolist()
+        bound = -getattr(result, 'mip_dual_bound', result.fun)
+        return self._solution(chosen, bound, 'milp', started)
+
+    def _position_table(self, rows: np.ndarray, penalty: np.ndarray, starters: int,
+                        budget: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Knapsack DP of one position: best[c] = top value of its quota at cost exactly c,
+        its first `starters` players (by projection) in the XI. Returns (best, rows, takes)"""
+        quota = SQUAD_QUOTAS[int(self.positions[rows[0]])]
+        points = self.points[rows]
+        costs = self.costs[rows]
+        # A player beaten by `quota` others (cheaper or equal, more points, no bigger penalty)
+        # is never needed - one of them is always free to take its place
+        dominated = ((costs[None, :] <= costs[:, None]) & (points[None, :] >= points[:, None])
+                     & (penalty[None, :] <= penalty[:, None]))
+        np.fill_diagonal(dominated, False)
+        ties = ((costs[None, :] == costs[:, None]) & (points[None, :] == points[:, None])
+                & (penalty[None, :] == penalty[:, None]))
+        dominated &= ~ties | (np.arange(len(rows))[None, :] < np.arange(len(rows))[:, None])
+        keep = dominated.sum(axis=1) < quota
+        rows, points, costs, penalty = rows[keep], points[keep], costs[keep], penalty[keep]
+        order = np.lexsort((rows, -points))
+        rows, points, costs, penalty = rows[order], points[order], costs[order], penalty[order]
+
+        best = np.full((quota + 1, budget + 1), -np.inf)
+        best[0, 0] = 0.0
+        takes = np.zeros((len(rows), quota, budget + 1), dtype=bool)
+        for t in range(len(rows)):
+            cost = int(costs[t])
+            if cost > budget:
+                continue
+            for j in range(min(t, quota - 1), -1, -1):
+                value = (points[t] if j < starters else self.bench_weight * points[t]) - penalty[t]
+                candidate = best[j, :budget + 1 - cost] + value
+                current = best[j + 1, cost:]
+                better = candidate > current
+                current[better] = candidate[better]
+                takes[t, j, cost:] |= better
+        return best[quota], rows, takes
+
+    @staticmethod
+    def _backtrack(rows: np.ndarray, takes: np.ndarray, costs: np.ndarray, cost: int) -> List[int]:
+        chosen = []
+        j = takes.shape[1]
+        for t in range(len(rows) - 1, -1, -1):
+            if j and takes[t, j - 1, cost]:
+                chosen.append(int(rows[t]))
+                cost -= int(costs[rows[t]])
+                j -= 1
+        return chosen
+
+    def _relaxed(self, budget: int, multipliers: Dict[int, float]) -> Tuple[float, List[int]]:
+        """Optimum without club limits, each player's value reduced by its club's multiplier"""
+        penalty_of = np.vectorize(lambda club: multipliers.get(club, 0.0), otypes=[float])
+        tables = {}
+        for position in SQUAD_QUOTAS:
+            rows = self.eligible[self.positions[self.eligible] == position]
+            penalty = penalty_of(self.clubs[rows]) if len(rows) else np.zeros(0)
+            lo, hi = XI_LIMITS[position]
+            for starters in range(lo, hi + 1):
+                tables[position, starters] = self._position_table(rows, penalty, starters, budget)
+
+        best_value, best_rows = -np.inf, []
+        for shape in formations():
+            goalkeepers, defenders, midfielders, forwards = (tables[p, shape[p]] for p in (1, 2, 3, 4))
+            gf, gf_arg = _maxplus(goalkeepers[0], forwards[0])
+            gfm, gfm_arg = _maxplus(gf, midfielders[0])
+            # defenders: best total within the budget, no full convolution needed
+            prefix = np.maximum.accumulate(defenders[0])
+            prefix_arg = np.maximum.accumulate(
+                np.where(defenders[0] == prefix, np.arange(len(prefix)), 0))
+            totals = gfm + prefix[::-1]
+            c = int(np.argmax(totals))
+            if not np.isfinite(totals[c]) or totals[c] <= best_value:
+                continue
+            best_value = float(totals[c])
+            def_cost = int(prefix_arg[budget - c])
+            gf_cost = int(gfm_arg[c])
+            gk_cost = int(gf_arg[gf_cost])
+            best_rows = (self._backtrack(goalkeepers[1], goalkeepers[2], self.costs, gk_cost)
+                         + self._backtrack(forwards[1], forwards[2], self.costs, gf_cost - gk_cost)
+                         + self._backtrack(midfielders[1], midfielders[2], self.costs, c - gf_cost)
+                         + self._backtrack(defenders[1], defenders[2], self.costs, def_cost))
+        return best_value, best_rows
+
+    def _repair(self, rows: List[int], budget: int) -> Optional[List[int]]:
+        """Cheapest-loss swaps until no club has more than 3 players"""
+        rows = list(rows)
+        while True:
+            clubs = Counter(self.clubs[rows].tolist())
+            over = {club for club, count in clubs.items() if count > MAX_PER_CLUB}
+            if not over:
+                return rows
+            spare = budget - int(self.costs[rows].sum())
+            squad = set(rows)
+            best = None
+            for i, out in enumerate(rows):
+                if self.clubs[out] not in over:
+                    continue
+                for row in self.eligible[self.positions[self.eligible] == self.positions[out]].tolist():
+                    if (row in squad or clubs[int(self.clubs[row])] >= MAX_PER_CLUB
+                            or self.costs[row] - self.costs[out] > spare):
+                        continue
+                    loss = self.points[out] - self.points[row]
+                    if best is None or loss < best[0]:
+                        best = (loss, i, row)
+            if best is None:
+                return None
+            rows[best[1]] = best[2]
+
+    def _improve(self, rows: List[int], budget: int) -> List[int]:
+        """Best-improvement single swaps (same position, valid budget and clubs)"""
+        rows = list(rows)
+        value = self.lineup(rows)[0]
+        while True:
+            clubs = Counter(self.clubs[rows].tolist())
+            spare = budget - int(self.costs[rows].sum())
+            squad = set(rows)
+            best = None
+            for i, out in enumerate(rows):
+                candidates = self.eligible[(self.positions[self.eligible] == self.positions[out])
+                                           & (self.points[self.eligible] > self.points[out])
+                                           & (self.costs[self.eligible] - self.costs[out] <= spare)]
+                for row in candidates.tolist():
+                    if row in squad:
+                        continue
+                    club = int(self.clubs[row])
+                    if club != self.clubs[out] and clubs[club] >= MAX_PER_CLUB:
+                        continue
+                    trial = rows[:i] + [row] + rows[i + 1:]
+                    trial_value = self.lineup(trial)[0]
+                    if trial_value > value + 1e-12 and (best is None or trial_value > best[0]):
+                        best = (trial_value, trial)
+            if best is None:
+                return rows
+            value, rows = best
+
+    def solve_lagrangian(self, budget: int = 1000, iterations: int = 30) -> SquadSolution:
+        started = time.perf_counter()
+        multipliers: Dict[int, float] = {}
+        bound = np.inf
+        incumbent, incumbent_value = None, -np.inf
+        step_scale = 2.0
+        stalled = 0
+
+        for _ in range(iterations):
+            relaxed_value, rows = self._relaxed(budget, multipliers)
+            if not rows:
+                break
+            dual = relaxed_value + MAX_PER_CLUB * sum(multipliers.values())
+            if dual < bound - 1e-9:
+                bound, stalled = dual, 0
+            else:
+                stalled += 1
+                if stalled >= 3:
+                    step_scale, stalled = step_scale / 2, 0
+
+            valid = rows if self._valid(rows, budget) else self._repair(rows, budget)
+            if valid:
+                valid = self._improve(valid, budget)
+                value = self.lineup(valid)[0]
+                if value > incumbent_value:
+                    incumbent, incumbent_value = valid, value
+
+            counts = Counter(self.clubs[rows].tolist())
+            # Subgradient of the dual: players over the limit per club (kept >= 0)
+            gradient = {club: counts.get(club, 0) - MAX_PER_CLUB for club in set(counts) | set(multipliers)}
+            active = {club: g for club, g in gradient.items() if g > 0 or multipliers.get(club, 0) > 0}
+            norm = sum(g * g for g in active.values())
+            if bound - incumbent_value <= 1e-9 or norm == 0:
+                break
+            step = step_scale * (bound - incumbent_value) / norm
+            for club, g in active.items():
+                updated = max(0.0, multipliers.get(club, 0.0) + step * g)
+                if updated:
+                    multipliers[club] = updated
+                else:
+                    multipliers.pop(club, None)
+
+        if incumbent is None:
+            raise ValueError(f"No valid squad within £{budget / 10:.1f}m")
+        return self._solution(incumbent, bound, 'lagrangian', started)
+
+
+def main():
+    import argparse
+    from fpl_store import FPLDataStore
+
+    parser = argparse.ArgumentParser(description="Best Wildcard / Free Hit squad from scratch")
+    parser.add_argument("--data-dir", default="fpl_data")
+    parser.add_argument("--budget", type=float, default=100.0, help="Budget in £m")
+    parser.add_argument("--bench-weight", type=float, default=BENCH_WEIGHT)
+    parser.add_argument("--method", choices=['milp', 'lagrangian'])
+    args = parser.parse_args()
+
+    try:
+        store = FPLDataStore(args.data_dir)
+        table = store.player_table()
+        players_map = store.players_by_id()
+        teams_map = store.teams_by_id()
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        print("\nPlease run fpl_data_collector.py first!")
+        return
+
+    solver = SquadSolver(table, bench_weight=args.bench_weight)
+    solution = solver.solve(round(args.budget * 10), args.method)
+
+    print("\n" + "=" * 80)
+    print(f"🃏 WILDCARD SQUAD - £{solution.cost / 10:.1f}m of £{args.budget:.1f}m")
+    print("=" * 80)
+    for title, ids in (("⭐ Starting XI", solution.starting), ("🪑 Bench", solution.bench)):
+        print(f"\n{title}")
+        print("-" * 80)
+        for player_id in ids:
+            player = players_map[player_id]
+            print(f"   {POSITIONS[player['element_type']]:<4} {player['web_name']:<22} "
+                  f"{teams_map.get(player['team'], {}).get('short_name', '???'):<5} "
+                  f"{'£%.1fm' % (player['now_cost'] / 10):<7} {solver.points[table.row(player_id)]:>5.1f} pts")
+    print(f"\n📈 Projected: {solution.objective:.1f} (XI + {solver.bench_weight:g} × bench)")
+    print(f"🎯 Upper bound: {solution.bound:.1f} - gap {solution.gap:.2%} "
+          f"({solution.method}, {solution.seconds:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
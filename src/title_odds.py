@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+FPL Title Odds
+מה הסיכוי שלי לזכות בליגה? - Monte Carlo של שאר העונה
+
+Each simulated season adds to every manager's current total:
+- a shared part from player point distributions: each player's remaining points are
+  drawn once per season (mean = xP per gameweek from projections.py, variance =
+  PLAYER_DISPERSION * mean per gameweek) and credited to every manager whose starting
+  XI holds him (the captain twice) - managers with the same players move together
+- a manager-specific part, so the total per-gameweek variance matches the manager's
+  own history.current variance (shrunk toward the league average early in the season)
+
+The expected points per gameweek blend the current squad's projection with the
+manager's history (transfers and chips keep changing the squad).
+
+Seasons run in batches of BATCH, each with its own SeedSequence child of the seed -
+the result depends on the seed only, not on the number of worker processes.
+"""
+
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fpl_store import FPLDataStore
+
+BATCH = 10_000              # seasons per task
+CHUNK = 2_000               # seasons per matrix product inside a task
+PLAYER_DISPERSION = 3.0     # variance / mean of a player's gameweek points (hauls are lumpy)
+SQUAD_WEIGHT = 0.5          # expected gameweek points: squad projection vs own history
+PRIOR_GAMEWEEKS = 5         # weight of the league average in each manager's history stats
+PROJECTION_HORIZON = 6      # gameweeks of fixtures behind the per-player xP
+DEFAULT_SEED = 2024
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval of a binomial proportion (95% by default)"""
+    if trials == 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+@dataclass
+class SeasonModel:
+    """Everything a worker needs - M managers, P players owned by at least one of them"""
+    current: np.ndarray         # (M,) points so far
+    mean: np.ndarray            # (M,) expected remaining points
+    weights: np.ndarray         # (P, M) starting-XI multiplier of each player per manager
+    player_std: np.ndarray      # (P,) std of each player's remaining points
+    residual_std: np.ndarray    # (M,) std of each manager's own remaining points
+
+
+def simulate_batch(model: SeasonModel, seasons: int, seed: np.random.SeedSequence) -> np.ndarray:
+    """(3, M) counts of title wins, top-3 finishes and last places over `seasons` seasons"""
+    rng = np.random.default_rng(seed)
+    managers = len(model.current)
+    podium = min(3, managers)
+    counts = np.zeros((3, managers), dtype=np.int64)
+    base = model.current + model.mean
+    for start in range(0, seasons, CHUNK):
+        n = min(CHUNK, seasons - start)
+        shared = (rng.standard_normal((n, len(model.player_std))) * model.player_std) @ model.weights
+        totals = base + shared + rng.standard_normal((n, managers)) * model.residual_std
+        counts[0] += np.bincount(totals.argmax(axis=1), minlength=managers)
+        top = np.argpartition(totals, managers - podium, axis=1)[:, managers - podium:]
+        counts[1] += np.bincount(top.ravel(), minlength=managers)
+        counts[2] += np.bincount(totals.argmin(axis=1), minlength=managers)
+    return counts
+
+
+_worker_model: Optional[SeasonModel] = None
+
+
+def _init_worker(model: SeasonModel):
+    # The model is sent once per process, not once per batch
+    global _worker_model
+    _worker_model = model
+
+
+def _run_batch(seasons: int, seed: np.random.SeedSequence) -> np.ndarray:
+    return simulate_batch(_worker_model, seasons, seed)
+
+
+class TitleOddsSimulator:
+    def __init__(self, data_dir: str = "fpl_data"):
+        self.data_dir = Path(data_dir)
+        self.store = FPLDataStore(data_dir)
+        self.bootstrap_data = self.store.bootstrap()
+        self.managers_data = self.store.managers()
+        self.players = self.store.player_table()
+
+        events = self.bootstrap_data.get('events', [])
+        current_gw = next((e['id'] for e in events if e.get('is_current')), 0)
+        self.remaining_gameweeks = max(0, len(events) - current_gw)
+
+        self.manager_ids = list(self.managers_data)
+        self.model = self._build_model()
+
+    def _player_means(self) -> np.ndarray:
+        """Expected points per gameweek of every player"""
+        if self.remaining_gameweeks == 0:
+            return np.zeros(len(self.players))
+        try:
+            projections = self.store.projections(min(PROJECTION_HORIZON, self.remaining_gameweeks))
+            return projections.total() / projections.horizon
+        except FileNotFoundError:
+            # אין fixtures - PPG בלבד
+            out = np.isin(self.players['status'], ['u', 'n'])
+            return np.where(out, 0.0, self.players['points_per_game'])
+
+    def _build_model(self) -> SeasonModel:
+        managers = len(self.manager_ids)
+        remaining = self.remaining_gameweeks
+        weights = np.zeros((len(self.players), managers))
+        current = np.zeros(managers)
+        history_stats = np.zeros((managers, 3))  # gameweeks, mean, variance of net points
+
+        for column, manager_id in enumerate(self.manager_ids):
+            data = self.managers_data[manager_id]
+            starting = [p for p in data['current_picks']['picks'] if p['position'] <= 11]
+            rows = self.players.rows_of(p['element'] for p in starting)
+            for pick, row in zip(starting, rows.tolist()):
+                if row >= 0:
+                    weights[row, column] += 2 if pick['is_captain'] else 1
+
+            history = data['history']['current']
+            points = np.array([gw['points'] - gw.get('event_transfers_cost', 0) for gw in history], dtype=float)
+            current[column] = history[-1]['total_points'] if history else 0
+            if len(points):
+                history_stats[column] = len(points), points.mean(), points.var(ddof=1) if len(points) > 1 else 0.0
+
+        # History shrunk toward the league average - a few gameweeks say little
+        gameweeks, means, variances = history_stats.T
+        played = gameweeks > 0
+        league_mean = means[played].mean() if played.any() else 0.0
+        league_variance = variances[gameweeks > 1].mean() if (gameweeks > 1).any() else 0.0
+        k = PRIOR_GAMEWEEKS
+        history_mean = (gameweeks * means + k * league_mean) / (gameweeks + k)
+        degrees = np.maximum(gameweeks - 1, 0)
+        history_variance = (degrees * variances + k * league_variance) / (degrees + k)
+
+        player_mean = np.clip(self._player_means(), 0.0, None)
+        squad_mean = player_mean @ weights
+        mean_per_gw = SQUAD_WEIGHT * squad_mean + (1 - SQUAD_WEIGHT) * history_mean
+
+        # Players' variance is shared between owners; the rest of each manager's variance is their own
+        shared_variance = (PLAYER_DISPERSION * player_mean) @ (weights ** 2)
+        residual_variance = np.maximum(history_variance - shared_variance, 0.0)
+
+        owned = np.flatnonzero(weights.any(axis=1))
+        return SeasonModel(
+            current=current,
+            mean=remaining * mean_per_gw,
+            weights=weights[owned],
+            player_std=np.sqrt(remaining * PLAYER_DISPERSION * player_mean[owned]),
+            residual_std=np.sqrt(remaining * residual_variance),
+        )
+
+    def simulate(self, seasons: int = 100_000, workers: Optional[int] = None,
+                 seed: int = DEFAULT_SEED) -> List[Dict]:
+        """Title / top-3 / last-place probabilities with 95% Wilson intervals, best title odds first"""
+        if workers is None:
+            workers = os.cpu_count() or 1
+        batches = [min(BATCH, seasons - start) for start in range(0, seasons, BATCH)]
+        seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+        counts = np.zeros((3, len(self.manager_ids)), dtype=np.int64)
+        if workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(batches)), initializer=_init_worker,
+                                     initargs=(self.model,)) as executor:
+                for batch_counts in executor.map(_run_batch, batches, seeds):
+                    counts += batch_counts
+        else:
+            for batch, batch_seed in zip(batches, seeds):
+                counts += simulate_batch(self.model, batch, batch_seed)
+
+        results = []
+        for column, manager_id in enumerate(self.manager_ids):
+            info = self.managers_data[manager_id]['manager_info']
+            title, top3, last = counts[:, column].tolist()
+            results.append({
+                'id': manager_id,
+                'name': info.get('player_name', str(manager_id)),
+                'team': info.get('team_name', ''),
+                'points': int(self.model.current[column]),
+                'expected_points': float(self.model.current[column] + self.model.mean[column]),
+                'title': title / seasons,
+                'title_ci': wilson_interval(title, seasons),
+                'top3': top3 / seasons,
+                'top3_ci': wilson_interval(top3, seasons),
+                'last': last / seasons,
+                'last_ci': wilson_interval(last, seasons),
+            })
+        results.sort(key=lambda r: (-r['title'], -r['expected_points']))
+        return results
+
+    def print_report(self, seasons: int = 100_000, workers: Optional[int] = None,
+                     seed: int = DEFAULT_SEED, top: int = 15):
+        """הדפס דוח סיכויי אליפות"""
+        started = time.perf_counter()
+        results = self.simulate(seasons, workers, seed)
+        elapsed = time.perf_counter() - started
+
+        def pct(probability: float, interval: Tuple[float, float]) -> str:
+            return f"{probability:6.1%} [{interval[0]:.1%}-{interval[1]:.1%}]"
+
+        print("\n" + "=" * 100)
+        print("🏆 TITLE ODDS - סיכויי אליפות")
+        print(f"   {seasons:,} simulated seasons, {self.remaining_gameweeks} gameweeks to go, "
+              f"seed {seed} ({elapsed:.1f}s)")
+        print("=" * 100)
+        print(f"{'Manager':<25} {'Pts':>5} {'xFinal':>7}  {'Title (95% CI)':<24} {'Top 3 (95% CI)':<24}")
+        print("-" * 100)
+        for r in results[:top]:
+            print(f"{r['name'][:25]:<25} {r['points']:>5} {r['expected_points']:>7.0f}  "
+                  f"{pct(r['title'], r['title_ci']):<24} {pct(r['top3'], r['top3_ci']):<24}")
+
+        print("\n🥄 LAST PLACE - סכנת המקום האחרון")
+        print("-" * 100)
+        for r in sorted(results, key=lambda r: -r['last'])[:3]:
+            print(f"{r['name'][:25]:<25} {r['points']:>5} {r['expected_points']:>7.0f}  "
+                  f"{pct(r['last'], r['last_ci']):<24}")
+        print("=" * 100 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo league title odds")
+    parser.add_argument("--data-dir", default="fpl_data")
+    parser.add_argument("--seasons", type=int, default=100_000, help="Seasons to simulate")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed - same seed, same odds")
+    parser.add_argument("--top", type=int, default=15, help="Managers to list")
+    args = parser.parse_args()
+
+    try:
+        simulator = TitleOddsSimulator(args.data_dir)
+        simulator.print_report(args.seasons, args.workers, args.seed, args.top)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e}")
+        print("\nPlease run fpl_data_collector.py first!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+FPL Transfer Optimizer
+The best set of 0..N transfers for a squad, not N independent one-for-one swaps:
+- budget: bank + sale value of the players sold (sale value = now_cost - the API does
+  not expose purchase prices, so the 50% sell-on fee is not modelled)
+- position quotas (2/5/5/3): every player out is replaced by one of the same position
+- at most 3 players per club
+- transfers beyond the free ones cost a -4 hit
+
+Scores are the transfer scores (player_table.ScoreWeights); hit_score_cost() converts a
+hit to score units (see HIT_PAYBACK_GAMEWEEKS). Scores can also be passed in directly -
+e.g. projected points over the next gameweeks (projections.Projections.total()), with
+hit_cost=HIT_POINTS.
+
+Exact branch-and-bound: out-sets are tried best upper bound first, and each one's
+replacements are searched over candidates sorted by score, pruning with an optimistic
+bound (best remaining scores, ignoring budget and clubs) and a cheapest-fill budget check.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from live_index import top_indices
+from player_table import PlayerTable, ScoreWeights
+
+HIT_POINTS = 4
+# Form and PPG are points per gameweek, so a score gain is a gain every gameweek while the
+# -4 is paid once: a hit costs its points spread over the gameweeks a transfer has to pay
+# it back in - at the default weights 4 / 4 * (3 + 2) = 5 score units per hit
+HIT_PAYBACK_GAMEWEEKS = 4
+MAX_PER_CLUB = 3
+SQUAD_QUOTAS = {1: 2, 2: 5, 3: 5, 4: 3}
+
+
+def hit_score_cost(weights: ScoreWeights) -> float:
+    """One -4 hit in transfer-score units"""
+    return HIT_POINTS / HIT_PAYBACK_GAMEWEEKS * (weights.form + weights.points_per_game)
+
+
+@dataclass
+class TransferPlan:
+    """Player ids out / in (paired by position), gains in score units, bank in tenths"""
+    outs: List[int] = field(default_factory=list)
+    ins: List[int] = field(default_factory=list)
+    score_gain: float = 0.0
+    hits: int = 0
+    hit_cost: float = 0.0
+    bank_after: int = 0
+
+    @property
+    def gain(self) -> float:
+        return self.score_gain - self.hit_cost
+
+
+class TransferOptimizer:
+    def __init__(self, table: PlayerTable, weights: Optional[ScoreWeights] = None,
+                 hit_cost: Optional[float] = None, available_only: bool = True,
+                 scores: Optional[np.ndarray] = None):
+        weights = weights or ScoreWeights()
+        self.table = table
+        self.scores = scores if scores is not None else table.scores(weights)
+        # score units per -4 hit
+        self.hit_cost = hit_cost if hit_cost is not None else hit_score_cost(weights)
+
+        eligible = table['status'] == 'a' if available_only else np.ones(len(table), dtype=bool)
+        prices = table['now_cost'].tolist()
+        teams = table['team'].tolist()
+        scores = self.scores.tolist()
+        # position -> [(row, score, price, club)] of buyable players, best score first
+        self.candidates: Dict[int, List[Tuple[int, float, int, int]]] = {}
+        self.cheapest: Dict[int, int] = {}
+        for position in SQUAD_QUOTAS:
+            rows = np.flatnonzero(eligible & (table['element_type'] == position))
+            ranked = top_indices(self.scores, len(rows), rows).tolist()
+            self.candidates[position] = [(row, scores[row], prices[row], teams[row]) for row in ranked]
+            self.cheapest[position] = min((prices[row] for row in ranked), default=0)
+
+    def optimize(self, squad_ids: List[int], bank: int, max_transfers: int = 3,
+                 free_transfers: int = 1) -> List[TransferPlan]:
+        """Best plan for each number of transfers 0..max_transfers (bank in tenths)"""
+        rows = [row for row in self.table.rows_of(squad_ids).tolist() if row >= 0]
+        squad = set(rows)
+        positions = self.table['element_type']
+        sellable = sorted(rows, key=lambda row: (positions[row], row))
+
+        plans = [TransferPlan(bank_after=bank)]
+        for count in range(1, max_transfers + 1):
+            hits = max(0, count - free_transfers)
+            plan = self._best_of_size(sellable, squad, bank, count)
+            if plan:
+                plan.hits = hits
+                plan.hit_cost = hits * self.hit_cost
+                plans.append(plan)
+        return plans
+
+    def best(self, squad_ids: List[int], bank: int, max_transfers: int = 3,
+             free_transfers: int = 1) -> TransferPlan:
+        """Highest net gain over 0..N transfers; fewer transfers win ties"""
+        plans = self.optimize(squad_ids, bank, max_transfers, free_transfers)
+        return max(plans, key=lambda plan: (plan.gain, -len(plan.outs)))
+
+    def _optimistic(self, slots: List[int], index: int, start: int) -> float:
+        """Upper bound for filling slots[index:], the first from candidate `start` on"""
+        bound = 0.0
+        for i in range(index, len(slots)):
+            if i > 0 and slots[i] != slots[i - 1]:
+                start = 0
+            candidates = self.candidates[slots[i]]
+            if start >= len(candidates):
+                return float('-inf')
+            bound += candidates[start][1]
+            start += 1
+        return bound
+
+    def _best_of_size(self, sellable: List[int], squad: set, bank: int, count: int) -> Optional[TransferPlan]:
+        scores = self.scores
+        positions = self.table['element_type']
+        prices = self.table['now_cost']
+        teams = self.table['team']
+        squad_clubs = Counter(teams[row].item() for row in squad)
+
+        # Out-sets by their optimistic gain, best first
+        out_sets = []
+        for outs in combinations(sellable, count):
+            slots = sorted(positions[row].item() for row in outs)
+            out_score = sum(scores[row].item() for row in outs)
+            out_sets.append((self._optimistic(slots, 0, 0) - out_score, outs, slots, out_score))
+        out_sets.sort(key=lambda item: -item[0])
+
+        best = {'gain': float('-inf'), 'ins': None, 'outs': None, 'budget': 0}
+        for upper, outs, slots, out_score in out_sets:
+            if upper <= best['gain']:
+                break
+            budget = bank + sum(prices[row].item() for row in outs)
+            clubs = squad_clubs.copy()
+            for row in outs:
+                clubs[teams[row].item()] -= 1
+            cheapest_rest = [sum(self.cheapest[p] for p in slots[i:]) for i in range(len(slots) + 1)]
+            self._search(slots, 0, 0, budget, clubs, [], 0.0, out_score, squad, cheapest_rest, best, outs)
+
+        if best['ins'] is None:
+            return None
+        ins_by_position = sorted(best['ins'], key=lambda row: positions[row])
+        outs = sorted(best['outs'], key=lambda row: positions[row])
+        return TransferPlan(
+            outs=self.table.ids(np.array(outs, dtype=np.int64)),
+            ins=self.table.ids(np.array(ins_by_position, dtype=np.int64)),
+            score_gain=best['gain'],
+            bank_after=best['budget'],
+        )
+
+    def _search(self, slots, index, start, budget, clubs, chosen, in_score, out_score, squad,
+                cheapest_rest, best, outs):
+        if index == len(slots):
+            gain = in_score - out_score
+            if gain > best['gain']:
+                best.update(gain=gain, ins=list(chosen), outs=outs, budget=budget)
+            return
+        position = slots[index]
+        if index == 0 or slots[index - 1] != position:
+            start = 0
+        candidates = self.candidates[position]
+        for i in range(start, len(candidates)):
+            row, score, price, club = candidates[i]
+            # Candidates are sorted by score: once the bound fails, every later one fails too
+            if in_score + score + self._optimistic(slots, index + 1, i + 1) - out_score <= best['gain']:
+                break
+            if row in squad or clubs[club] >= MAX_PER_CLUB:
+                continue
+            if price + cheapest_rest[index + 1] > budget:
+                continue
+            clubs[club] += 1
+            chosen.append(row)
+            self._search(slots, index + 1, i + 1, budget - price, clubs, chosen, in_score + score,
+                         out_score, squad, cheapest_rest, best, outs)
+            chosen.pop()
+            clubs[club] -= 1
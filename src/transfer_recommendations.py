@@ -4,36 +4,47 @@ FPL Transfer Recommendations Engine
 מנוע המלצות להעברות - קבל המלצות קונקרטיות!
 """
 
-import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+from fpl_store import FPLDataStore
+from player_table import ScoreWeights, player_score
+from transfer_optimizer import HIT_PAYBACK_GAMEWEEKS, HIT_POINTS, TransferOptimizer, hit_score_cost
+
 
 class TransferRecommendationEngine:
-    def __init__(self, data_dir: str = "fpl_data"):
+    def __init__(self, data_dir: str = "fpl_data", weights: Optional[ScoreWeights] = None,
+                 horizon: Optional[int] = None):
+        """horizon=N מדרג שחקנים לפי xP ל-N המחזורים הבאים (קושי משחקים, DGW/BGW) במקום ScoreWeights"""
         self.data_dir = Path(data_dir)
-        self.bootstrap_data = self.load_latest_bootstrap_data()
-        self.managers_data = self.load_latest_managers_data()
+        self.weights = weights or ScoreWeights()
+        self.horizon = horizon
+        self.store = FPLDataStore(data_dir)
+        self.bootstrap_data = self.store.bootstrap()
+        self.managers_data = self.store.managers()
         
-        self.players_map = {p['id']: p for p in self.bootstrap_data['elements']}
-        self.teams_map = {t['id']: t['name'] for t in self.bootstrap_data['teams']}
+        self.players_map = self.store.players_by_id()
+        self.teams_map = {team_id: t['name'] for team_id, t in self.store.teams_by_id().items()}
+        self.players = self.store.player_table()
+        self.projections = self.store.projections(horizon) if horizon else None
+        # The fixtures snapshot behind the projections - re-collected fixtures change the xP
+        self.fixtures_signature = self.store.signature('fixtures') if horizon else None
     
-    def load_latest_bootstrap_data(self) -> Dict:
-        bootstrap_files = list(self.data_dir.glob("bootstrap_data_*.json"))
-        if not bootstrap_files:
-            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
-        latest_file = max(bootstrap_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    @property
+    def scores(self):
+        """ציון כל השחקנים במערך אחד - מחושב פעם אחת לכל snapshot ומשקלות (או xP לאופק)"""
+        if self.projections:
+            return self.projections.total()
+        return self.players.scores(self.weights)
     
-    def load_latest_managers_data(self) -> Dict:
-        manager_files = list(self.data_dir.glob("managers_detailed_*.json"))
-        if not manager_files:
-            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
-        latest_file = max(manager_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    @property
+    def score_key(self):
+        """מפתח המטמון של אינדקס התחליפים לשיטת הציון הנוכחית"""
+        if self.projections:
+            return ('xp', self.fixtures_signature, self.projections.start_gw, self.horizon,
+                    self.projections.model)
+        return self.weights
     
     def get_my_team(self, manager_name: str = None) -> Dict:
         """קבל את הקבוצה שלך"""
@@ -47,29 +58,11 @@ class TransferRecommendationEngine:
     
     def calculate_player_score(self, player: Dict) -> float:
         """חשב ציון איכות לשחקן על בסיס סטטיסטיקות"""
-        score = 0.0
-        
-        # Form (משקל גבוה)
-        form = float(player.get('form', 0))
-        score += form * 3
-        
-        # Points per game
-        ppg = float(player.get('points_per_game', 0))
-        score += ppg * 2
-        
-        # ICT Index (Influence, Creativity, Threat)
-        ict = float(player.get('ict_index', 0))
-        score += ict / 10
-        
-        # Selected by % (פופולריות)
-        selected = float(player.get('selected_by_percent', 0))
-        score += selected / 5
-        
-        # Minutes played %
-        minutes = player.get('minutes', 0)
-        score += (minutes / 90) / 10
-        
-        return score
+        # Form, PPG, ICT, פופולריות ודקות - ראה ScoreWeights
+        row = self.players.row(player.get('id', -1))
+        if row >= 0:
+            return self.scores[row].item()
+        return player_score(player, self.weights)
     
     def find_best_replacements(self, player_to_replace: Dict, budget: float, 
                                position: str, exclude_ids: List[int]) -> List[Dict]:
@@ -77,19 +70,15 @@ class TransferRecommendationEngine:
         position_map = {'GKP': 1, 'DEF': 2, 'MID': 3, 'FWD': 4}
         position_id = position_map.get(position, 0)
         
+        # אינדקס עמדה/מחיר: חיפוש בינארי לתקציב ורק 10 המובילים נבנים
+        index = self.players.replacement_index(self.score_key, self.scores)
+        top = index.best(position_id, budget, exclude_ids, k=10)
+        
         candidates = []
-        for player in self.bootstrap_data['elements']:
-            if player['element_type'] != position_id:
-                continue
-            if player['id'] in exclude_ids:
-                continue
-            
+        for row, player_id in zip(top.tolist(), self.players.ids(top)):
+            player = self.players_map[player_id]
             price = player['now_cost'] / 10
-            if price > budget:
-                continue
-            
-            # חשב ציון
-            score = self.calculate_player_score(player)
+            score = self.scores[row].item()
             
             candidates.append({
                 'id': player['id'],
@@ -97,17 +86,15 @@ class TransferRecommendationEngine:
                 'full_name': f"{player['first_name']} {player['second_name']}",
                 'team': self.teams_map.get(player['team'], 'Unknown'),
                 'price': price,
-                'form': float(player.get('form', 0)),
+                'form': self.players['form'][row].item(),
                 'total_points': player['total_points'],
-                'ppg': float(player.get('points_per_game', 0)),
-                'selected_by': float(player.get('selected_by_percent', 0)),
+                'ppg': self.players['points_per_game'][row].item(),
+                'selected_by': self.players['selected_by_percent'][row].item(),
                 'score': score,
                 'status': player.get('status', 'a')  # a=available, i=injured, etc.
             })
         
-        # מיון לפי ציון
-        candidates.sort(key=lambda x: x['score'], reverse=True)
-        return candidates[:10]
+        return candidates
     
     def get_transfer_recommendations(self, manager_name: str = None) -> Dict:
         """קבל המלצות העברות ממוקדות"""
@@ -138,7 +125,7 @@ class TransferRecommendationEngine:
                     'name': player['web_name'],
                     'position': ['GKP', 'DEF', 'MID', 'FWD'][player['element_type'] - 1],
                     'price': player['now_cost'] / 10,
-                    'form': float(player.get('form', 0)),
+                    'form': self.players.get(player['id'], 'form', 0.0),
                     'total_points': player['total_points'],
                     'score': score,
                     'is_starting': pick['position'] <= 11
@@ -170,6 +157,47 @@ class TransferRecommendationEngine:
         
         return recommendations
     
+    def optimize_transfers(self, manager_name: str = None, max_transfers: int = 3,
+                           free_transfers: int = 1) -> Dict:
+        """תוכנית ההעברות הטובה ביותר (0..N) - תקציב משותף, מכסות עמדה, 3 לקבוצה ו-hits"""
+        my_team = self.get_my_team(manager_name)
+        squad_ids = [pick['element'] for pick in my_team['current_picks']['picks']]
+        bank = my_team['history']['current'][-1].get('bank', 0)
+        
+        if self.projections:
+            # ציון ב-xP: hit עולה 4 נקודות
+            optimizer = TransferOptimizer(self.players, hit_cost=HIT_POINTS, scores=self.scores)
+        else:
+            optimizer = TransferOptimizer(self.players, self.weights)
+        plans = optimizer.optimize(squad_ids, bank, max_transfers, free_transfers)
+        best = max(plans, key=lambda plan: (plan.gain, -len(plan.outs)))
+        
+        def describe(player_id: int) -> Dict:
+            player = self.players_map[player_id]
+            return {
+                'id': player_id,
+                'name': player['web_name'],
+                'position': ['GKP', 'DEF', 'MID', 'FWD'][player['element_type'] - 1],
+                'team': self.teams_map.get(player['team'], 'Unknown'),
+                'price': player['now_cost'] / 10,
+                'score': self.calculate_player_score(player),
+            }
+        
+        return {
+            'plans': [
+                {
+                    'transfers': [{'out': describe(o), 'in': describe(i)} for o, i in zip(plan.outs, plan.ins)],
+                    'score_gain': plan.score_gain,
+                    'hits': plan.hits,
+                    'hit_cost': plan.hit_cost,
+                    'gain': plan.gain,
+                    'bank_after': plan.bank_after / 10,
+                }
+                for plan in plans
+            ],
+            'best': plans.index(best),
+        }
+    
     def print_transfer_report(self, manager_name: str = None):
         """הדפס דוח המלצות העברות"""
         print("\n" + "="*80)
@@ -182,7 +210,8 @@ class TransferRecommendationEngine:
         # 1. Underperformers
         print("⚠️  UNDERPERFORMING PLAYERS - שחקנים חלשים בקבוצה שלך")
         print("-" * 80)
-        print(f"{'Player':<20} {'Pos':<6} {'Price':<10} {'Form':<8} {'Points':<8} {'Score':<8}")
+        score_label = f"xP{self.horizon}" if self.projections else 'Score'
+        print(f"{'Player':<20} {'Pos':<6} {'Price':<10} {'Form':<8} {'Points':<8} {score_label:<8}")
         print("-" * 80)
         
         for player in recs['underperformers']:
@@ -215,6 +244,34 @@ class TransferRecommendationEngine:
                 print(f"\n   💰 Price difference: {'+' if price_diff >= 0 else ''}{price_diff:.1f}m")
                 print(f"   📊 Form difference: {'+' if form_diff >= 0 else ''}{form_diff:.1f}")
         
+        # 3. Optimal plan
+        print("\n\n🧮 OPTIMAL TRANSFER PLAN - תוכנית העברות מיטבית")
+        print("=" * 80)
+        
+        optimized = self.optimize_transfers(manager_name)
+        print(f"{'Transfers':<11} {score_label + ' gain':<12} {'Hits':<6} {'Hit cost':<10} "
+              f"{'Net gain':<10} {'Bank after':<10}")
+        print("-" * 80)
+        for i, plan in enumerate(optimized['plans']):
+            marker = " ⭐" if i == optimized['best'] else ""
+            hit_points = -plan['hits'] * HIT_POINTS
+            hit_cost = -plan['hit_cost'] if plan['hits'] else 0.0
+            print(f"{len(plan['transfers']):<11} {plan['score_gain']:<12.1f} {hit_points:<6} "
+                  f"{hit_cost:<10.1f} {plan['gain']:<10.1f} £{plan['bank_after']:.1f}m{marker}")
+        if not self.projections:
+            print(f"   (-{HIT_POINTS} hit = {hit_score_cost(self.weights):.1f} score, "
+                  f"spread over {HIT_PAYBACK_GAMEWEEKS} gameweeks)")
+        
+        best_plan = optimized['plans'][optimized['best']]
+        if best_plan['transfers']:
+            print(f"\n⭐ Best plan:")
+            for transfer in best_plan['transfers']:
+                out_player, in_player = transfer['out'], transfer['in']
+                print(f"   {out_player['name']} ({out_player['position']}, £{out_player['price']}m) ➡️  "
+                      f"{in_player['name']} ({in_player['team']}, £{in_player['price']}m)")
+        else:
+            print(f"\n⭐ Best plan: roll the transfer - no move beats the hit cost")
+        
         print("\n" + "="*80)
         print("💡 TIP: Don't take hits unless the transfer will gain you 8+ points!")
         print("💡 טיפ: אל תקח hits אלא אם ההעברה תרוויח לך 8+ נקודות!")
@@ -225,12 +282,19 @@ def main():
     import sys
     
     try:
-        engine = TransferRecommendationEngine()
+        # --horizon N: דירוג לפי xP ל-N המחזורים הבאים
+        args = sys.argv[1:]
+        horizon = None
+        if '--horizon' in args:
+            i = args.index('--horizon')
+            horizon = int(args[i + 1])
+            args = args[:i] + args[i + 2:]
+        engine = TransferRecommendationEngine(horizon=horizon)
         
         # אם יש שם מנהל בארגומנטים
         manager_name = None
-        if len(sys.argv) > 1:
-            manager_name = " ".join(sys.argv[1:])
+        if args:
+            manager_name = " ".join(args)
             print(f"\n🔍 Searching for manager: {manager_name}")
         
         engine.print_transfer_report(manager_name)
@@ -238,6 +302,7 @@ def main():
         print("\n📝 Usage tip:")
         print("   python transfer_recommendations.py \"Your Name\"")
         print("   python transfer_recommendations.py")
+        print("   python transfer_recommendations.py --horizon 5 \"Your Name\"   # rank by 5-GW expected points")
         
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+FPL Warm Cache
+Binary cache of parsed, pre-indexed snapshots so every script after the first one
+starts warm: FPLDataStore pickles what it built from a snapshot (the data plus its
+players / teams / live points maps) into fpl_data/.cache/, keyed by a digest of
+the snapshot file (FPLDataStore passes the sha256 index.jsonl recorded for it, plus its
+mtime/size), and later processes unpickle it instead of decoding the snapshot.
+
+Only ever load caches the collector/scripts wrote themselves - pickle is not safe
+for files from untrusted sources.
+"""
+
+import gc
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+CACHE_DIR = ".cache"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class WarmCache:
+    def __init__(self, data_dir: str = "fpl_data"):
+        self.root = Path(data_dir) / CACHE_DIR
+
+    def _path(self, source: Path, digest: str) -> Path:
+        return self.root / f"{source.name}.{digest[:16]}.pickle"
+
+    def get(self, source: Path, digest: str) -> Optional[Dict]:
+        """Cached payload for `source` with content hash `digest`, if any"""
+        path = self._path(source, digest)
+        if not path.exists():
+            return None
+        # Unpickling only allocates - skip the GC scans, as snapshot_io does
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ImportError, AttributeError):
+            # Unreadable, or pickled by a version whose classes have since changed
+            return None
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if cached.get('sha256') != digest:
+            return None
+        return cached['payload']
+
+    def put(self, source: Path, digest: str, payload: Dict):
+        """Store the payload for `source`, replacing caches of its older content"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(source, digest)
+        for stale in self.root.glob(f"{source.name}.*.pickle"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp{os.getpid()}")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'sha256': digest, 'payload': payload}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        for path in self.root.glob("*.pickle"):
+            path.unlink(missing_ok=True)
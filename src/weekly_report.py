@@ -10,6 +10,8 @@ from typing import Dict, List, Tuple
 from datetime import datetime
 from collections import defaultdict
 
+from fpl_store import FPLDataStore
+
 
 class WeeklyLeagueReport:
     def __init__(self, data_dir: str = "fpl_data"):
@@ -17,39 +19,16 @@ class WeeklyLeagueReport:
         self.output_dir = self.data_dir / "reports"
         self.output_dir.mkdir(exist_ok=True)
         
-        self.managers_data = self.load_latest_managers_data()
-        self.bootstrap_data = self.load_latest_bootstrap_data()
-        self.live_data = self.load_latest_live_data()
+        self.store = FPLDataStore(data_dir)
+        self.managers_data = self.store.managers()
+        self.bootstrap_data = self.store.bootstrap()
+        self.live = self.store.live_index()
         
         # מפות עזר
-        self.players_map = {p['id']: p for p in self.bootstrap_data['elements']}
-        self.teams_map = {t['id']: t for t in self.bootstrap_data['teams']}
+        self.players_map = self.store.players_by_id()
+        self.teams_map = self.store.teams_by_id()
         self.positions = ['GKP', 'DEF', 'MID', 'FWD']
     
-    def load_latest_managers_data(self) -> Dict:
-        manager_files = list(self.data_dir.glob("managers_detailed_*.json"))
-        if not manager_files:
-            raise FileNotFoundError("לא נמצאו קבצי מנהלים")
-        latest_file = max(manager_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def load_latest_bootstrap_data(self) -> Dict:
-        bootstrap_files = list(self.data_dir.glob("bootstrap_data_*.json"))
-        if not bootstrap_files:
-            raise FileNotFoundError("לא נמצאו קבצי bootstrap")
-        latest_file = max(bootstrap_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
-    def load_latest_live_data(self) -> Dict:
-        live_files = list(self.data_dir.glob("live_gw*.json"))
-        if not live_files:
-            return {'elements': []}
-        latest_file = max(live_files, key=lambda p: p.stat().st_mtime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
     def get_current_gameweek(self) -> int:
         for event in self.bootstrap_data['events']:
             if event['is_current']:
@@ -62,14 +41,7 @@ class WeeklyLeagueReport:
     
     def get_player_gw_points(self, player_id: int) -> int:
         """קבל נקודות של שחקן במחזור הנוכחי"""
-        if not self.live_data or 'elements' not in self.live_data:
-            return 0
-        
-        for element in self.live_data['elements']:
-            if element['id'] == player_id:
-                stats = element.get('stats', {})
-                return stats.get('total_points', 0)
-        return 0
+        return self.live.points(player_id)
     
     def analyze_manager_week(self, manager_id: str, data: Dict, current_gw: int) -> Dict:
         """ניתוח מפורט של השבוע של מנהל"""
@@ -513,28 +485,20 @@ class WeeklyLeagueReport:
         
         # מציאת מובילי הנקודות במחזור הנוכחי
         gw_top_scorers = []
-        if self.live_data and 'elements' in self.live_data:
-            for element in self.live_data['elements']:
-                player = self.players_map.get(element['id'])
-                if player:
-                    gw_top_scorers.append({
-                        'name': player['web_name'],
-                        'team': self.teams_map[player['team']]['short_name'],
-                        'points': element.get('stats', {}).get('total_points', 0),
-                        'ownership': player.get('selected_by_percent', '0')
-                    })
-            gw_top_scorers = sorted(gw_top_scorers, key=lambda x: x['points'], reverse=True)[:10]
+        for player_id, points in self.live.top_n('total_points', 10, where=self.live.mask(self.players_map)):
+            player = self.players_map[player_id]
+            gw_top_scorers.append({
+                'name': player['web_name'],
+                'team': self.teams_map[player['team']]['short_name'],
+                'points': points,
+                'ownership': player.get('selected_by_percent', '0')
+            })
         
         # מידע על Haaland (הקפטן הפופולרי)
         haaland = next((p for p in all_players if 'Haaland' in p.get('second_name', '')), None)
         haaland_info = None
         if haaland:
-            haaland_gw_points = 0
-            if self.live_data and 'elements' in self.live_data:
-                for el in self.live_data['elements']:
-                    if el['id'] == haaland['id']:
-                        haaland_gw_points = el.get('stats', {}).get('total_points', 0)
-                        break
+            haaland_gw_points = self.live.points(haaland['id'])
             haaland_info = {
                 'ownership': haaland.get('selected_by_percent', 'N/A'),
                 'total_points': haaland.get('total_points', 0),
@@ -4,10 +4,11 @@ FPL WhatsApp Weekly Summary
 סיכום שבועי מפורט לקבוצת הוואטסאפ
 """
 
-import json
 from pathlib import Path
 from datetime import datetime
 
+from fpl_store import FPLDataStore
+
 
 class WhatsAppSummary:
     def __init__(self, data_dir: str = "fpl_data"):
@@ -15,12 +16,11 @@ class WhatsAppSummary:
         self.output_dir = self.data_dir / "reports"
         self.output_dir.mkdir(exist_ok=True)
         
-        self.managers_data = self.load_latest_file("managers_detailed_*.json")
-        self.bootstrap_data = self.load_latest_file("bootstrap_data_*.json")
-        self.live_data = self.load_latest_file("live_gw*.json")
-        
-        self.players_map = {p['id']: p for p in self.bootstrap_data['elements']}
-        self.points_map = {e['id']: e['stats']['total_points'] for e in self.live_data.get('elements', [])}
+        self.store = FPLDataStore(data_dir)
+        self.managers_data = self.store.load('managers') or {}
+        self.bootstrap_data = self.store.load('bootstrap') or {}
+        self.players_map = self.store.players_by_id()
+        self.live = self.store.live_index()
         
         # ממוצעים עולמיים לפי מחזור
         self.gw_averages = {}
@@ -28,14 +28,6 @@ class WhatsAppSummary:
             if event.get('average_entry_score'):
                 self.gw_averages[event['id']] = event['average_entry_score']
     
-    def load_latest_file(self, pattern: str) -> dict:
-        files = list(self.data_dir.glob(pattern))
-        if not files:
-            return {}
-        latest = max(files, key=lambda p: p.stat().st_mtime)
-        with open(latest, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    
     def get_current_gw(self) -> int:
         for event in self.bootstrap_data['events']:
             if event['is_current']:
@@ -79,7 +71,7 @@ class WhatsAppSummary:
             if p.get('is_captain'):
                 player = self.players_map.get(p['element'], {})
                 captain_name = player.get('web_name', 'Unknown')
-                captain_pts = self.points_map.get(p['element'], 0) * 2
+                captain_pts = self.live.points(p['element']) * 2
         
         # נקודות ספסל
         bench_pts = gw_current.get('points_on_bench', 0)
@@ -89,7 +81,7 @@ class WhatsAppSummary:
         bench = []
         for p in picks:
             player = self.players_map.get(p['element'], {})
-            pts = self.points_map.get(p['element'], 0)
+            pts = self.live.points(p['element'])
             player_info = {
                 'name': player.get('web_name', 'Unknown'),
                 'pts': pts,
@@ -121,22 +113,20 @@ class WhatsAppSummary:
     
     def get_differentials(self, all_managers: list) -> list:
         """מציאת דיפרנשיאלים שהצליחו"""
-        player_owners = {}
-        
-        for m in all_managers:
-            for p in m['starting_xi']:
-                name = p['name']
-                if name not in player_owners:
-                    player_owners[name] = {'pts': p['pts'], 'owners': []}
-                player_owners[name]['owners'].append(m['name'])
+        # שחקנים שרק מנג'ר אחד מחזיק בהרכב - לפי ID, ממטריצת הבעלות
+        ownership = self.store.ownership()
+        rows = ownership.rows_of(m['id'] for m in all_managers)
+        player_ids, owner_rows = ownership.sole_owners(rows)
+        points = self.live.by_id('total_points', ownership.size)[player_ids]
+        owner_of_row = {row: m for row, m in zip(rows.tolist(), all_managers)}
         
         differentials = []
-        for player, data in player_owners.items():
-            if len(data['owners']) == 1 and data['pts'] >= 6:
+        for player_id, owner_row, pts in zip(player_ids.tolist(), owner_rows.tolist(), points.tolist()):
+            if pts >= 6:
                 differentials.append({
-                    'player': player,
-                    'pts': data['pts'],
-                    'owner': data['owners'][0]
+                    'player': self.players_map.get(player_id, {}).get('web_name', 'Unknown'),
+                    'pts': pts,
+                    'owner': owner_of_row[owner_row]['name']
                 })
         
         return sorted(differentials, key=lambda x: x['pts'], reverse=True)
@@ -207,6 +197,7 @@ class WhatsAppSummary:
         for manager_id, manager_data in self.managers_data.items():
             data = self.get_manager_data(manager_data, current_gw)
             if data:
+                data['id'] = manager_id
                 data['chips'] = self.get_chips_status(manager_data)
                 data['history_best'] = self.get_historical_best(manager_data)
                 data['vs_average'] = self.get_performance_vs_average(manager_data, current_gw)